@@ -5,10 +5,9 @@ from typing import List
 from app.core.database import get_db
 from app.models.domain import VendorDocument
 from app.schemas.documents import VendorDocumentOut, DocumentSearchResult
-from app.services.documents import (
-    process_pending_documents,
-    search_documents,
-)
+from app.schemas.jobs import JobOut
+from app.services.documents import search_documents
+from app.services.jobs import enqueue_job, find_active_job
 
 router = APIRouter(prefix="/api/documents", tags=["Documents"])
 
@@ -18,17 +17,19 @@ router = APIRouter(prefix="/api/documents", tags=["Documents"])
 # ---------------------------------------------------------------------------
 
 
-@router.post("/process-pending")
-async def trigger_processing(db: Session = Depends(get_db)):
+@router.post("/process-pending", response_model=JobOut, status_code=202)
+def trigger_processing(db: Session = Depends(get_db)):
     """
-    Process all pending vendor documents.
+    Queue processing of all pending vendor documents as a background job.
 
     Downloads each document from its S3 URL, extracts text via
     Amazon Nova Lite, generates a structured summary, creates an
-    embedding, and indexes into OpenSearch.
+    embedding, and indexes into OpenSearch.  If a processing job is already
+    queued or running, that job is returned instead of a new one.
     """
-    result = await process_pending_documents(db)
-    return {"status": "ok", **result}
+    return find_active_job(db, "process_pending_documents") or enqueue_job(
+        db, "process_pending_documents"
+    )
 
 
 # ---------------------------------------------------------------------------
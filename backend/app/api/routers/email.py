@@ -348,7 +348,7 @@ async def handle_nylas_webhook(request: Request, db: Session = Depends(get_db)):
                 print(f"[webhook] Failed to download attachment {att_id}: {e}")
 
     # Parse quotation data from the email body and NEW attachments using Bedrock
-    parsed = parse_quotation_with_bedrock(
+    parsed = await parse_quotation_with_bedrock(
         email_body=email_body,
         project_name=project.project_name,
         attachments=new_attachments,
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.schemas.jobs import JobOut
+from app.services.jobs import get_job, list_jobs
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.get("", response_model=List[JobOut])
+def list_jobs_endpoint(
+    kind: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Most recent background jobs, optionally filtered by kind."""
+    return list_jobs(db, kind=kind, limit=limit)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job_endpoint(job_id: str, db: Session = Depends(get_db)):
+    """
+    Status of a background job.
+
+    `progress` is updated as the job runs (e.g. rows processed so far for a
+    bulk upload); `result` is set once `status` is completed.
+    """
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -5,6 +5,8 @@ import uuid
 import re
 from datetime import datetime
 from app.core.config import settings
+from app.core import llm as llm_gateway
+from app.services.llm_cache import cached_llm_call
 from app.core.database import get_db
 from app.models.domain import Project, ProjectStatus, ProjectInvitedVendor
 from app.services.activity import log_activity
@@ -44,7 +46,6 @@ async def _parse_to_dd_mm_yyyy_ai(date_str: Optional[str]) -> Optional[str]:
             continue
 
     # Use LLM for complex stuff ("in 30 days", "6 weeks from now", etc)
-    from langchain_aws import ChatBedrockConverse
     from pydantic import BaseModel, Field
 
     class DateResponse(BaseModel):
@@ -54,13 +55,7 @@ async def _parse_to_dd_mm_yyyy_ai(date_str: Optional[str]) -> Optional[str]:
 
     try:
         model_id = settings.BEDROCK_NOVA_MODEL_ID or "us.amazon.nova-2-lite-v1:0"
-        llm = ChatBedrockConverse(
-            model=model_id,
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            temperature=0,
-        )
+        llm = llm_gateway.chat_model(model_id, temperature=0)
         structured_llm = llm.with_structured_output(schema=DateResponse)
 
         # We need a reference date for relative times
@@ -78,10 +73,14 @@ Rules:
 4. Handle 'weeks', 'months', and 'years' precisely based on the Current Date.
 5. If it's completely impossible to determine any date, return null.
 """
-        import asyncio
 
-        result = await asyncio.to_thread(structured_llm.invoke, prompt)
-        return result.formatted_date
+        async def _parse() -> dict:
+            result = await llm_gateway.ainvoke(structured_llm, prompt, model_id)
+            return result.model_dump()
+
+        # The prompt embeds today's date, so relative inputs re-resolve daily
+        result = await cached_llm_call("parse_date", "1", model_id, prompt, _parse)
+        return result["formatted_date"]
     except Exception as e:
         print(f"Failed to parse date with AI: {e}")
         return date_str  # Fallback
@@ -244,7 +244,7 @@ async def get_quotes_by_project(project_id: str, db: Session = Depends(get_db)):
                             )
 
                 # Parse with Bedrock
-                parsed = parse_quotation_with_bedrock(
+                parsed = await parse_quotation_with_bedrock(
                     email_body=combined_body_text,
                     project_name=project.project_name if project else "Project",
                     attachments=new_attachments,
@@ -1,9 +1,12 @@
 import asyncio
+import json
 import traceback
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.budget import run_within_budget
 from app.core.config import settings
 from app.core.database import get_db
 from app.schemas.search import (
@@ -14,6 +17,10 @@ from app.schemas.search import (
     VendorSmartSearchResponse,
     VendorSearchResult,
     SearchHistoryResponse,
+    SearchSuggestResponse,
+    VendorBatchSearchRequest,
+    VendorBatchSearchResponse,
+    LineItemSearchResult,
 )
 from app.models.domain import SearchHistory
 import uuid
@@ -23,14 +30,188 @@ from app.services.search import (
     search_vendors_hybrid,
     search_gemini_vendors,
     search_vendors_by_rfp_intent,
+    decompose_query,
+    decompose_line_items,
+    search_vendors_batch,
+    rank_vendor_coverage,
     QueryIntent,
 )
 from app.models.domain import Project
+from app.services.suggest import get_suggest_index, suggest_index_ready
 from app.services.activity import log_activity
 
 router = APIRouter(prefix="/api/search", tags=["Search"])
 
 
+# ---------------------------------------------------------------------------
+# Shared helpers
+# ---------------------------------------------------------------------------
+
+
+async def _resolve_rfp_intent(rfp_data: dict) -> QueryIntent:
+    """Use the intent pre-extracted on the Project if present, otherwise Nova."""
+    intent = None
+    if rfp_data.get("id"):
+        db = next(get_db())
+        project = db.query(Project).filter(Project.id == rfp_data.get("id")).first()
+        if project and project.search_intent:
+            intent = QueryIntent(**project.search_intent)
+            print(
+                f"[search-rfp] Found pre-extracted intent in DB text: {intent.search_text}"
+            )
+
+    if not intent:
+        print("[search-rfp] Pre-extracted intent not found, falling back to Nova")
+        intent = await search_vendors_by_rfp_intent(rfp_data)
+        print(f"[search-rfp] Extracted intent text: {intent.search_text}")
+    return intent
+
+
+def _deduplicate_results(
+    internal_raw: list[dict], external_raw: list[dict]
+) -> list[VendorSearchResult]:
+    """Cross-source deduplication by name (Internal takes priority)."""
+    seen_names = set()
+    deduplicated = []
+    for r in internal_raw + external_raw:
+        name = (r.get("vendor_name") or "").strip().lower()
+        if name not in seen_names:
+            seen_names.add(name)
+            deduplicated.append(VendorSearchResult(**r))
+    return deduplicated
+
+
+def _budget_seconds() -> Optional[float]:
+    budget_ms = settings.SEARCH_LATENCY_BUDGET_MS
+    return budget_ms / 1000 if budget_ms > 0 else None
+
+
+async def _run_search_phases(
+    internal, external_query: str, log_prefix: str
+) -> tuple[list[dict], list[dict], list[str]]:
+    """
+    Run the internal phase and Gemini discovery concurrently under
+    SEARCH_LATENCY_BUDGET_MS.  Exceptions and truncated phases become empty
+    result lists; returns (internal, external, truncated_phases).
+    """
+    results, truncated = await run_within_budget(
+        {
+            "internal": internal,
+            "external": search_gemini_vendors(
+                external_query, num_results=settings.VENDOR_SEARCH_EXTERNAL_N
+            ),
+        },
+        _budget_seconds(),
+    )
+    if truncated:
+        print(f"{log_prefix} latency budget exhausted, truncated: {truncated}")
+
+    # Treat exceptions from either phase as empty results
+    raw: dict[str, list[dict]] = {}
+    for phase in ("internal", "external"):
+        value = results.get(phase, [])
+        if isinstance(value, Exception):
+            print(f"{log_prefix} {phase} phase raised: {value}")
+            value = []
+        raw[phase] = value
+    return raw["internal"], raw["external"], truncated
+
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_smart_search(
+    intent: QueryIntent,
+    external_query: str,
+    display_query: str,
+    activity_description: str,
+):
+    """
+    Run the internal and external phases concurrently and emit each as an SSE
+    frame the moment it completes: intent → internal/external (whichever
+    finishes first) → deduplicated final response.  A phase still running when
+    SEARCH_LATENCY_BUDGET_MS elapses is cancelled and announced in a
+    `truncated` frame.
+    """
+    loop_time = asyncio.get_running_loop().time
+    yield _sse("intent", intent.model_dump())
+
+    phases = {
+        asyncio.create_task(search_vendors_hybrid(intent=intent)): "internal",
+        asyncio.create_task(
+            search_gemini_vendors(
+                external_query, num_results=settings.VENDOR_SEARCH_EXTERNAL_N
+            )
+        ): "external",
+    }
+    raw: dict[str, list[dict]] = {"internal": [], "external": []}
+    truncated: list[str] = []
+    budget = _budget_seconds()
+    deadline = loop_time() + budget if budget else None
+    pending = set(phases)
+    try:
+        while pending:
+            timeout = max(0.0, deadline - loop_time()) if deadline else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                # Latency budget exhausted: abandon whatever is still running
+                truncated = sorted(phases[task] for task in pending)
+                print(f"[search-stream] latency budget exhausted: {truncated}")
+                yield _sse("truncated", {"phases": truncated})
+                break
+            for task in done:
+                phase = phases[task]
+                try:
+                    raw[phase] = task.result()
+                except Exception as e:
+                    # Treat exceptions from either phase as empty results
+                    print(f"[search-stream] {phase} phase raised: {e}")
+                    yield _sse("error", {"phase": phase, "detail": str(e)})
+                results = [VendorSearchResult(**r).model_dump() for r in raw[phase]]
+                yield _sse(phase, {"results": results, "count": len(results)})
+    finally:
+        # Client disconnected mid-stream: don't leave phases running
+        for task in pending:
+            task.cancel()
+
+    deduplicated = _deduplicate_results(raw["internal"], raw["external"])
+    response = VendorSmartSearchResponse(
+        results=deduplicated,
+        total=len(deduplicated),
+        internal_count=len(raw["internal"]),
+        external_count=len(raw["external"]),
+        query=display_query,
+        top_n=settings.VENDOR_SEARCH_TOP_N,
+        truncated_phases=truncated,
+    )
+    yield _sse("final", response.model_dump())
+
+    db = next(get_db())
+    log_activity(
+        db,
+        type="vendor_search",
+        title="Marketplace search performed",
+        description=activity_description,
+    )
+
+
+def _event_stream(generator) -> StreamingResponse:
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Smart vendor search
+# ---------------------------------------------------------------------------
+
+
 @router.post("/vendors/smart/rfp/intent")
 async def extract_rfp_intent(request: VendorRFPSearchRequest):
     """
@@ -58,56 +239,18 @@ async def smart_search_vendors_rfp(request: VendorRFPSearchRequest):
 
     try:
         # 1. Extract intent using DB if possible, otherwise Nova
-        intent = None
-        db = next(get_db())
+        intent = await _resolve_rfp_intent(request.rfp_data)
 
-        if request.rfp_data and request.rfp_data.get("id"):
-            project = (
-                db.query(Project)
-                .filter(Project.id == request.rfp_data.get("id"))
-                .first()
-            )
-            if project and project.search_intent:
-                intent = QueryIntent(**project.search_intent)
-                print(
-                    f"[search-rfp] Found pre-extracted intent in DB text: {intent.search_text}"
-                )
-
-        if not intent:
-            print("[search-rfp] Pre-extracted intent not found, falling back to Nova")
-            intent = await search_vendors_by_rfp_intent(request.rfp_data)
-            print(f"[search-rfp] Extracted intent text: {intent.search_text}")
-
-        # 2. Run internal hybrid search and External Gemini search concurrently
-        internal_raw, external_raw = await asyncio.gather(
-            search_vendors_hybrid(intent=intent),
-            search_gemini_vendors(
-                intent.search_text, num_results=settings.VENDOR_SEARCH_EXTERNAL_N
-            ),
-            return_exceptions=True,
+        # 2. Run internal hybrid search and External Gemini search concurrently,
+        #    within the latency budget
+        internal_raw, external_raw, truncated = await _run_search_phases(
+            search_vendors_hybrid(intent=intent), intent.search_text, "[search-rfp]"
         )
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=503, detail=f"RFP search failed: {e}")
 
-    # Treat exceptions from either phase as empty results
-    if isinstance(internal_raw, Exception):
-        print(f"[search-rfp] internal phase raised: {internal_raw}")
-        internal_raw = []
-    if isinstance(external_raw, Exception):
-        print(f"[search-rfp] external phase raised: {external_raw}")
-        external_raw = []
-
-    # Cross-source deduplication by name (Internal takes priority)
-    all_results_raw = internal_raw + external_raw
-    seen_names = set()
-    deduplicated = []
-
-    for r in all_results_raw:
-        name = (r.get("vendor_name") or "").strip().lower()
-        if name not in seen_names:
-            seen_names.add(name)
-            deduplicated.append(VendorSearchResult(**r))
+    deduplicated = _deduplicate_results(internal_raw, external_raw)
 
     response = VendorSmartSearchResponse(
         results=deduplicated,
@@ -116,6 +259,7 @@ async def smart_search_vendors_rfp(request: VendorRFPSearchRequest):
         external_count=len(external_raw),
         query=intent.search_text,
         top_n=settings.VENDOR_SEARCH_TOP_N,
+        truncated_phases=truncated,
     )
 
     # Log activity
@@ -130,6 +274,57 @@ async def smart_search_vendors_rfp(request: VendorRFPSearchRequest):
     return response
 
 
+@router.post("/vendors/smart/rfp/batch", response_model=VendorBatchSearchResponse)
+async def smart_search_vendors_batch(request: VendorBatchSearchRequest):
+    """
+    Internal vendor search for every line item of an RFP in one request.
+
+    Intents for all items come from one structured LLM call (items the
+    gazetteer parser recognises skip it), embeddings are generated
+    concurrently and all retrievals share a single OpenSearch _msearch.
+    Returns per-item ranked vendors plus a cross-item coverage ranking.
+    """
+    line_items = [item.strip() for item in request.line_items if item.strip()]
+    if not line_items:
+        raise HTTPException(status_code=400, detail="line_items must not be empty")
+    if len(line_items) > settings.SEARCH_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.SEARCH_BATCH_MAX_ITEMS} line items per request",
+        )
+
+    try:
+        intents = await decompose_line_items(line_items, request.rfp_data)
+        item_results = await search_vendors_batch(intents)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=503, detail=f"Batch search failed: {e}")
+
+    response = VendorBatchSearchResponse(
+        items=[
+            LineItemSearchResult(
+                line_item=item,
+                intent=intent.model_dump(),
+                results=[VendorSearchResult(**r) for r in results],
+            )
+            for item, intent, results in zip(line_items, intents, item_results)
+        ],
+        coverage=rank_vendor_coverage(item_results),
+        total_items=len(line_items),
+    )
+
+    db = next(get_db())
+    project_name = (request.rfp_data or {}).get("projectName", "Unknown")
+    log_activity(
+        db,
+        type="vendor_search",
+        title="Marketplace search performed",
+        description=f"Batch search of {len(line_items)} line items for project: {project_name}",
+    )
+
+    return response
+
+
 @router.post("/vendors", response_model=SearchResponse)
 async def search_vendors(request: SearchRequest, db: Session = Depends(get_db)):
     """
@@ -148,37 +343,17 @@ async def smart_search_vendors(request: VendorSmartSearchRequest):
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query must not be empty")
 
-    # Run internal hybrid search and Exa search concurrently
+    # Run internal hybrid search and Exa search concurrently, within the latency budget
     try:
-        internal_raw, external_raw = await asyncio.gather(
-            search_vendors_hybrid(request.query),
-            search_gemini_vendors(
-                request.query, num_results=settings.VENDOR_SEARCH_EXTERNAL_N
-            ),
-            return_exceptions=True,
+        internal_raw, external_raw, truncated = await _run_search_phases(
+            search_vendors_hybrid(request.query), request.query, "[search]"
         )
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=503, detail=f"Search failed: {e}")
 
-    # Treat exceptions from either phase as empty results
-    if isinstance(internal_raw, Exception):
-        print(f"[search] internal phase raised: {internal_raw}")
-        internal_raw = []
-    if isinstance(external_raw, Exception):
-        print(f"[search] external phase raised: {external_raw}")
-        external_raw = []
-
-    # Cross-source deduplication by name (Internal takes priority)
-    all_results_raw = internal_raw + external_raw
-    seen_names = set()
-    deduplicated = []
+    deduplicated = _deduplicate_results(internal_raw, external_raw)
 
-    for r in all_results_raw:
-        name = (r.get("vendor_name") or "").strip().lower()
-        if name not in seen_names:
-            seen_names.add(name)
-            deduplicated.append(VendorSearchResult(**r))
     response = VendorSmartSearchResponse(
         results=deduplicated,
         total=len(deduplicated),
@@ -186,6 +361,7 @@ async def smart_search_vendors(request: VendorSmartSearchRequest):
         external_count=len(external_raw),
         query=request.query,
         top_n=settings.VENDOR_SEARCH_TOP_N,
+        truncated_phases=truncated,
     )
 
     # Log activity
@@ -200,6 +376,54 @@ async def smart_search_vendors(request: VendorSmartSearchRequest):
     return response
 
 
+@router.post("/vendors/smart/stream")
+async def smart_search_vendors_stream(request: VendorSmartSearchRequest):
+    """
+    Streaming variant of /vendors/smart (Server-Sent Events).
+
+    Emits `intent`, then `internal` and `external` as each phase completes,
+    then `final` with the deduplicated VendorSmartSearchResponse, so internal
+    results render without waiting on the slower Gemini phase.
+    """
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+
+    intent = await decompose_query(request.query)
+    return _event_stream(
+        _stream_smart_search(
+            intent,
+            external_query=request.query,
+            display_query=request.query,
+            activity_description=f"Query: {request.query}",
+        )
+    )
+
+
+@router.post("/vendors/smart/rfp/stream")
+async def smart_search_vendors_rfp_stream(request: VendorRFPSearchRequest):
+    """
+    Streaming variant of /vendors/smart/rfp (Server-Sent Events); same event
+    sequence as /vendors/smart/stream.
+    """
+    if not request.rfp_data:
+        raise HTTPException(status_code=400, detail="RFP data must not be empty")
+
+    try:
+        intent = await _resolve_rfp_intent(request.rfp_data)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=503, detail=f"RFP search failed: {e}")
+
+    return _event_stream(
+        _stream_smart_search(
+            intent,
+            external_query=intent.search_text,
+            display_query=intent.search_text,
+            activity_description=f"RFP-driven search for project: {request.rfp_data.get('projectName', 'Unknown')}",
+        )
+    )
+
+
 @router.post("/vendors/smart/internal", response_model=VendorSmartSearchResponse)
 async def smart_search_vendors_internal(request: VendorSmartSearchRequest):
     """
@@ -254,6 +478,26 @@ async def smart_search_vendors_external(request: VendorSmartSearchRequest):
     )
 
 
+@router.get("/suggest", response_model=SearchSuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=25),
+    kind: List[str] = Query(default=[]),
+):
+    """
+    Typeahead over product, certificate and location names from the vendor
+    catalogue.  Served from an in-memory prefix index; no DB or OpenSearch
+    round-trip.  `kind` may be repeated to restrict suggestion types.
+    """
+    if not suggest_index_ready():
+        # Startup warm-up failed or has not run: build off the event loop
+        await asyncio.to_thread(get_suggest_index)
+    suggestions = get_suggest_index().suggest(
+        q, limit=limit, kinds=set(kind) or None
+    )
+    return SearchSuggestResponse(query=q, suggestions=suggestions)
+
+
 @router.get("/history", response_model=List[SearchHistoryResponse])
 def get_search_history(db: Session = Depends(get_db)):
     """Retrieve all past search histories, ordered by most recent."""
@@ -2,6 +2,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.domain import Vendor, Project, ProjectStatus
+from app.services.embedding_cache import embedding_cache_stats
+from app.services.extraction_store import extraction_store_stats
+from app.services.intent_cache import intent_cache_stats
+from app.services.llm_cache import llm_cache_stats
+from app.services.search_cache import search_cache_stats
+from app.services.vendor_mirror import vendor_mirror
 
 router = APIRouter(prefix="/api/stats", tags=["Statistics"])
 
@@ -129,3 +135,16 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
             "top_rfps": [],
             "error": str(e),
         }
+
+
+@router.get("/caches")
+def get_cache_stats():
+    """Hit/miss counters for the in-process and persistent service caches."""
+    return {
+        "embedding": embedding_cache_stats(),
+        "extractions": extraction_store_stats(),
+        "intent": intent_cache_stats(),
+        "llm": llm_cache_stats(),
+        "search_results": search_cache_stats(),
+        "vendor_mirror": vendor_mirror.stats(),
+    }
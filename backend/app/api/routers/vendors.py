@@ -1,25 +1,24 @@
-import asyncio
-
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import io
-import json
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.schemas.vendors import VendorCreate, VendorOut, BulkUploadResult
+from app.core import llm as llm_gateway
+from app.schemas.jobs import JobOut
+from app.schemas.vendors import VendorCreate, VendorOut
 from app.services.vendors import (
     verify_vendor_certification,
-    bulk_create_vendors,
     create_vendor,
     list_vendors,
     get_vendor,
     get_csv_template,
     reindex_all_vendors,
 )
-from app.services.rfp import get_bedrock_client
+from app.services.documents import rebuild_document_index
+from app.services.jobs import enqueue_job
 
 router = APIRouter(prefix="/api/vendors", tags=["Vendors"])
 
@@ -30,9 +29,9 @@ router = APIRouter(prefix="/api/vendors", tags=["Vendors"])
 
 
 @router.post("", response_model=VendorOut, status_code=201)
-def create_vendor_endpoint(payload: VendorCreate, db: Session = Depends(get_db)):
+async def create_vendor_endpoint(payload: VendorCreate, db: Session = Depends(get_db)):
     """Create a single vendor."""
-    return create_vendor(db, payload.model_dump())
+    return await create_vendor(db, payload.model_dump())
 
 
 @router.get("", response_model=List[VendorOut])
@@ -70,7 +69,7 @@ def download_csv_template():
     )
 
 
-@router.post("/bulk-upload", response_model=BulkUploadResult)
+@router.post("/bulk-upload", response_model=JobOut, status_code=202)
 async def bulk_upload_vendors(
     file: UploadFile = File(...), db: Session = Depends(get_db)
 ):
@@ -80,14 +79,19 @@ async def bulk_upload_vendors(
     Expected columns: vendor_name, location, estd, mobile, email,
     certificates (semicolon-separated), products (semicolon-separated), website.
 
+    The file is queued as a background job and the job is returned at once;
+    poll GET /api/jobs/{id} for per-row progress.  The finished job's `result`
+    has the BulkUploadResult shape.
+
     Download the template from GET /api/vendors/bulk-upload/template.
     """
     if not file.filename or not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only .csv files are accepted")
 
     contents = await file.read()
-    result = await bulk_create_vendors(db, contents)
-    return result
+    return enqueue_job(
+        db, "vendor_bulk_upload", payload={"filename": file.filename}, data=contents
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -96,15 +100,21 @@ async def bulk_upload_vendors(
 
 
 @router.post("/reindex")
-def reindex_vendors_endpoint(db: Session = Depends(get_db)):
+async def reindex_vendors_endpoint(
+    documents: bool = False, db: Session = Depends(get_db)
+):
     """
     Admin: drop and recreate the vendors OpenSearch index with the correct
     knn_vector mapping, then re-index every vendor from the database.
 
-    Use this once after initial setup or whenever the index mapping changes.
+    Use this once after initial setup or whenever the index mapping changes,
+    e.g. after changing EMBEDDING_DIMENSIONS or VECTOR_ENCODING.  With
+    `?documents=true` the document index is rebuilt and re-embedded too.
     """
     try:
-        result = reindex_all_vendors(db)
+        result = await reindex_all_vendors(db)
+        if documents:
+            result["documents"] = await rebuild_document_index(db)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Reindex failed: {e}")
@@ -132,7 +142,6 @@ async def answer_vendor_question(question: str):
     Centralized Vendor Q&A: AI generates a suggested answer for a vendor's query.
     Human-in-the-loop will review this before sending.
     """
-    bedrock = get_bedrock_client()
     prompt = f"""
     You are an AI Procurement Assistant. A vendor has asked the following question regarding an ongoing RFP:
     "{question}"
@@ -140,25 +149,17 @@ async def answer_vendor_question(question: str):
     Provide a professional, concise, and helpful suggested response.
     """
 
-    body = json.dumps(
-        {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 500,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    )
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 500,
+        "messages": [{"role": "user", "content": prompt}],
+    }
 
     try:
-        def _invoke():
-            r = bedrock.invoke_model(
-                modelId=settings.BEDROCK_MODEL_ID,
-                body=body,
-                contentType="application/json",
-                accept="application/json",
-            )
-            return json.loads(r.get("body").read()).get("content", [])[0].get("text", "")
-
-        content = await asyncio.to_thread(_invoke)
+        response_body = await llm_gateway.invoke_model_json(
+            settings.BEDROCK_MODEL_ID, body
+        )
+        content = response_body.get("content", [])[0].get("text", "")
         return {"suggested_answer": content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,105 @@
+"""
+Process-wide registry of boto3 clients.
+
+`boto3.client(...)` resolves credentials and endpoints and opens a fresh
+connection pool on every call.  `aws_client(service, region)` instead returns
+one long-lived client per (service, region), created on first use and shared
+by every thread; boto3 clients are thread-safe once built, so only their
+creation is serialised.  All clients share a tuned botocore Config: a larger
+connection pool, adaptive retries (exponential backoff plus client-side rate
+limiting when AWS throttles) and explicit connect/read timeouts.
+
+Callers that own their retries (the LLM gateway in app.core.llm) ask for
+`max_attempts=1` and get a separate client that makes a single attempt per
+call, so botocore and the caller don't both back off on the same throttle.
+
+`warm_aws_clients` builds the commonly used clients at startup so that cost
+stays off the request path.
+"""
+
+import threading
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+
+from app.core.config import settings
+
+_lock = threading.Lock()
+_session: Optional[boto3.session.Session] = None
+_clients: dict[tuple[str, str, Optional[int]], object] = {}
+
+# (service, max_attempts) used on request paths, created by warm_aws_clients;
+# the single-attempt bedrock-runtime client is the LLM gateway's
+_STARTUP_SERVICES = (
+    ("bedrock-runtime", None),
+    ("bedrock-runtime", 1),
+    ("textract", None),
+    ("translate", None),
+)
+
+
+def _client_config(max_attempts: Optional[int] = None) -> Config:
+    if max_attempts is None:
+        retries = {
+            "mode": settings.AWS_RETRY_MODE,
+            "total_max_attempts": settings.AWS_MAX_ATTEMPTS,
+        }
+    else:
+        retries = {"mode": "standard", "total_max_attempts": max_attempts}
+    return Config(
+        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        retries=retries,
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+        read_timeout=settings.AWS_READ_TIMEOUT,
+        tcp_keepalive=True,
+    )
+
+
+def _get_session() -> boto3.session.Session:
+    # Called with _lock held; sessions are not thread-safe, clients are
+    global _session
+    if _session is None:
+        _session = boto3.session.Session(
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+        )
+    return _session
+
+
+def aws_client(
+    service: str, region: Optional[str] = None, max_attempts: Optional[int] = None
+):
+    """
+    The shared boto3 client for `service` in `region` (default AWS_REGION).
+    `max_attempts` overrides AWS_RETRY_MODE / AWS_MAX_ATTEMPTS for callers
+    that retry themselves.
+    """
+    key = (service, region or settings.AWS_REGION, max_attempts)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _get_session().client(
+                    service, region_name=key[1], config=_client_config(max_attempts)
+                )
+                _clients[key] = client
+    return client
+
+
+def warm_aws_clients():
+    """Create the request-path clients up front (called from the app lifespan)."""
+    services = [
+        (service, None, attempts) for service, attempts in _STARTUP_SERVICES
+    ]
+    if settings.S3_RFP_BUCKET:
+        services.append(("s3", settings.S3_RFP_BUCKET_REGION, None))
+    try:
+        for service, region, attempts in services:
+            aws_client(service, region, attempts)
+        names = dict.fromkeys(service for service, _, _ in services)
+        print(f"✓ AWS clients ready: {', '.join(names)}")
+    except Exception as e:
+        print(f"⚠ Could not create AWS clients: {e}")
@@ -0,0 +1,110 @@
+"""
+Latency budgets and request hedging for fan-out endpoints.
+
+`run_within_budget` runs named phases concurrently and cancels whatever has not
+finished when the budget runs out, reporting those phases as truncated.
+`hedged` starts a second attempt of a slow call after a delay derived from the
+call's own recent latency distribution (`LatencyWindow`), returning whichever
+attempt finishes first.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+
+class LatencyWindow:
+    """Rolling window of recent call durations (seconds) for percentile estimates."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until `min_samples` are recorded."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+async def run_within_budget(
+    phases: dict[str, Awaitable], budget_seconds: Optional[float]
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Await every phase concurrently for at most `budget_seconds` (None or ≤ 0 =
+    unbounded).
+
+    Returns ({phase: result-or-exception}, [truncated phase names]).  Phases
+    still running at the deadline are cancelled and omitted from the results.
+    """
+    tasks = {asyncio.ensure_future(aw): name for name, aw in phases.items()}
+    timeout = budget_seconds if budget_seconds and budget_seconds > 0 else None
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    for task in pending:
+        task.cancel()
+
+    results: dict[str, Any] = {}
+    for task in done:
+        try:
+            results[tasks[task]] = task.result()
+        except Exception as e:
+            results[tasks[task]] = e
+    truncated = sorted(tasks[task] for task in pending)
+    return results, truncated
+
+
+async def hedged(
+    attempt: Callable[[], Awaitable[Any]],
+    hedge_after: Optional[float],
+    window: Optional[LatencyWindow] = None,
+) -> Any:
+    """
+    Run `attempt()`; if it has not finished after `hedge_after` seconds, start
+    one more attempt and return whichever succeeds first (the loser is
+    cancelled).  A failed attempt never wins while another is still running;
+    when every attempt fails, the last error is raised.  `hedge_after=None`
+    disables hedging.  The observed latency of each successful call is
+    recorded into `window` when given.
+    """
+    started = time.perf_counter()
+    first = asyncio.ensure_future(attempt())
+    attempts = [first]
+    try:
+        if hedge_after is not None:
+            done, _ = await asyncio.wait({first}, timeout=hedge_after)
+            if not done:
+                print(f"[budget] hedging after {hedge_after * 1000:.0f} ms")
+                attempts.append(asyncio.ensure_future(attempt()))
+        pending = set(attempts)
+        while True:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if window is not None:
+                        window.record(time.perf_counter() - started)
+                    return task.result()
+            if not pending:
+                return done.pop().result()
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,323 @@
+"""
+Caching primitives shared by the service-layer caches.
+
+`LRUCache` is the in-process tier.  `TwoTierCache` puts one in front of a
+Postgres table; the embedding, intent, LLM response and extraction caches in
+app.services are thin configurations of it.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import delete, select
+
+from app.core.database import SessionLocal
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used map with optional per-entry TTL.
+
+    Entries beyond `max_entries` are evicted oldest-first.  Expired entries are
+    dropped lazily on read.  Hit/miss/eviction counters are kept so callers can
+    surface cache effectiveness.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# A store hit refreshes last_used_at only when it is older than this
+RECENCY_RESOLUTION = timedelta(days=1)
+
+
+class TwoTierCache:
+    """
+    An LRUCache in front of a Postgres table.
+
+    `model` is the table's ORM class, keyed by `key_column`.  Optional columns
+    are used when the table has them: `expires_at` (rows and memory entries
+    live `ttl_seconds`; a store hit is kept in memory only for the rest of
+    its lifetime), `last_used_at` (recency for pruning beyond `max_rows`,
+    refreshed by a store hit at most once per RECENCY_RESOLUTION so hits stay
+    read-only) and `created_at`.  Once every `prune_every` writes, expired
+    rows and least-recently-used rows beyond `max_rows` are deleted.
+
+    Subclasses map values to columns (`to_columns` / `from_row`) and may hand
+    out per-caller copies (`copy`).  A cache key may carry more than the
+    table key (`store_key` extracts the latter); `accepts` then decides
+    whether a stored row answers it.  `enabled` and `persist` are read on
+    every call so the settings behind them can change at runtime.  Store
+    errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        model,
+        *,
+        memory_entries: int,
+        enabled: Callable[[], bool],
+        persist: Callable[[], bool],
+        ttl_seconds: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        prune_every: int = 500,
+        key_column: str = "key",
+        extra_counters: tuple[str, ...] = (),
+    ):
+        self.label = label
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._enabled = enabled
+        self._persist = persist
+        self._key_column = key_column
+        columns = model.__table__.columns
+        self._expires = "expires_at" in columns and ttl_seconds is not None
+        self._recency = "last_used_at" in columns
+        self._created = "created_at" in columns
+        self._memory = LRUCache(max_entries=memory_entries, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            (
+                "memory_hits",
+                "store_hits",
+                "misses",
+                "store_writes",
+                "store_errors",
+                "store_evictions",
+                *extra_counters,
+            ),
+            0,
+        )
+
+    # ── Subclass hooks ──────────────────────────────────────────────────────
+
+    def to_columns(self, value: Any) -> dict:
+        """Column values (besides key and timestamps) that store `value`."""
+        raise NotImplementedError
+
+    def from_row(self, row) -> Any:
+        raise NotImplementedError
+
+    def copy(self, value: Any) -> Any:
+        """What a caller receives for a cached `value` (default: the value itself)."""
+        return value
+
+    def store_key(self, key: Hashable) -> str:
+        """The table key behind cache key `key` (default: the key itself)."""
+        return key
+
+    def accepts(self, row, key: Hashable) -> bool:
+        """Whether a stored `row` answers `key` (default: always)."""
+        return True
+
+    # ── Lookups ─────────────────────────────────────────────────────────────
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value for `key`, or None (blocking; see `aget`)."""
+        if not self._enabled():
+            return None
+        value = self._memory_get(key)
+        if value is None and self._persist():
+            value = self._load(key)
+        return self._result(value)
+
+    async def aget(self, key: Hashable) -> Any:
+        """`get` with the store lookup run in a worker thread."""
+        if not self._enabled():
+            return None
+        value = self._memory_get(key)
+        if value is None and self._persist():
+            value = await asyncio.to_thread(self._load, key)
+        return self._result(value)
+
+    def _memory_get(self, key: Hashable) -> Any:
+        value = self._memory.get(key)
+        if value is not None:
+            self.bump("memory_hits")
+        return value
+
+    def _result(self, value: Any) -> Any:
+        if value is None:
+            self.bump("misses")
+            return None
+        return self.copy(value)
+
+    def _load(self, key: Hashable) -> Any:
+        db = SessionLocal()
+        try:
+            row = db.get(self.model, self.store_key(key))
+            if row is None or not self.accepts(row, key):
+                return None
+            now = datetime.utcnow()
+            remaining = None
+            if self._expires:
+                if row.expires_at <= now:
+                    return None
+                remaining = (row.expires_at - now).total_seconds()
+            value = self.from_row(row)
+            if self._recency and (
+                row.last_used_at is None
+                or now - row.last_used_at > RECENCY_RESOLUTION
+            ):
+                row.last_used_at = now
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            self.bump("store_errors")
+            print(f"⚠ {self.label} lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+        self.bump("store_hits")
+        self._memory.set(key, value, remaining)
+        return value
+
+    # ── Writes ──────────────────────────────────────────────────────────────
+
+    def set(self, key: Hashable, value: Any, **columns):
+        """Write `value` through both tiers; `columns` fill extra table columns."""
+        if not self._enabled():
+            return
+        self._memory.set(key, self.copy(value))
+        if self._persist():
+            self._save(key, value, columns)
+
+    async def aset(self, key: Hashable, value: Any, **columns):
+        """`set` with the store write run in a worker thread."""
+        if not self._enabled():
+            return
+        self._memory.set(key, self.copy(value))
+        if self._persist():
+            await asyncio.to_thread(self._save, key, value, columns)
+
+    def _save(self, key: Hashable, value: Any, columns: dict):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            fields = {
+                self._key_column: self.store_key(key),
+                **self.to_columns(value),
+                **columns,
+            }
+            if self._created:
+                fields["created_at"] = now
+            if self._recency:
+                fields["last_used_at"] = now
+            if self._expires:
+                fields["expires_at"] = now + timedelta(seconds=self.ttl_seconds)
+            db.merge(self.model(**fields))
+            db.commit()
+            with self._lock:
+                self._counters["store_writes"] += 1
+                prune = self._counters["store_writes"] % self.prune_every == 0
+            if prune:
+                self._prune(db, now)
+        except Exception as e:
+            db.rollback()
+            self.bump("store_errors")
+            print(f"⚠ {self.label} write failed: {e}")
+        finally:
+            db.close()
+
+    def _prune(self, db, now: datetime):
+        """Drop expired rows and least-recently-used rows beyond max_rows."""
+        removed = 0
+        if self._expires:
+            removed += db.execute(
+                delete(self.model).where(self.model.expires_at <= now)
+            ).rowcount
+        if self.max_rows and self._recency:
+            key = getattr(self.model, self._key_column)
+            stale = (
+                select(key)
+                .order_by(self.model.last_used_at.desc())
+                .offset(self.max_rows)
+            )
+            removed += db.execute(delete(self.model).where(key.in_(stale))).rowcount
+        db.commit()
+        if removed:
+            self.bump("store_evictions", removed)
+            print(f"✓ Pruned {removed} {self.label.lower()} row(s)")
+
+    # ── Bookkeeping ─────────────────────────────────────────────────────────
+
+    def bump(self, counter: str, n: int = 1):
+        with self._lock:
+            self._counters[counter] += n
+
+    def clear_memory(self):
+        """Drop the in-process tier (the table is left intact)."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for both tiers."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["memory_hits"] + counters["store_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["store_hits"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory": self._memory.stats(),
+        }
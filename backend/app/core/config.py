@@ -7,6 +7,15 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
+    # Shared boto3 clients (app.core.aws): connection pool per client, retry
+    # mode ("adaptive" adds client-side rate limiting on throttling) and timeouts.
+    # The LLM gateway's Bedrock client makes one attempt and retries throttles
+    # itself (LLM_MAX_RETRIES), so the two never stack.
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_RETRY_MODE: str = "adaptive"
+    AWS_MAX_ATTEMPTS: int = 5
+    AWS_CONNECT_TIMEOUT: float = 5.0
+    AWS_READ_TIMEOUT: float = 120.0
 
     EXA_API_KEY: Optional[str] = None
     GEMINI_API_KEY: Optional[str] = None
@@ -22,6 +31,10 @@ class Settings(BaseSettings):
     OPENSEARCH_PASSWORD: Optional[str] = None
     OPENSEARCH_INDEX: str = "vendors"
     VENDOR_INDEX_NAME: str = "vendors"
+    # Shared AsyncOpenSearch client (app.core.opensearch): keep-alive
+    # connections per host and per-request timeout in seconds
+    OPENSEARCH_POOL_MAXSIZE: int = 25
+    OPENSEARCH_TIMEOUT: int = 30
 
     S3_BUCKET_NAME: Optional[str] = None
     S3_RFP_BUCKET: Optional[str] = None  # bucket for published RFP PDFs
@@ -31,6 +44,21 @@ class Settings(BaseSettings):
     BEDROCK_MODEL_ID: str = "anthropic.claude-3-haiku-20240307-v1:0"
     BEDROCK_NOVA_MODEL_ID: str = "amazon.nova-lite-v1:0"
     BEDROCK_EMBEDDING_MODEL_ID: str = "amazon.titan-embed-text-v2:0"
+    # Titan v2 output size (256 | 512 | 1024) and kNN storage encoding
+    # (float | fp16 | byte).  Changing either requires POST /api/vendors/reindex.
+    EMBEDDING_DIMENSIONS: int = 1024
+    VECTOR_ENCODING: str = "float"
+
+    # LLM gateway (app.core.llm): in-flight calls and tokens-per-minute budget
+    # per model (0 = unlimited), per-model overrides, e.g.
+    # {"amazon.nova-lite-v1:0": {"concurrency": 4, "tokens_per_minute": 200000}},
+    # and full-jitter backoff on throttling
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_TOKENS_PER_MINUTE: int = 0
+    LLM_MODEL_LIMITS: dict[str, dict[str, int]] = {}
+    LLM_MAX_RETRIES: int = 5
+    LLM_BACKOFF_BASE_MS: int = 500
+    LLM_BACKOFF_MAX_MS: int = 20000
 
     JWT_SECRET_KEY: str = "change-this-secret-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -43,7 +71,12 @@ class Settings(BaseSettings):
     VENDOR_SEARCH_TOP_N: int = 5  # number of top internal vendors to return
     VENDOR_SEARCH_EXTERNAL_N: int = 3  # number of Exa external vendors to return
     VENDOR_SEARCH_RRF_K: int = 60  # RRF constant k (Cormack 2009 default)
-    # OpenSearch cosinesimil scores = 1 + cosine_similarity (range [0, 2]).
+    # Per-retriever RRF weights keyed by list name ("vector", "keyword", …); default 1.0
+    VENDOR_SEARCH_RRF_WEIGHTS: dict[str, float] = {}
+    # Scale each RRF term by the hit's min-max normalised raw score within its list
+    VENDOR_SEARCH_SCORE_AWARE_FUSION: bool = False
+    # Vector scores use the faiss cosinesimil scale, 1 + cosine_similarity (range
+    # [0, 2]); lucene (VECTOR_ENCODING=byte) scores are converted to it.
     # Vendors below this threshold are excluded before RRF to prevent false positives.
     # 1.3 = cosine > 0.3 (30% semantic similarity required).  Raise to 1.4–1.5 to
     # tighten results; lower toward 1.1 if too many relevant vendors are filtered out.
@@ -51,6 +84,119 @@ class Settings(BaseSettings):
     VENDOR_SEARCH_CANDIDATE_MULTIPLIER: int = (
         10  # fetch top_n * multiplier candidates per phase
     )
+    # Apply location / certificate / establishment-year intent as filters inside
+    # the kNN query, so the vector phase only walks matching vendors and can use
+    # the smaller filtered multiplier.  BM25 stays unfiltered.
+    VENDOR_SEARCH_KNN_FILTERS: bool = True
+    VENDOR_SEARCH_FILTERED_CANDIDATE_MULTIPLIER: int = 4
+    # "msearch" sends every retrieval phase in one _msearch round trip when
+    # the query embedding is cached, and otherwise searches like "parallel";
+    # "parallel" issues one search request per phase concurrently, so BM25
+    # runs while the query is embedded.
+    VENDOR_SEARCH_RETRIEVAL_MODE: str = "msearch"
+    # "client_rrf" fuses kNN + BM25 in Python; "server_hybrid" runs a native
+    # hybrid query through VENDOR_SEARCH_PIPELINE (falls back to client_rrf);
+    # "local" answers from the in-process vendor mirror.
+    VENDOR_SEARCH_ENGINE: str = "client_rrf"
+    # Keep an in-memory mirror of the vendor index (implied by engine "local");
+    # also used as a fallback when OpenSearch is unreachable.
+    VENDOR_MIRROR_ENABLED: bool = False
+    VENDOR_SEARCH_PIPELINE: str = "vendor-hybrid-search"
+    # Sub-query weights for the server-side normalization pipeline
+    VENDOR_SEARCH_VECTOR_WEIGHT: float = 0.6
+    VENDOR_SEARCH_KEYWORD_WEIGHT: float = 0.4
+    # Wall-clock budget for the internal + external fan-out of the smart search
+    # endpoints; phases still running at the deadline are cancelled and reported
+    # in `truncated_phases`.  0 disables the budget.
+    SEARCH_LATENCY_BUDGET_MS: int = 8000
+    # Start a second Gemini discovery attempt once the first has run longer than
+    # the recent p<SEARCH_HEDGE_PERCENTILE> latency (never sooner than the floor)
+    SEARCH_HEDGE_ENABLED: bool = False
+    SEARCH_HEDGE_PERCENTILE: float = 95.0
+    SEARCH_HEDGE_MIN_DELAY_MS: int = 1500
+    # Return per-phase Server-Timing headers on every response (otherwise only
+    # when the request sends X-Debug-Timing: 1 or ?debug_timing=1)
+    SERVER_TIMING_ALWAYS: bool = False
+    # Upper bound on line items accepted by /vendors/smart/rfp/batch
+    SEARCH_BATCH_MAX_ITEMS: int = 50
+
+    # Embedding cache: in-process LRU in front of a Postgres-backed store
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PERSIST: bool = True  # write-through to the embedding_cache table
+    EMBEDDING_CACHE_MEMORY_ENTRIES: int = 2048  # ~8 KB per 1024-dim vector
+    EMBEDDING_CACHE_STORE_MAX_ROWS: int = 200_000  # least-recently-used rows pruned beyond this
+
+    # Versioned search_vendors_hybrid result cache (invalidated on vendor index writes)
+    SEARCH_RESULT_CACHE_ENABLED: bool = True
+    SEARCH_RESULT_CACHE_ENTRIES: int = 512
+    SEARCH_RESULT_CACHE_TTL_SECONDS: int = 3600
+    # Serve out-of-date entries this young while a background refresh runs
+    SEARCH_RESULT_CACHE_STALE_SECONDS: int = 300
+    # How often each process follows the shared vendor index change log in
+    # Postgres (search cache version, vendor mirror, gazetteer, /suggest):
+    # the longest another process's vendor write can go unseen here
+    SEARCH_INDEX_VERSION_TTL_SECONDS: float = 5.0
+
+    # Query-intent cache: memoised decompose_query / decompose_rfp_to_intent results
+    INTENT_CACHE_ENABLED: bool = True
+    INTENT_CACHE_PERSIST: bool = True  # write-through to the query_intent_cache table
+    INTENT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    INTENT_CACHE_MEMORY_ENTRIES: int = 1024
+
+    # LLM response cache for deterministic call sites that opt in via
+    # app.services.llm_cache.cached_llm_call
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PERSIST: bool = True  # write-through to the llm_response_cache table
+    LLM_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LLM_CACHE_MEMORY_ENTRIES: int = 512
+    LLM_CACHE_STORE_MAX_ROWS: int = 50_000  # least-recently-used rows pruned beyond this
+
+    # Certificate extraction results keyed by document content hash
+    # (app.services.extraction_store); the URL pre-check reuses a stored result
+    # without downloading when a HEAD shows an unchanged ETag/Last-Modified
+    EXTRACTION_STORE_ENABLED: bool = True
+    EXTRACTION_STORE_MEMORY_ENTRIES: int = 2048
+    EXTRACTION_URL_PRECHECK: bool = True
+
+    # Ingestion pipeline (app.services.ingestion): worker tasks per stage and
+    # the bounded queue between stages; CSV rows upserted and ingested per chunk
+    INGEST_DOWNLOAD_CONCURRENCY: int = 8
+    INGEST_EXTRACT_CONCURRENCY: int = 4
+    INGEST_EMBED_CONCURRENCY: int = 8
+    INGEST_INDEX_CONCURRENCY: int = 4
+    INGEST_QUEUE_SIZE: int = 16
+    INGEST_BATCH_ROWS: int = 100
+
+    # Outbound HTTP (app.core.http): one pooled client for document and logo
+    # downloads.  Bodies stream to a temp file that spills to disk beyond
+    # DOWNLOAD_SPOOL_MEMORY_BYTES; responses with validators are cached on
+    # disk for conditional GETs (HTTP_CACHE_MAX_BYTES=0 disables the cache)
+    HTTP_ENABLE_HTTP2: bool = True  # needs the h2 package (httpx[http2])
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    DOWNLOAD_MAX_BYTES: int = 25 * 1024 * 1024
+    DOWNLOAD_SPOOL_MEMORY_BYTES: int = 1024 * 1024
+    HTTP_CACHE_DIR: str = ""  # default: <tmp>/procure-http-cache
+    HTTP_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+
+    # Background jobs (app.services.jobs) run in `python worker.py` processes.
+    # JOBS_WORKER_IN_APP also runs a worker loop inside the API process, for
+    # single-process development only: handlers do their database work (and
+    # checkpoint commits) on the event loop, stalling requests meanwhile.
+    # A running job whose heartbeat is older than JOBS_STALE_AFTER_SECONDS is
+    # reclaimed and resumed from its checkpoint, up to JOBS_MAX_ATTEMPTS times.
+    JOBS_WORKER_IN_APP: bool = False
+    JOBS_POLL_INTERVAL_SECONDS: float = 2.0
+    JOBS_STALE_AFTER_SECONDS: int = 600
+    JOBS_MAX_ATTEMPTS: int = 3
+
+    # Gazetteer fast-path parser: skip the LLM when a query is fully explained
+    # by known products / certifications / locations
+    QUERY_PARSER_ENABLED: bool = True
+    QUERY_PARSER_MIN_CONFIDENCE: float = 0.8
 
     # Nylas Email Integration
     NYLAS_API_KEY: Optional[str] = None
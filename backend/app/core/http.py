@@ -0,0 +1,428 @@
+"""
+Process-wide HTTP client for outbound downloads.
+
+One httpx.AsyncClient (HTTP/2 when the `h2` package is installed, keep-alive
+connection pool) is opened in the FastAPI lifespan and closed on shutdown, so
+document downloads reuse connections instead of building a client and a TLS
+session per file.  Synchronous code (PDF rendering) shares a pooled
+httpx.Client the same way.  Scripts and workers get the same lazily created
+clients and should await `close_http_clients` before their event loop ends.
+
+`download` / `download_sync` stream the response body into a
+SpooledTemporaryFile: small files stay in memory, large scans spill to disk,
+and anything over DOWNLOAD_MAX_BYTES is rejected while streaming.  The SHA-256
+of the body is computed on the way through.
+
+Bodies that come with an ETag or Last-Modified are kept in a local disk cache
+(HTTP_CACHE_DIR, bounded by HTTP_CACHE_MAX_BYTES), keyed by the URL minus any
+presigning parameters so a re-signed S3 link finds its entry.  The next
+download of the same object sends If-None-Match / If-Modified-Since and a 304 is served from the
+cached copy; if that copy was pruned in the meantime, the GET is repeated
+without validators.  Cache errors are logged and treated as misses.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+_sync_lock = threading.Lock()
+
+# Prune the disk cache once every N writes rather than on each one
+_PRUNE_EVERY = 50
+_cache_writes = 0
+_cache_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    if not settings.HTTP_ENABLE_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_kwargs() -> dict:
+    return dict(
+        http2=_http2_available(),
+        follow_redirects=True,
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared async client, created on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(**_client_kwargs())
+    return _client
+
+
+def get_sync_http_client() -> httpx.Client:
+    """The shared blocking client for code that cannot await."""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(**_client_kwargs())
+    return _sync_client
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the shared client at startup (called from the app lifespan)."""
+    client = get_http_client()
+    protocol = "HTTP/2" if _http2_available() else "HTTP/1.1"
+    print(f"✓ HTTP client ready ({protocol}, {settings.HTTP_MAX_CONNECTIONS} connections)")
+    return client
+
+
+async def close_http_clients():
+    """Close the shared clients' connection pools (safe to call when unopened)."""
+    global _client, _sync_client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+    with _sync_lock:
+        sync_client, _sync_client = _sync_client, None
+    if sync_client is not None:
+        sync_client.close()
+
+
+# ---------------------------------------------------------------------------
+# Downloads
+# ---------------------------------------------------------------------------
+
+
+class DownloadTooLarge(ValueError):
+    """The response body exceeded the allowed download size."""
+
+
+@dataclass
+class Download:
+    """A downloaded body: a rewound file object plus what we know about it."""
+
+    file: BinaryIO
+    size: int
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+
+    def read(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "Download":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class _Spool:
+    """Receives a body chunk by chunk, enforcing the size cap."""
+
+    max_bytes: int
+    file: BinaryIO = field(
+        default_factory=lambda: tempfile.SpooledTemporaryFile(
+            max_size=settings.DOWNLOAD_SPOOL_MEMORY_BYTES
+        )
+    )
+    size: int = 0
+    digest: Any = field(default_factory=hashlib.sha256)
+
+    def check_length(self, response: httpx.Response, url: str):
+        length = response.headers.get("content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            self.fail(url)
+
+    def write(self, chunk: bytes, url: str):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.fail(url)
+        self.digest.update(chunk)
+        self.file.write(chunk)
+
+    def fail(self, url: str):
+        self.file.close()
+        raise DownloadTooLarge(
+            f"{url} is larger than the {self.max_bytes} byte download limit"
+        )
+
+    def result(self, response: httpx.Response) -> Download:
+        self.file.seek(0)
+        return Download(
+            file=self.file,
+            size=self.size,
+            sha256=self.digest.hexdigest(),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+
+async def download(url: str, max_bytes: Optional[int] = None) -> Download:
+    """Stream `url` into a spooled temp file (see module docstring)."""
+    cached = await asyncio.to_thread(_cache_lookup, url)
+    result = await _download(url, max_bytes, cached)
+    if result is None:
+        # Not modified, but the cached body was pruned since the lookup
+        result = await _download(url, max_bytes, None)
+    return result
+
+
+async def _download(
+    url: str, max_bytes: Optional[int], cached: Optional[dict]
+) -> Optional[Download]:
+    """One GET, conditional on `cached`; None on a 304 whose body is gone."""
+    headers = _conditional_headers(cached)
+    spool = _Spool(max_bytes or settings.DOWNLOAD_MAX_BYTES)
+    try:
+        async with get_http_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached is not None:
+                spool.file.close()
+                return await asyncio.to_thread(_cache_open, url, cached)
+            response.raise_for_status()
+            spool.check_length(response, url)
+            async for chunk in response.aiter_bytes():
+                spool.write(chunk, url)
+    except BaseException:
+        spool.file.close()
+        raise
+    result = spool.result(response)
+    await asyncio.to_thread(_cache_store, url, result)
+    return result
+
+
+def download_sync(
+    url: str, max_bytes: Optional[int] = None, timeout: Optional[float] = None
+) -> Download:
+    """Blocking counterpart of `download`, on the shared sync client."""
+    cached = _cache_lookup(url)
+    result = _download_sync(url, max_bytes, timeout, cached)
+    if result is None:
+        # Not modified, but the cached body was pruned since the lookup
+        result = _download_sync(url, max_bytes, timeout, None)
+    return result
+
+
+def _download_sync(
+    url: str,
+    max_bytes: Optional[int],
+    timeout: Optional[float],
+    cached: Optional[dict],
+) -> Optional[Download]:
+    headers = _conditional_headers(cached)
+    spool = _Spool(max_bytes or settings.DOWNLOAD_MAX_BYTES)
+    request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+    try:
+        with get_sync_http_client().stream(
+            "GET", url, headers=headers, timeout=request_timeout
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                spool.file.close()
+                return _cache_open(url, cached)
+            response.raise_for_status()
+            spool.check_length(response, url)
+            for chunk in response.iter_bytes():
+                spool.write(chunk, url)
+    except BaseException:
+        spool.file.close()
+        raise
+    result = spool.result(response)
+    _cache_store(url, result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Conditional-GET disk cache
+# ---------------------------------------------------------------------------
+
+
+def _cache_dir() -> Optional[str]:
+    if settings.HTTP_CACHE_MAX_BYTES <= 0:
+        return None
+    return settings.HTTP_CACHE_DIR or os.path.join(
+        tempfile.gettempdir(), "procure-http-cache"
+    )
+
+
+# Query parameters of presigned S3 URLs (SigV4 and legacy V2) that change on
+# every signing without changing the object
+_SIGNATURE_PARAMS = {
+    "x-amz-algorithm",
+    "x-amz-credential",
+    "x-amz-date",
+    "x-amz-expires",
+    "x-amz-signedheaders",
+    "x-amz-signature",
+    "x-amz-security-token",
+    "awsaccesskeyid",
+    "signature",
+    "expires",
+}
+
+
+def _cache_identity(url: str) -> str:
+    """`url` without its signing parameters, so re-signed links share an entry."""
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in _SIGNATURE_PARAMS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query), fragment=""))
+
+
+def _cache_paths(url: str) -> Optional[tuple[str, str]]:
+    directory = _cache_dir()
+    if directory is None:
+        return None
+    name = hashlib.sha256(_cache_identity(url).encode("utf-8")).hexdigest()
+    base = os.path.join(directory, name)
+    return base + ".body", base + ".json"
+
+
+def _conditional_headers(cached: Optional[dict]) -> dict:
+    if cached is None:
+        return {}
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def _cache_lookup(url: str) -> Optional[dict]:
+    paths = _cache_paths(url)
+    if paths is None:
+        return None
+    body_path, meta_path = paths
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("url") != _cache_identity(url) or not os.path.exists(body_path):
+            return None
+        return meta
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠ HTTP cache lookup failed for {url}: {e}")
+        return None
+
+
+def _cache_open(url: str, meta: dict) -> Optional[Download]:
+    """The cached body for `url`, or None (and the entry dropped) if it is gone."""
+    body_path, meta_path = _cache_paths(url)
+    # An open handle stays valid even if the entry is replaced or pruned
+    try:
+        file = open(body_path, "rb")
+    except FileNotFoundError:
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+        return None
+    try:
+        os.utime(body_path)  # recency for pruning
+    except FileNotFoundError:
+        pass
+    return Download(
+        file=file,
+        size=meta["size"],
+        sha256=meta["sha256"],
+        etag=meta.get("etag"),
+        last_modified=meta.get("last_modified"),
+        from_cache=True,
+    )
+
+
+def _cache_store(url: str, result: Download):
+    global _cache_writes
+    paths = _cache_paths(url)
+    if paths is None or not (result.etag or result.last_modified):
+        return
+    if result.size > settings.HTTP_CACHE_MAX_BYTES:
+        return
+    body_path, meta_path = paths
+    try:
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # Write under temporary names, then swap in, so readers never see a partial file
+        fd, tmp_body = tempfile.mkstemp(dir=os.path.dirname(body_path))
+        with os.fdopen(fd, "wb") as out:
+            result.file.seek(0)
+            while chunk := result.file.read(1024 * 1024):
+                out.write(chunk)
+        result.file.seek(0)
+        os.replace(tmp_body, body_path)
+        meta = {
+            "url": _cache_identity(url),
+            "etag": result.etag,
+            "last_modified": result.last_modified,
+            "sha256": result.sha256,
+            "size": result.size,
+        }
+        fd, tmp_meta = tempfile.mkstemp(dir=os.path.dirname(meta_path))
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            json.dump(meta, out)
+        os.replace(tmp_meta, meta_path)
+    except Exception as e:
+        print(f"⚠ HTTP cache write failed for {url}: {e}")
+        return
+
+    with _cache_lock:
+        _cache_writes += 1
+        prune = _cache_writes % _PRUNE_EVERY == 0
+    if prune:
+        _prune_cache()
+
+
+def _prune_cache():
+    """Delete least-recently-used bodies until the cache fits HTTP_CACHE_MAX_BYTES."""
+    directory = _cache_dir()
+    try:
+        bodies = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".body"):
+                stat = entry.stat()
+                bodies.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in bodies)
+        removed = 0
+        for _, size, path in sorted(bodies):
+            if total <= settings.HTTP_CACHE_MAX_BYTES:
+                break
+            for stale in (path, path[: -len(".body")] + ".json"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        if removed:
+            print(f"✓ Pruned {removed} HTTP cache entr{'y' if removed == 1 else 'ies'}")
+    except Exception as e:
+        print(f"⚠ HTTP cache prune failed: {e}")
@@ -0,0 +1,352 @@
+"""
+Gateway for chat-model calls (Bedrock and Gemini).
+
+Every LLM call site goes through this module instead of building its own
+client and handling throttling its own way:
+
+- `chat_model` / `gemini_model` return one cached LangChain model per
+  configuration; the Bedrock models share the boto3 clients in app.core.aws.
+  The gateway's bedrock-runtime client makes a single attempt per call
+  (botocore retries off), so throttles are retried here only.
+- `ainvoke` (LangChain runnables), `converse` and `invoke_model_json` (raw
+  Bedrock runtime calls) run each request under its model's limiter: a FIFO
+  semaphore capping in-flight calls and a tokens-per-minute bucket.  Waiters
+  are served in arrival order, so a burst queues instead of stampeding.
+- Throttling errors (Bedrock ThrottlingException and friends, Gemini 429 /
+  RESOURCE_EXHAUSTED) are retried with full-jitter exponential backoff; the
+  slot is released while backing off.  Other errors propagate unchanged.
+
+Limits come from LLM_MAX_CONCURRENCY / LLM_TOKENS_PER_MINUTE, overridable per
+model ID through LLM_MODEL_LIMITS.  Token costs are estimated up front from
+the prompt size plus max_tokens and corrected from reported usage; calls that
+report none (e.g. `with_structured_output` runnables) are settled with the
+prompt estimate plus the size of the returned output.
+
+Embeddings (documents.generate_embedding) are not routed here; Titan calls
+are short and rely on botocore's adaptive retry mode.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Optional
+
+from app.core.aws import aws_client
+from app.core.config import settings
+
+# Rough prompt-size heuristic and a flat charge per binary attachment; both
+# are reconciled against reported usage once the call returns
+_CHARS_PER_TOKEN = 4
+_ATTACHMENT_TOKENS = 1500
+
+_THROTTLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+_THROTTLE_MARKERS = (
+    "ThrottlingException",
+    "Too many requests",
+    "TooManyRequests",
+    "RESOURCE_EXHAUSTED",
+    "rate limit",
+)
+
+
+# ---------------------------------------------------------------------------
+# Per-model limiter
+# ---------------------------------------------------------------------------
+
+
+class _ModelLimiter:
+    """Concurrency slots plus a tokens-per-minute bucket for one model."""
+
+    def __init__(self, concurrency: int, tokens_per_minute: int):
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._capacity = float(tokens_per_minute)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        # Held by the request at the head of the queue while it waits for
+        # tokens, so later requests cannot overtake it
+        self._bucket_lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated) * self._capacity / 60.0,
+        )
+        self._updated = now
+
+    async def take_tokens(self, cost: int):
+        if self._capacity <= 0:
+            return
+        # A request larger than the whole budget waits for a full bucket
+        cost = min(float(cost), self._capacity)
+        async with self._bucket_lock:
+            self._refill()
+            while self._tokens < cost:
+                await asyncio.sleep(
+                    (cost - self._tokens) * 60.0 / self._capacity
+                )
+                self._refill()
+            self._tokens -= cost
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Correct the bucket once the real token usage is known."""
+        if self._capacity <= 0 or actual is None:
+            return
+        self._refill()
+        self._tokens = min(self._capacity, self._tokens + estimated - actual)
+
+
+_limiters: dict[str, _ModelLimiter] = {}
+_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _limits_for(model_id: str) -> tuple[int, int]:
+    override = settings.LLM_MODEL_LIMITS.get(model_id, {})
+    return (
+        int(override.get("concurrency", settings.LLM_MAX_CONCURRENCY)),
+        int(override.get("tokens_per_minute", settings.LLM_TOKENS_PER_MINUTE)),
+    )
+
+
+def _limiter(model_id: str) -> _ModelLimiter:
+    # asyncio primitives belong to one event loop; scripts that call
+    # asyncio.run more than once get fresh limiters for each loop
+    global _limiter_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _limiter_loop:
+        _limiters.clear()
+        _limiter_loop = loop
+    limiter = _limiters.get(model_id)
+    if limiter is None:
+        limiter = _limiters[model_id] = _ModelLimiter(*_limits_for(model_id))
+    return limiter
+
+
+# ---------------------------------------------------------------------------
+# Token accounting and throttle detection
+# ---------------------------------------------------------------------------
+
+
+def _prompt_chars(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (bytes, bytearray)):
+        return _ATTACHMENT_TOKENS * _CHARS_PER_TOKEN
+    if isinstance(value, dict):
+        return sum(_prompt_chars(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_prompt_chars(v) for v in value)
+    content = getattr(value, "content", None)  # LangChain messages
+    if content is not None:
+        return _prompt_chars(content)
+    return len(str(value))
+
+
+def estimate_tokens(prompt: Any, max_tokens: int) -> int:
+    """Upper-bound token cost of a call: prompt size plus the output allowance."""
+    return _prompt_chars(prompt) // _CHARS_PER_TOKEN + max_tokens
+
+
+def _output_estimate(prompt: Any, result: Any) -> int:
+    """Token use of a call that reported none: prompt plus output size."""
+    dump = getattr(result, "model_dump", None)  # structured-output models
+    output = dump() if callable(dump) else result
+    return (_prompt_chars(prompt) + _prompt_chars(output)) // _CHARS_PER_TOKEN
+
+
+def _is_throttle(exc: BaseException) -> bool:
+    # LangChain wraps provider errors, so walk the cause chain
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        response = getattr(exc, "response", None)
+        if isinstance(response, dict):
+            if response.get("Error", {}).get("Code") in _THROTTLE_CODES:
+                return True
+        if getattr(exc, "code", None) == 429 or getattr(exc, "status_code", None) == 429:
+            return True
+        text = f"{type(exc).__name__} {exc}"
+        if any(marker in text for marker in _THROTTLE_MARKERS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry `attempt` (0-based)."""
+    ceiling = min(
+        settings.LLM_BACKOFF_MAX_MS, settings.LLM_BACKOFF_BASE_MS * (2**attempt)
+    )
+    return random.uniform(0, ceiling) / 1000.0
+
+
+async def _call(model_id: str, prompt: Any, max_tokens: int, fn, usage_of):
+    """Run `await fn()` under `model_id`'s limits, retrying throttles."""
+    limiter = _limiter(model_id)
+    estimated = estimate_tokens(prompt, max_tokens)
+    attempt = 0
+    while True:
+        await limiter.take_tokens(estimated)
+        async with limiter._slots:
+            try:
+                result = await fn()
+            except Exception as e:
+                if attempt >= settings.LLM_MAX_RETRIES or not _is_throttle(e):
+                    raise
+                # The throttled request consumed nothing upstream
+                limiter.settle(estimated, 0)
+                delay = _backoff_seconds(attempt)
+                attempt += 1
+                print(
+                    f"[llm] {model_id} throttled, retry {attempt}/"
+                    f"{settings.LLM_MAX_RETRIES} in {delay:.2f}s"
+                )
+            else:
+                actual = usage_of(result)
+                if actual is None:
+                    actual = _output_estimate(prompt, result)
+                limiter.settle(estimated, actual)
+                return result
+        await asyncio.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Model clients
+# ---------------------------------------------------------------------------
+
+
+def _runtime_client():
+    # Single attempt: the gateway owns throttle backoff (see _call)
+    return aws_client("bedrock-runtime", max_attempts=1)
+
+
+_models: dict[tuple, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _cached(key: tuple, build):
+    model = _models.get(key)
+    if model is None:
+        with _models_lock:
+            model = _models.get(key)
+            if model is None:
+                model = _models[key] = build()
+    return model
+
+
+def chat_model(model_id: str, temperature: float = 0, max_tokens: int = 1024):
+    """Shared ChatBedrockConverse for this configuration (reuses the boto3 clients)."""
+    from langchain_aws import ChatBedrockConverse
+
+    return _cached(
+        ("bedrock", model_id, temperature, max_tokens),
+        lambda: ChatBedrockConverse(
+            model=model_id,
+            region_name=settings.AWS_REGION,
+            client=_runtime_client(),
+            bedrock_client=aws_client("bedrock"),
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ),
+    )
+
+
+def gemini_model(temperature: float = 0):
+    """Shared ChatGoogleGenerativeAI for GEMINI_MODEL; raises ValueError without a key."""
+    import os
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    api_key = settings.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not configured")
+    return _cached(
+        ("gemini", settings.GEMINI_MODEL, temperature),
+        lambda: ChatGoogleGenerativeAI(
+            model=settings.GEMINI_MODEL,
+            temperature=temperature,
+            api_key=api_key,
+            # Retries are owned by the gateway
+            max_retries=0,
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+
+def _langchain_usage(result: Any) -> Optional[int]:
+    usage = getattr(result, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+async def ainvoke(runnable, prompt: Any, model_id: str, max_tokens: int = 1024):
+    """`await runnable.ainvoke(prompt)` under the gateway limits for `model_id`."""
+    return await _call(
+        model_id,
+        prompt,
+        max_tokens,
+        lambda: runnable.ainvoke(prompt),
+        _langchain_usage,
+    )
+
+
+async def converse(modelId: str, messages: list, inferenceConfig: dict, **kwargs) -> dict:
+    """Bedrock runtime `converse` (same arguments) under the gateway limits."""
+    client = _runtime_client()
+
+    def _usage(response: dict) -> Optional[int]:
+        return response.get("usage", {}).get("totalTokens")
+
+    return await _call(
+        modelId,
+        messages,
+        inferenceConfig.get("maxTokens", 1024),
+        lambda: asyncio.to_thread(
+            client.converse,
+            modelId=modelId,
+            messages=messages,
+            inferenceConfig=inferenceConfig,
+            **kwargs,
+        ),
+        _usage,
+    )
+
+
+async def invoke_model_json(model_id: str, body: dict) -> dict:
+    """Bedrock runtime `invoke_model` with a JSON body; returns the decoded response."""
+    client = _runtime_client()
+
+    def _invoke() -> dict:
+        response = client.invoke_model(
+            modelId=model_id,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json",
+        )
+        return json.loads(response["body"].read())
+
+    def _usage(response: dict) -> Optional[int]:
+        usage = response.get("usage") or {}
+        if "input_tokens" not in usage:
+            return None
+        return usage["input_tokens"] + usage.get("output_tokens", 0)
+
+    return await _call(
+        model_id,
+        body.get("messages"),
+        body.get("max_tokens", 1024),
+        lambda: asyncio.to_thread(_invoke),
+        _usage,
+    )
@@ -0,0 +1,76 @@
+"""
+Process-wide AsyncOpenSearch client.
+
+One client, with its aiohttp keep-alive connection pool, is opened in the
+FastAPI lifespan and closed on shutdown.  Every search and index call reuses
+its connections, so there is no per-request client construction or TLS
+handshake.  Code running outside the app (scripts, workers) gets the same
+lazily created client from `get_opensearch_client` and should await
+`close_opensearch_client` before its event loop ends.
+"""
+
+import re
+from typing import Optional
+
+from opensearchpy import AsyncOpenSearch
+
+from app.core.config import settings
+
+_client: Optional[AsyncOpenSearch] = None
+
+
+def _build_client() -> AsyncOpenSearch:
+    """
+    AsyncOpenSearch client using HTTP basic auth (username + password).
+
+    The OPENSEARCH_URL may point to the Dashboards UI
+    (e.g. https://…/\\_dashboards) — the /_dashboards suffix is stripped
+    automatically so we always connect to the API root.
+    """
+    if not settings.OPENSEARCH_URL:
+        raise ValueError("OPENSEARCH_URL is not configured")
+    if not settings.OPENSEARCH_USER or not settings.OPENSEARCH_PASSWORD:
+        raise ValueError("OPENSEARCH_USER and OPENSEARCH_PASSWORD must be configured")
+
+    # Strip the Dashboards suffix and any trailing slash to get the API endpoint
+    api_url = re.sub(r"/_dashboards.*$", "", settings.OPENSEARCH_URL).rstrip("/")
+
+    # Separate host from protocol
+    host = api_url.replace("https://", "").replace("http://", "")
+    use_ssl = api_url.startswith("https://")
+
+    return AsyncOpenSearch(
+        hosts=[{"host": host, "port": 443}],
+        http_auth=(settings.OPENSEARCH_USER, settings.OPENSEARCH_PASSWORD),
+        use_ssl=use_ssl,
+        verify_certs=True,
+        timeout=settings.OPENSEARCH_TIMEOUT,
+        maxsize=settings.OPENSEARCH_POOL_MAXSIZE,
+    )
+
+
+def get_opensearch_client() -> AsyncOpenSearch:
+    """The shared client, created on first use."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+async def open_opensearch_client() -> Optional[AsyncOpenSearch]:
+    """Create the shared client at startup; None when OpenSearch is not configured."""
+    try:
+        client = get_opensearch_client()
+    except ValueError as e:
+        print(f"⚠ OpenSearch client not created: {e}")
+        return None
+    print(f"✓ OpenSearch client ready (pool size {settings.OPENSEARCH_POOL_MAXSIZE})")
+    return client
+
+
+async def close_opensearch_client():
+    """Close the shared client's connection pool (safe to call when unopened)."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
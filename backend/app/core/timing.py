@@ -0,0 +1,170 @@
+"""
+Per-phase timing for the search pipeline.
+
+Wrap a unit of work in `timed("phase")` (usable in sync and async code):
+
+    with timed("embed"):
+        vector = generate_embedding(text)
+
+or decorate a function with `timed_call("phase")`.
+
+Every measurement is added to a process-wide histogram, rendered in the
+Prometheus text format by `GET /metrics`.  When a request opted in to timing
+(see `timing_requested`), the same measurements are also collected for that
+request and returned in its `Server-Timing` response header.
+
+The per-request collector lives in a ContextVar, so work dispatched with
+`asyncio.to_thread` or `asyncio.create_task` reports into the request that
+started it.  For streaming (SSE) responses the header is sent before the body,
+so it only covers phases that ran before streaming began.
+"""
+
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.core.config import settings
+
+# Histogram bucket upper bounds, in seconds
+_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+_METRIC = "search_phase_duration_seconds"
+
+TIMING_HEADER = "X-Debug-Timing"
+TIMING_QUERY_PARAM = "debug_timing"
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.n += 1
+
+
+_lock = threading.Lock()
+_histograms: dict[str, _Histogram] = {}
+
+# (phase, seconds) pairs recorded for the current request, when opted in
+_request_timings: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record(phase: str, seconds: float):
+    with _lock:
+        hist = _histograms.get(phase)
+        if hist is None:
+            hist = _histograms[phase] = _Histogram()
+        hist.observe(seconds)
+    collector = _request_timings.get()
+    if collector is not None:
+        collector.append((phase, seconds))
+
+
+@contextmanager
+def timed(phase: str):
+    """Measure the wall-clock time of the enclosed block as `phase`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - started)
+
+
+def timed_call(phase: str):
+    """Decorator form of `timed` for sync and async functions."""
+
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timed(phase):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(phase):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# ── Per-request collection (Server-Timing) ──────────────────────────────────
+
+
+def timing_requested(headers, query_params) -> bool:
+    """Timing is returned when enabled globally or asked for on the request."""
+    if settings.SERVER_TIMING_ALWAYS:
+        return True
+    flag = headers.get(TIMING_HEADER) or query_params.get(TIMING_QUERY_PARAM)
+    return (flag or "").lower() in ("1", "true", "yes")
+
+
+def begin_request_timing() -> list[tuple[str, float]]:
+    """Start collecting phases for the current request; returns the collector."""
+    collector: list[tuple[str, float]] = []
+    _request_timings.set(collector)
+    return collector
+
+
+def server_timing_header(collector: list[tuple[str, float]], total: float) -> str:
+    """
+    Format collected phases as a Server-Timing value.  Repeated phases (e.g.
+    one embedding per batch item) are summed, with the count in `desc`.
+    """
+    summed: dict[str, list] = {}
+    for phase, seconds in list(collector):
+        entry = summed.setdefault(phase, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = []
+    for phase, (seconds, count) in summed.items():
+        metric = f"{phase};dur={seconds * 1000:.1f}"
+        if count > 1:
+            metric += f';desc="x{count}"'
+        parts.append(metric)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ── Prometheus exposition ───────────────────────────────────────────────────
+
+
+def render_metrics() -> str:
+    """All phase histograms in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {_METRIC} Wall-clock duration of search pipeline phases.",
+        f"# TYPE {_METRIC} histogram",
+    ]
+    with _lock:
+        snapshot = {
+            phase: (list(h.counts), h.total, h.n) for phase, h in _histograms.items()
+        }
+    for phase in sorted(snapshot):
+        counts, total, n = snapshot[phase]
+        cumulative = 0
+        for bound, count in zip((*_BUCKETS, "+Inf"), counts):
+            cumulative += count
+            lines.append(
+                f'{_METRIC}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}'
+            )
+        lines.append(f'{_METRIC}_sum{{phase="{phase}"}} {total:.6f}')
+        lines.append(f'{_METRIC}_count{{phase="{phase}"}} {n}')
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     Integer,
@@ -9,6 +10,9 @@ from sqlalchemy import (
     Float,
     Enum,
     Text,
+    LargeBinary,
+    Index,
+    func,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -95,6 +99,10 @@ class Vendor(Base):
     certificates = Column(JSON, nullable=True)  # List[str] of cert/license names
     products = Column(JSON, nullable=True)  # List[str] of product names
 
+    # Case-insensitive vendor identity: lookups by func.lower(name) and the
+    # bulk upload's ON CONFLICT target
+    __table_args__ = (Index("ix_vendors_name_lower", func.lower(name), unique=True),)
+
     project_vendors = relationship("ProjectVendor", back_populates="vendor")
     quotes = relationship("Quote", back_populates="vendor")
     documents = relationship("VendorDocument", back_populates="vendor")
@@ -188,3 +196,127 @@ class Activity(Base):
 
     project = relationship("Project")
     vendor = relationship("Vendor")
+
+
+class EmbeddingCacheEntry(Base):
+    """Persistent tier of the embedding cache (see app.services.embedding_cache).
+
+    Keyed by a SHA-256 of model ID, dimensions and normalised input text; the
+    vector is stored as packed float32 bytes.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    key = Column(String(64), primary_key=True)
+    model_id = Column(String, nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class QueryIntentCacheEntry(Base):
+    """Durable tier of the query-intent cache (see app.services.intent_cache)."""
+
+    __tablename__ = "query_intent_cache"
+
+    key = Column(String(64), primary_key=True)
+    kind = Column(String, nullable=False)  # query | rfp
+    intent = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class LLMResponseCacheEntry(Base):
+    """Persistent tier of the LLM response cache (see app.services.llm_cache).
+
+    Keyed by a SHA-256 of call site, prompt version, model ID and inputs; the
+    response is stored as zlib-compressed JSON.
+    """
+
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    site = Column(String, nullable=False)
+    model_id = Column(String, nullable=False)
+    response = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class DocumentExtraction(Base):
+    """Nova extraction result for one document content (see app.services.extraction_store).
+
+    Keyed by the SHA-256 of the document bytes; a row produced by another
+    model or prompt version is treated as missing.
+    """
+
+    __tablename__ = "document_extractions"
+
+    content_sha256 = Column(String(64), primary_key=True)
+    model_id = Column(String, nullable=False)
+    extraction_version = Column(String, nullable=False)
+    summary = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DocumentSource(Base):
+    """Last known content of a document URL, with its HTTP validators.
+
+    Lets an unchanged URL be matched to its stored extraction with a HEAD
+    request instead of a download.
+    """
+
+    __tablename__ = "document_sources"
+
+    url = Column(Text, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_sha256 = Column(String(64), nullable=False)
+    checked_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Job(Base):
+    """Durable background job, claimed by workers (see app.services.jobs).
+
+    `progress` doubles as the resume checkpoint: a handler commits it together
+    with the work it describes, so a job reclaimed after a crash picks up where
+    the last commit left off.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued, running, completed, failed
+    payload = Column(JSON, nullable=True)
+    data = Column(LargeBinary, nullable=True)  # job input blob, e.g. the uploaded CSV
+    progress = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class VendorIndexChange(Base):
+    """Append-only log of vendor index writes (see app.services.index_sync).
+
+    One row per written vendor, or a row without vendor_id when the whole
+    index was rebuilt.  The highest `seq` is the index version shared by every
+    process.
+    """
+
+    __tablename__ = "vendor_index_changes"
+
+    # BIGSERIAL in Postgres; sqlite only autoincrements INTEGER primary keys
+    seq = Column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    vendor_id = Column(String, nullable=True)
+    origin = Column(String, nullable=False)  # process that made the write
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
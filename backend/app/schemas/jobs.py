@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, completed, failed
+    progress: Optional[dict] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
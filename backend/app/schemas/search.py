@@ -62,6 +62,49 @@ class VendorSmartSearchResponse(BaseModel):
     external_count: int
     query: str
     top_n: int
+    # Phases ("internal" / "external") cancelled by the latency budget
+    truncated_phases: List[str] = []
+
+
+class VendorBatchSearchRequest(BaseModel):
+    """Line items of one RFP; `rfp_data` supplies RFP-wide context (standards, …)."""
+
+    line_items: List[str]
+    rfp_data: Optional[dict] = None
+
+
+class LineItemSearchResult(BaseModel):
+    line_item: str
+    intent: dict
+    results: List[VendorSearchResult]
+
+
+class VendorCoverage(BaseModel):
+    """A vendor's reach across the batch's line items."""
+
+    vendor_id: str
+    vendor_name: str
+    location: str = ""
+    covered_items: List[int]  # indices into line_items
+    coverage: float  # fraction of line items matched
+    average_score: float  # mean final_score over matched items
+
+
+class VendorBatchSearchResponse(BaseModel):
+    items: List[LineItemSearchResult]
+    coverage: List[VendorCoverage]
+    total_items: int
+
+
+class SearchSuggestion(BaseModel):
+    text: str
+    kind: str  # "product" | "certification" | "location"
+    vendor_count: int
+
+
+class SearchSuggestResponse(BaseModel):
+    query: str
+    suggestions: List[SearchSuggestion]
 
 
 class SearchHistoryResponse(BaseModel):
@@ -10,15 +10,28 @@ OpenSearch for vector search.
 import asyncio
 import json
 import re
-import traceback
+from types import SimpleNamespace
+from typing import Callable, Optional
 
-import boto3
 import httpx
-from opensearchpy import OpenSearch, RequestsHttpConnection
 from sqlalchemy.orm import Session
 
+from app.core.aws import aws_client
 from app.core.config import settings
+from app.core.http import download as http_download, get_http_client
+from app.core import llm as llm_gateway
+from app.core.opensearch import get_opensearch_client
+from app.core.timing import timed_call
 from app.models.domain import Vendor, VendorDocument
+from app.services import extraction_store
+from app.services.embedding_cache import (
+    get_cached_embedding,
+    normalize_embedding_text,
+    store_embedding,
+)
+from app.services.ingestion import IngestItem, Stage, run_pipeline, stage_concurrency
+from app.services.search_cache import bump_vendor_index_version
+from app.services.vendor_mirror import mirror_enabled, vendor_mirror
 
 # ---------------------------------------------------------------------------
 # AWS clients
@@ -26,42 +39,7 @@ from app.models.domain import Vendor, VendorDocument
 
 
 def _get_bedrock_client():
-    return boto3.client(
-        service_name="bedrock-runtime",
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
-
-
-def _get_opensearch_client() -> OpenSearch:
-    """
-    Return an OpenSearch client using HTTP basic auth (username + password).
-
-    The OPENSEARCH_URL may point to the Dashboards UI
-    (e.g. https://…/\_dashboards) — the /_dashboards suffix is stripped
-    automatically so we always connect to the API root.
-    """
-    if not settings.OPENSEARCH_URL:
-        raise ValueError("OPENSEARCH_URL is not configured")
-    if not settings.OPENSEARCH_USER or not settings.OPENSEARCH_PASSWORD:
-        raise ValueError("OPENSEARCH_USER and OPENSEARCH_PASSWORD must be configured")
-
-    # Strip the Dashboards suffix and any trailing slash to get the API endpoint
-    api_url = re.sub(r"/_dashboards.*$", "", settings.OPENSEARCH_URL).rstrip("/")
-
-    # Separate host from protocol
-    host = api_url.replace("https://", "").replace("http://", "")
-    use_ssl = api_url.startswith("https://")
-
-    return OpenSearch(
-        hosts=[{"host": host, "port": 443}],
-        http_auth=(settings.OPENSEARCH_USER, settings.OPENSEARCH_PASSWORD),
-        use_ssl=use_ssl,
-        verify_certs=True,
-        connection_class=RequestsHttpConnection,
-        timeout=30,
-    )
+    return aws_client("bedrock-runtime")
 
 
 # ---------------------------------------------------------------------------
@@ -71,124 +49,110 @@ def _get_opensearch_client() -> OpenSearch:
 INDEX_NAME = settings.OPENSEARCH_INDEX
 VENDOR_INDEX_NAME = settings.VENDOR_INDEX_NAME
 
+# Titan Text Embeddings v2 supports 256, 512 or 1024 output dimensions
+EMBEDDING_DIMENSIONS = settings.EMBEDDING_DIMENSIONS
+if EMBEDDING_DIMENSIONS not in (256, 512, 1024):
+    raise ValueError("EMBEDDING_DIMENSIONS must be 256, 512 or 1024")
 
-def ensure_opensearch_index():
-    """Create the OpenSearch indices with kNN mapping if they don't exist."""
-    try:
-        client = _get_opensearch_client()
+VECTOR_ENCODING = settings.VECTOR_ENCODING
+if VECTOR_ENCODING not in ("float", "fp16", "byte"):
+    raise ValueError("VECTOR_ENCODING must be float, fp16 or byte")
 
-        # For OpenSearch Serverless, index creation works differently
-        # Check if index exists first
-        if not client.indices.exists(index=INDEX_NAME):
-            mapping = {
-                "settings": {
-                    "index": {
-                        "knn": True,
-                    }
-                },
-                "mappings": {
-                    "properties": {
-                        "vendor_id": {"type": "keyword"},
-                        "vendor_name": {"type": "text"},
-                        "document_id": {"type": "keyword"},
-                        "document_name": {"type": "text"},
-                        "document_type": {"type": "keyword"},
-                        "document_summary": {"type": "text"},
-                        "issued_to": {"type": "text"},
-                        "issuing_authority": {"type": "text"},
-                        "issue_date": {"type": "keyword"},
-                        "expiry_date": {"type": "keyword"},
-                        "document_url": {"type": "keyword"},
-                        "embedding": {
-                            "type": "knn_vector",
-                            "dimension": 1024,
-                            "method": {
-                                "name": "hnsw",
-                                "space_type": "cosinesimil",
-                                "engine": "faiss",
-                            },
-                        },
-                    }
-                },
-            }
-            client.indices.create(index=INDEX_NAME, body=mapping)
-            print(f"✓ Created OpenSearch index: {INDEX_NAME}")
-        else:
-            print(f"✓ OpenSearch index already exists: {INDEX_NAME}")
 
-        if not client.indices.exists(index=VENDOR_INDEX_NAME):
-            vendor_mapping = {
-                "settings": {
-                    "index": {
-                        "knn": True,
-                    }
-                },
-                "mappings": {
-                    "properties": {
-                        "vendor_id": {"type": "keyword"},
-                        "vendor_name": {"type": "text"},
-                        "location": {"type": "text"},
-                        "estd": {"type": "integer"},
-                        "mobile": {"type": "text"},
-                        "contact_email": {"type": "keyword"},
-                        "website": {"type": "keyword"},
-                        "products": {"type": "text"},
-                        "certificates": {"type": "text"},
-                        "embedding": {
-                            "type": "knn_vector",
-                            "dimension": 1024,
-                            "method": {
-                                "name": "hnsw",
-                                "space_type": "cosinesimil",
-                                "engine": "faiss",
-                            },
-                        },
-                    }
-                },
-            }
-            client.indices.create(index=VENDOR_INDEX_NAME, body=vendor_mapping)
-            print(f"✓ Created OpenSearch index: {VENDOR_INDEX_NAME}")
-        else:
-            print(f"✓ OpenSearch index already exists: {VENDOR_INDEX_NAME}")
+def vector_engine() -> str:
+    """kNN engine for the encoding: faiss, except byte vectors, which need lucene."""
+    return "lucene" if VECTOR_ENCODING == "byte" else "faiss"
 
-    except Exception as e:
-        print(f"⚠ Could not ensure OpenSearch index: {e}")
 
+def _knn_vector_mapping() -> dict:
+    """
+    knn_vector field for the configured dimensions and encoding.
 
-def rebuild_vendor_index() -> dict:
+    float — 4 bytes/dim, faiss HNSW.
+    fp16  — 2 bytes/dim via the faiss scalar quantizer; vectors are still sent
+            as floats and quantized on ingest.
+    byte  — 1 byte/dim (`data_type: byte`, lucene HNSW); vectors are quantized
+            client-side by encode_vector, both when indexing and at query time.
     """
-    Drop the vendor index (configured via VENDOR_INDEX_NAME) if it exists and
-    recreate it with the correct knn_vector mapping for the embedding field.
+    method = {"name": "hnsw", "space_type": "cosinesimil", "engine": vector_engine()}
+    field = {"type": "knn_vector", "dimension": EMBEDDING_DIMENSIONS}
+    if VECTOR_ENCODING == "fp16":
+        method["parameters"] = {
+            "encoder": {"name": "sq", "parameters": {"type": "fp16"}}
+        }
+    elif VECTOR_ENCODING == "byte":
+        field["data_type"] = "byte"
+    field["method"] = method
+    return field
 
 
-    Returns a summary dict with 'deleted' and 'created' booleans.
+def encode_vector(embedding: list[float]) -> list:
     """
-    client = _get_opensearch_client()
-    deleted = False
-    created = False
+    Convert a float embedding to the representation the kNN field stores.
+
+    For byte encoding each vector is scaled by 127 / max|v| and rounded to
+    int8; cosine similarity is scale-invariant, so only rounding error
+    remains.  Other encodings pass through unchanged.
+    """
+    if VECTOR_ENCODING != "byte" or not embedding:
+        return embedding
+    peak = max(abs(v) for v in embedding) or 1.0
+    scale = 127.0 / peak
+    return [max(-128, min(127, round(v * scale))) for v in embedding]
+
+
+def knn_score_to_similarity(score: float) -> float:
+    """
+    An OpenSearch cosinesimil score on the 1 + cosine scale ([0, 2]) used by
+    VENDOR_SEARCH_VECTOR_MIN_SCORE, the vendor mirror and result shaping.
+    faiss already scores 1 + cosine; lucene scores (1 + cosine) / 2.
+    """
+    return score * 2.0 if vector_engine() == "lucene" else score
 
-    if client.indices.exists(index=VENDOR_INDEX_NAME):
-        client.indices.delete(index=VENDOR_INDEX_NAME)
-        print(f"✓ Deleted OpenSearch index: {VENDOR_INDEX_NAME}")
-        deleted = True
 
-    vendor_mapping = {
+def similarity_to_knn_score(similarity: float) -> float:
+    """Inverse of knn_score_to_similarity, for `min_score` in kNN queries."""
+    return similarity / 2.0 if vector_engine() == "lucene" else similarity
+
+
+def vendor_index_body() -> dict:
+    """Settings + mappings for the vendor index (VENDOR_INDEX_NAME)."""
+    return {
         "settings": {
             "index": {
                 "knn": True,
-            }
+            },
+            "analysis": {
+                "normalizer": {
+                    "lowercase_keyword": {
+                        "type": "custom",
+                        "filter": ["lowercase"],
+                    }
+                }
+            },
         },
         "mappings": {
             "properties": {
                 "vendor_id": {"type": "keyword"},
                 "vendor_name": {"type": "text"},
                 "location": {"type": "text"},
+                # Lower-cased location parts ("pune", "maharashtra", …) and
+                # certificates.keyword back the filtered kNN phase
+                "location_terms": {"type": "keyword"},
                 "estd": {"type": "integer"},
                 "mobile": {"type": "text"},
                 "contact_email": {"type": "keyword"},
                 "website": {"type": "keyword"},
                 "products": {"type": "text"},
-                "certificates": {"type": "text"},
+                "certificates": {
+                    "type": "text",
+                    "fields": {
+                        "keyword": {
+                            "type": "keyword",
+                            "normalizer": "lowercase_keyword",
+                        }
+                    },
+                },
                 # certificate_details is an array of objects extracted from
                 # vendor documents.  Dates are stored as keyword so that
                 # empty strings don't trigger date-parsing errors.
@@ -204,21 +168,225 @@ def rebuild_vendor_index() -> dict:
                         "document_url": {"type": "keyword"},
                     },
                 },
-                "embedding": {
-                    "type": "knn_vector",
-                    "dimension": 1024,
-                    "method": {
-                        "name": "hnsw",
-                        "space_type": "cosinesimil",
-                        "engine": "faiss",
-                    },
-                },
+                "embedding": _knn_vector_mapping(),
+            }
+        },
+    }
+
+
+def document_index_body() -> dict:
+    """Settings + mappings for the document index (OPENSEARCH_INDEX)."""
+    return {
+        "settings": {
+            "index": {
+                "knn": True,
+            }
+        },
+        "mappings": {
+            "properties": {
+                "vendor_id": {"type": "keyword"},
+                "vendor_name": {"type": "text"},
+                "document_id": {"type": "keyword"},
+                "document_name": {"type": "text"},
+                "document_type": {"type": "keyword"},
+                "document_summary": {"type": "text"},
+                "issued_to": {"type": "text"},
+                "issuing_authority": {"type": "text"},
+                "issue_date": {"type": "keyword"},
+                "expiry_date": {"type": "keyword"},
+                "document_url": {"type": "keyword"},
+                "embedding": _knn_vector_mapping(),
             }
         },
     }
-    client.indices.create(index=VENDOR_INDEX_NAME, body=vendor_mapping)
+
+
+async def vector_mapping_mismatch(client, index: str) -> Optional[str]:
+    """
+    Describe how `index`'s existing embedding mapping differs from the
+    configured dimensions/encoding, or None when it matches (or is absent).
+    """
+    mapping = await client.indices.get_mapping(index=index)
+    props = next(iter(mapping.values()))["mappings"].get("properties", {})
+    current = props.get("embedding")
+    if not current:
+        return None
+    expected = _knn_vector_mapping()
+    differences = []
+    if current.get("dimension") != expected["dimension"]:
+        differences.append(
+            f"dimension {current.get('dimension')} → {expected['dimension']}"
+        )
+    if current.get("data_type", "float") != expected.get("data_type", "float"):
+        differences.append(
+            f"data_type {current.get('data_type', 'float')} → "
+            f"{expected.get('data_type', 'float')}"
+        )
+    current_encoder = (
+        current.get("method", {}).get("parameters", {}).get("encoder", {}).get("name")
+    )
+    expected_encoder = (
+        expected["method"].get("parameters", {}).get("encoder", {}).get("name")
+    )
+    if current_encoder != expected_encoder:
+        differences.append(f"encoder {current_encoder} → {expected_encoder}")
+    return ", ".join(differences) or None
+
+
+# None = not yet checked; True/False once knn_filters_available has run
+_knn_filters_ready: bool | None = None
+
+
+async def knn_filters_available() -> bool:
+    """
+    Whether the vendor index has the keyword fields filtered kNN relies on
+    (checked once, lazily).  Indices created before they were added need
+    POST /api/vendors/reindex; until then the vector phase runs unfiltered.
+    """
+    global _knn_filters_ready
+    if _knn_filters_ready is None:
+        try:
+            client = get_opensearch_client()
+            mapping = await client.indices.get_mapping(index=VENDOR_INDEX_NAME)
+            props = next(iter(mapping.values()))["mappings"].get("properties", {})
+            _knn_filters_ready = "location_terms" in props and "keyword" in (
+                props.get("certificates", {}).get("fields", {})
+            )
+        except Exception as e:
+            print(f"⚠ Could not check vendor index filter fields: {e}")
+            return False
+    return _knn_filters_ready
+
+
+async def ensure_opensearch_index():
+    """Create the OpenSearch indices with kNN mapping if they don't exist."""
+    try:
+        client = get_opensearch_client()
+
+        # For OpenSearch Serverless, index creation works differently
+        # Check if index exists first
+        if not await client.indices.exists(index=INDEX_NAME):
+            await client.indices.create(index=INDEX_NAME, body=document_index_body())
+            print(f"✓ Created OpenSearch index: {INDEX_NAME}")
+        else:
+            print(f"✓ OpenSearch index already exists: {INDEX_NAME}")
+
+        if not await client.indices.exists(index=VENDOR_INDEX_NAME):
+            await client.indices.create(
+                index=VENDOR_INDEX_NAME, body=vendor_index_body()
+            )
+            print(f"✓ Created OpenSearch index: {VENDOR_INDEX_NAME}")
+        else:
+            print(f"✓ OpenSearch index already exists: {VENDOR_INDEX_NAME}")
+
+        # Changing EMBEDDING_DIMENSIONS / VECTOR_ENCODING needs a reindex
+        for index, endpoint in (
+            (VENDOR_INDEX_NAME, "POST /api/vendors/reindex"),
+            (INDEX_NAME, "POST /api/vendors/reindex?documents=true"),
+        ):
+            mismatch = await vector_mapping_mismatch(client, index)
+            if mismatch:
+                print(
+                    f"⚠ OpenSearch index {index} was built for a different vector "
+                    f"config ({mismatch}); run {endpoint} to migrate"
+                )
+        if settings.VENDOR_SEARCH_KNN_FILTERS and not await knn_filters_available():
+            print(
+                f"⚠ OpenSearch index {VENDOR_INDEX_NAME} lacks the kNN filter fields; "
+                "run POST /api/vendors/reindex to enable filtered vector search"
+            )
+
+    except Exception as e:
+        print(f"⚠ Could not ensure OpenSearch index: {e}")
+
+    if settings.VENDOR_SEARCH_ENGINE == "server_hybrid":
+        await ensure_hybrid_search_pipeline()
+
+
+HYBRID_SEARCH_PIPELINE = settings.VENDOR_SEARCH_PIPELINE
+
+# None = not yet checked; True/False once ensure_hybrid_search_pipeline has run
+_hybrid_pipeline_ready: bool | None = None
+
+
+async def ensure_hybrid_search_pipeline() -> bool:
+    """
+    Create (or update) the normalization search pipeline used by server-side
+    hybrid vendor search.
+
+    Scores from the kNN and BM25 sub-queries are min-max normalised and
+    combined with a weighted arithmetic mean using the configured vector and
+    keyword weights.  Returns False when the cluster lacks the
+    normalization-processor (neural-search plugin), in which case search falls
+    back to client-side RRF.
+    """
+    global _hybrid_pipeline_ready
+
+    vec_w = max(0.0, settings.VENDOR_SEARCH_VECTOR_WEIGHT)
+    kw_w = max(0.0, settings.VENDOR_SEARCH_KEYWORD_WEIGHT)
+    total = (vec_w + kw_w) or 1.0
+    # Weights are positional (same order as the hybrid sub-queries) and must sum to 1
+    weights = [round(vec_w / total, 4), round(1 - round(vec_w / total, 4), 4)]
+
+    pipeline = {
+        "description": "Vendor hybrid search: min-max normalised kNN + BM25, weighted mean",
+        "phase_results_processors": [
+            {
+                "normalization-processor": {
+                    "normalization": {"technique": "min_max"},
+                    "combination": {
+                        "technique": "arithmetic_mean",
+                        "parameters": {"weights": weights},
+                    },
+                }
+            }
+        ],
+    }
+
+    try:
+        client = get_opensearch_client()
+        await client.search_pipeline.put(id=HYBRID_SEARCH_PIPELINE, body=pipeline)
+        print(f"✓ Ensured OpenSearch search pipeline: {HYBRID_SEARCH_PIPELINE}")
+        _hybrid_pipeline_ready = True
+    except Exception as e:
+        print(f"⚠ Could not ensure search pipeline {HYBRID_SEARCH_PIPELINE}: {e}")
+        _hybrid_pipeline_ready = False
+    return _hybrid_pipeline_ready
+
+
+async def hybrid_pipeline_available() -> bool:
+    """Whether server-side hybrid search can be used (checked once, lazily)."""
+    if _hybrid_pipeline_ready is None:
+        return await ensure_hybrid_search_pipeline()
+    return _hybrid_pipeline_ready
+
+
+async def rebuild_vendor_index() -> dict:
+    """
+    Drop the vendor index (configured via VENDOR_INDEX_NAME) if it exists and
+    recreate it with the correct knn_vector mapping for the embedding field.
+
+
+    Returns a summary dict with 'deleted' and 'created' booleans.
+    """
+    global _knn_filters_ready
+    client = get_opensearch_client()
+    deleted = False
+    created = False
+
+    if await client.indices.exists(index=VENDOR_INDEX_NAME):
+        await client.indices.delete(index=VENDOR_INDEX_NAME)
+        print(f"✓ Deleted OpenSearch index: {VENDOR_INDEX_NAME}")
+        deleted = True
+
+    await client.indices.create(index=VENDOR_INDEX_NAME, body=vendor_index_body())
     print(f"✓ Created OpenSearch index: {VENDOR_INDEX_NAME}")
     created = True
+    _knn_filters_ready = True
+
+    await bump_vendor_index_version()
+    if mirror_enabled():
+        vendor_mirror.clear()
 
     return {"deleted": deleted, "created": created}
 
@@ -229,11 +397,43 @@ def rebuild_vendor_index() -> dict:
 
 
 async def download_document(url: str) -> bytes:
-    """Download document bytes from an S3/HTTP URL."""
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        return response.content
+    """Download document bytes from an S3/HTTP URL (see app.core.http)."""
+    with await http_download(url) as fetched:
+        return await asyncio.to_thread(fetched.read)
+
+
+async def _unchanged_summary(url: str) -> Optional[dict]:
+    """
+    The stored extraction for `url` when a HEAD request reports the same
+    ETag (or, without one, Last-Modified) as the last download; else None.
+    """
+    source = await extraction_store.known_source(url)
+    if source is None:
+        return None
+    etag, last_modified, digest = source
+    if not (etag or last_modified):
+        return None
+    summary = await extraction_store.stored_extraction(
+        digest, settings.BEDROCK_NOVA_MODEL_ID, _EXTRACTION_VERSION
+    )
+    if summary is None:
+        return None
+
+    try:
+        response = await get_http_client().head(url, timeout=10.0)
+    except httpx.HTTPError:
+        return None
+    # Presigned GET URLs typically reject HEAD; those are simply downloaded
+    if response.status_code != 200:
+        return None
+    if etag:
+        unchanged = response.headers.get("etag") == etag
+    else:
+        unchanged = response.headers.get("last-modified") == last_modified
+    if not unchanged:
+        return None
+    extraction_store.note_precheck_hit()
+    return summary
 
 
 def _guess_media_type(url: str) -> str:
@@ -292,12 +492,22 @@ The document_type MUST be exactly one of:
 If you cannot determine a field, set it to null. Do NOT output anything outside the JSON object."""
 
 
-async def extract_and_summarize(doc_bytes: bytes, filename: str) -> dict:
+# Bump when _EXTRACTION_PROMPT or the response parsing changes
+_EXTRACTION_VERSION = "1"
+
+
+async def extract_and_summarize(
+    doc_bytes: bytes, filename: str, digest: Optional[str] = None
+) -> dict:
     """
     Use Amazon Nova Lite via Bedrock Converse API to extract text and
     generate a structured summary from a document/image in one pass.
+
+    Results are stored by the SHA-256 of the document bytes (see
+    app.services.extraction_store), so the same file linked from several
+    vendors, or re-uploaded unchanged, is only sent to Nova once.  Pass
+    `digest` when the caller already hashed the bytes.
     """
-    bedrock = _get_bedrock_client()
     media_type = _guess_media_type(filename)
 
     # Build the content block with the document
@@ -329,20 +539,29 @@ async def extract_and_summarize(doc_bytes: bytes, filename: str) -> dict:
         }
     ]
 
-    response = await asyncio.to_thread(
-        bedrock.converse,
-        modelId=settings.BEDROCK_NOVA_MODEL_ID,
-        messages=messages,
-        inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
-    )
+    inference_config = {"maxTokens": 1024, "temperature": 0.1}
 
-    raw_text = response["output"]["message"]["content"][0]["text"].strip()
+    async def _extract() -> dict:
+        response = await llm_gateway.converse(
+            modelId=settings.BEDROCK_NOVA_MODEL_ID,
+            messages=messages,
+            inferenceConfig=inference_config,
+        )
 
-    # Strip markdown fences if present
-    raw_text = re.sub(r"^```(?:json)?\s*", "", raw_text)
-    raw_text = re.sub(r"\s*```$", "", raw_text)
+        raw_text = response["output"]["message"]["content"][0]["text"].strip()
 
-    return json.loads(raw_text)
+        # Strip markdown fences if present
+        raw_text = re.sub(r"^```(?:json)?\s*", "", raw_text)
+        raw_text = re.sub(r"\s*```$", "", raw_text)
+
+        return json.loads(raw_text)
+
+    return await extraction_store.extract_once(
+        digest or extraction_store.content_digest(doc_bytes),
+        settings.BEDROCK_NOVA_MODEL_ID,
+        _EXTRACTION_VERSION,
+        _extract,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -350,26 +569,53 @@ async def extract_and_summarize(doc_bytes: bytes, filename: str) -> dict:
 # ---------------------------------------------------------------------------
 
 
-def generate_embedding(text: str) -> list[float]:
-    """Generate a 1024-dim embedding vector using Amazon Titan Embeddings v2."""
+@timed_call("embed")
+def cached_embedding(text: str) -> Optional[list[float]]:
+    """The embedding cache's vector for `text`, or None without calling Titan."""
+    input_text = normalize_embedding_text(text)[:8000]  # Titan v2 max input
+    return get_cached_embedding(
+        input_text, settings.BEDROCK_EMBEDDING_MODEL_ID, EMBEDDING_DIMENSIONS
+    )
+
+
+def generate_embedding(text: str, lookup: bool = True) -> list[float]:
+    """
+    Generate an EMBEDDING_DIMENSIONS-dim embedding vector using Amazon Titan
+    Embeddings v2.
+
+    Identical (normalised) inputs are served from the embedding cache, so
+    repeat searches and unchanged vendors skip the Bedrock round trip.
+    `lookup=False` skips that check for callers that just missed it via
+    `cached_embedding`; the result is still cached.
+    """
+    input_text = normalize_embedding_text(text)[:8000]  # Titan v2 max input
+    model_id = settings.BEDROCK_EMBEDDING_MODEL_ID
+
+    if lookup:
+        cached = get_cached_embedding(input_text, model_id, EMBEDDING_DIMENSIONS)
+        if cached is not None:
+            return cached
+
     bedrock = _get_bedrock_client()
 
     body = json.dumps(
         {
-            "inputText": text[:8000],  # Titan v2 max input
-            "dimensions": 1024,
+            "inputText": input_text,
+            "dimensions": EMBEDDING_DIMENSIONS,
         }
     )
 
     response = bedrock.invoke_model(
-        modelId=settings.BEDROCK_EMBEDDING_MODEL_ID,
+        modelId=model_id,
         body=body,
         contentType="application/json",
         accept="application/json",
     )
 
     result = json.loads(response["body"].read())
-    return result["embedding"]
+    embedding = result["embedding"]
+    store_embedding(input_text, model_id, EMBEDDING_DIMENSIONS, embedding)
+    return embedding
 
 
 # ---------------------------------------------------------------------------
@@ -377,17 +623,17 @@ def generate_embedding(text: str) -> list[float]:
 # ---------------------------------------------------------------------------
 
 
-def index_to_opensearch(doc_id: str, embedding: list[float], metadata: dict):
+async def index_to_opensearch(doc_id: str, embedding: list[float], metadata: dict):
     """Index a document summary + vector into OpenSearch."""
-    client = _get_opensearch_client()
+    client = get_opensearch_client()
 
     body = {
         "document_id": doc_id,
-        "embedding": embedding,
+        "embedding": encode_vector(embedding),
         **metadata,
     }
 
-    client.index(index=INDEX_NAME, id=doc_id, body=body)
+    await client.index(index=INDEX_NAME, id=doc_id, body=body)
 
 
 # ---------------------------------------------------------------------------
@@ -395,115 +641,278 @@ def index_to_opensearch(doc_id: str, embedding: list[float], metadata: dict):
 # ---------------------------------------------------------------------------
 
 
-async def process_vendor_document(doc_id: str, db: Session) -> bool:
-    """
-    Full pipeline for a single document:
-    download → extract+summarize (Nova) → embed (Titan) → save to DB → index to OpenSearch.
-    Returns True on success.
-    """
-    doc = db.query(VendorDocument).filter(VendorDocument.id == doc_id).first()
-    if not doc:
-        return False
+def _document_embed_text(vendor: Optional[Vendor], doc: VendorDocument) -> str:
+    """Text embedded for a processed document: vendor context + extracted fields."""
+    products_str = ", ".join(vendor.products) if vendor and vendor.products else ""
+    certs_str = ", ".join(vendor.certificates) if vendor and vendor.certificates else ""
+    return (
+        f"Vendor: {vendor.name if vendor else ''}\n"
+        f"Location: {vendor.location if vendor else ''}\n"
+        f"Products: {products_str}\n"
+        f"Certificates: {certs_str}\n"
+        f"Document: {doc.document_name or ''}\n"
+        f"Type: {doc.document_type or ''}\n"
+        f"Issued to: {doc.issued_to or ''}\n"
+        f"Authority: {doc.issuing_authority or ''}\n"
+        f"Summary: {doc.document_summary or ''}"
+    )
+
+
+def _document_metadata(vendor: Optional[Vendor], doc: VendorDocument) -> dict:
+    """Document-index source fields for a processed document."""
+    return {
+        "vendor_id": doc.vendor_id,
+        "vendor_name": vendor.name if vendor else "",
+        "vendor_location": vendor.location if vendor else "",
+        "vendor_products": vendor.products if vendor else [],
+        "vendor_certificates": vendor.certificates if vendor else [],
+        "document_name": doc.document_name or "",
+        "document_type": doc.document_type or "",
+        "document_summary": doc.document_summary or "",
+        "issued_to": doc.issued_to or "",
+        "issuing_authority": doc.issuing_authority or "",
+        "issue_date": doc.issue_date or "",
+        "expiry_date": doc.expiry_date or "",
+        "document_url": doc.document_url,
+    }
 
+
+def apply_summary(doc, summary: dict):
+    """Copy Nova's extraction fields onto a VendorDocument (or a snapshot of one)."""
+    doc.document_name = summary.get("document_name")
+    doc.issued_to = summary.get("issued_to")
+    doc.issuing_authority = summary.get("issuing_authority")
+    doc.issue_date = summary.get("issue_date")
+    doc.expiry_date = summary.get("expiry_date")
+    doc.document_summary = summary.get("document_summary")
+    doc.document_type = summary.get("document_type", "Others")
+
+
+# Pipeline stages (see app.services.ingestion).  They read and write
+# item.state only, never the Session.  Download/extract failures are soft:
+# they are recorded as state["warning"] and later stages decide what to do.
+
+
+async def download_stage(item: IngestItem):
+    url = item.state["url"]
     try:
-        vendor = db.query(Vendor).filter(Vendor.id == doc.vendor_id).first()
+        # An unchanged URL reuses its stored extraction without a download
+        summary = await _unchanged_summary(url)
+        if summary is not None:
+            item.state["summary"] = summary
+            return
+        # The body stays in a spooled temp file until the extract stage, so
+        # queued documents do not pile up in memory
+        fetched = await http_download(url)
+        item.state["download"] = fetched
+        await asyncio.to_thread(
+            extraction_store.record_source,
+            url,
+            fetched.etag,
+            fetched.last_modified,
+            fetched.sha256,
+        )
+    except Exception as e:
+        print(f"  ⚠ Could not download {item.state['url']}: {e}")
+        item.state["warning"] = e
 
-        try:
-            # 1. Download the document
-            doc_bytes = await download_document(doc.document_url)
-            filename = _guess_filename(doc.document_url)
 
-            # 2. Extract + summarize via Nova Lite
-            summary = await extract_and_summarize(doc_bytes, filename)
-            doc.error_message = None
-        except Exception as e:
-            print(f"  ⚠ Could not download/summarize {doc.document_url}: {e}")
-            summary = {}
-            doc.error_message = f"Warning, partial index: {e}"
-
-        # 3. Update DB record
-        doc.document_name = summary.get("document_name")
-        doc.issued_to = summary.get("issued_to")
-        doc.issuing_authority = summary.get("issuing_authority")
-        doc.issue_date = summary.get("issue_date")
-        doc.expiry_date = summary.get("expiry_date")
-        doc.document_summary = summary.get("document_summary")
-        doc.document_type = summary.get("document_type", "Others")
-        doc.processing_status = "completed"
-        db.flush()
-
-        # 4. Generate embedding from the summary text and vendor metadata
-        products_str = ", ".join(vendor.products) if vendor and vendor.products else ""
-        certs_str = (
-            ", ".join(vendor.certificates) if vendor and vendor.certificates else ""
+async def extract_stage(item: IngestItem):
+    fetched = item.state.pop("download", None)
+    if fetched is None:
+        return
+    try:
+        with fetched:
+            doc_bytes = await asyncio.to_thread(fetched.read)
+        item.state["summary"] = await extract_and_summarize(
+            doc_bytes, _guess_filename(item.state["url"]), digest=fetched.sha256
         )
+    except Exception as e:
+        print(f"  ⚠ Could not summarize {item.state['url']}: {e}")
+        item.state["warning"] = e
+
+
+def release_download(item: IngestItem):
+    """Close a download the extract stage did not get to (pipeline `release`)."""
+    fetched = item.state.pop("download", None)
+    if fetched is not None:
+        fetched.close()
+
+
+async def _embed_document_stage(item: IngestItem):
+    doc = item.state["doc"]
+    apply_summary(doc, item.state.get("summary", {}))
+    item.state["embedding"] = await asyncio.to_thread(
+        generate_embedding, _document_embed_text(item.state["vendor"], doc)
+    )
+
+
+async def _index_document_stage(item: IngestItem):
+    doc = item.state["doc"]
+    await index_to_opensearch(
+        doc.id, item.state["embedding"], _document_metadata(item.state["vendor"], doc)
+    )
+
+
+def _vendor_view(vendor: Optional[Vendor]) -> Optional[SimpleNamespace]:
+    if vendor is None:
+        return None
+    return SimpleNamespace(
+        name=vendor.name,
+        location=vendor.location,
+        products=vendor.products,
+        certificates=vendor.certificates,
+    )
+
 
-        embed_text = (
-            f"Vendor: {vendor.name if vendor else ''}\n"
-            f"Location: {vendor.location if vendor else ''}\n"
-            f"Products: {products_str}\n"
-            f"Certificates: {certs_str}\n"
-            f"Document: {doc.document_name or ''}\n"
-            f"Type: {doc.document_type or ''}\n"
-            f"Issued to: {doc.issued_to or ''}\n"
-            f"Authority: {doc.issuing_authority or ''}\n"
-            f"Summary: {doc.document_summary or ''}"
+async def process_documents(
+    db: Session,
+    doc_ids: list[str],
+    on_done: Optional[Callable[[bool], None]] = None,
+) -> dict:
+    """
+    Full pipeline for a set of documents:
+    download → extract+summarize (Nova) → embed (Titan) → index to OpenSearch,
+    each stage with its own worker pool; the DB record is saved as each
+    document comes out of the pipeline.
+
+    A document that cannot be downloaded or summarised is still indexed from
+    its vendor context (with a warning); an embedding or indexing error marks
+    it failed.  `on_done(ok)` is called after each document is committed.
+    Returns {total, succeeded, failed}.
+    """
+    docs = db.query(VendorDocument).filter(VendorDocument.id.in_(doc_ids)).all()
+    vendor_ids = {d.vendor_id for d in docs}
+    vendors = {
+        v.id: _vendor_view(v)
+        for v in db.query(Vendor).filter(Vendor.id.in_(vendor_ids)).all()
+    }
+    items = [
+        IngestItem(
+            key=d.id,
+            state={
+                "url": d.document_url,
+                "doc": SimpleNamespace(
+                    id=d.id, vendor_id=d.vendor_id, document_url=d.document_url
+                ),
+                "vendor": vendors.get(d.vendor_id),
+            },
         )
-        embedding = await asyncio.to_thread(generate_embedding, embed_text)
-
-        # 5. Index to OpenSearch
-        metadata = {
-            "vendor_id": doc.vendor_id,
-            "vendor_name": vendor.name if vendor else "",
-            "vendor_location": vendor.location if vendor else "",
-            "vendor_products": vendor.products if vendor else [],
-            "vendor_certificates": vendor.certificates if vendor else [],
-            "document_name": doc.document_name or "",
-            "document_type": doc.document_type or "",
-            "document_summary": doc.document_summary or "",
-            "issued_to": doc.issued_to or "",
-            "issuing_authority": doc.issuing_authority or "",
-            "issue_date": doc.issue_date or "",
-            "expiry_date": doc.expiry_date or "",
-            "document_url": doc.document_url,
-        }
-        index_to_opensearch(doc.id, embedding, metadata)
+        for d in docs
+    ]
 
+    def record(item: IngestItem):
+        doc = db.get(VendorDocument, item.key)
+        apply_summary(doc, item.state.get("summary", {}))
+        warning = item.state.get("warning")
+        if item.error:
+            doc.processing_status = "failed"
+            doc.error_message = item.error
+            print(f"  ✗ Failed to process document {doc.id} at {item.failed_stage}: {item.error}")
+        else:
+            doc.processing_status = "completed"
+            doc.error_message = f"Warning, partial index: {warning}" if warning else None
+            print(f"  ✓ Processed document {doc.id}: {doc.document_url}")
         db.commit()
-        print(f"  ✓ Processed document {doc.id}: {doc.document_url}")
-        return True
+        if on_done is not None:
+            on_done(not item.error)
+
+    return await run_pipeline(
+        items,
+        [
+            Stage("download", download_stage, stage_concurrency("download")),
+            Stage("extract", extract_stage, stage_concurrency("extract")),
+            Stage("embed", _embed_document_stage, stage_concurrency("embed")),
+            Stage("index", _index_document_stage, stage_concurrency("index")),
+        ],
+        record,
+        release=release_download,
+    )
 
-    except Exception as e:
-        doc.processing_status = "failed"
-        doc.error_message = f"{type(e).__name__}: {str(e)}"
-        db.commit()
-        print(f"  ✗ Failed to process document {doc.id}: {e}")
-        traceback.print_exc()
-        return False
 
+async def process_vendor_document(doc_id: str, db: Session) -> bool:
+    """Process a single document (see process_documents). Returns True on success."""
+    result = await process_documents(db, [doc_id])
+    return result["succeeded"] == 1
 
-async def process_pending_documents(db: Session) -> dict:
-    """Process all documents in 'pending' status."""
-    pending = (
-        db.query(VendorDocument)
+
+async def process_pending_documents(
+    db: Session,
+    progress: Optional[dict] = None,
+    on_progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Process all documents in 'pending' status through the ingestion pipeline.
+
+    Each processed document leaves the pending set, so a resumed run (with the
+    last `progress` checkpoint, see app.services.jobs) only sees the rest.
+    """
+    pending_ids = [
+        doc_id
+        for (doc_id,) in db.query(VendorDocument.id)
         .filter(VendorDocument.processing_status == "pending")
         .all()
+    ]
+
+    summary = progress or {"total": len(pending_ids), "succeeded": 0, "failed": 0}
+
+    print(f"Processing {len(pending_ids)} pending document(s)...")
+
+    def done(ok: bool):
+        summary["succeeded" if ok else "failed"] += 1
+        if on_progress is not None:
+            on_progress(summary)
+
+    await process_documents(db, pending_ids, on_done=done)
+    return summary
+
+
+async def rebuild_document_index(db: Session) -> dict:
+    """
+    Drop and recreate the document index (OPENSEARCH_INDEX) with the current
+    vector mapping, then re-embed and re-index every completed document from
+    the stored extraction fields.  Documents are not downloaded or
+    re-summarized again.  Used to migrate after changing EMBEDDING_DIMENSIONS
+    or VECTOR_ENCODING.
+
+    Returns a summary dict: {total, succeeded, failed}.
+    """
+    client = get_opensearch_client()
+    if await client.indices.exists(index=INDEX_NAME):
+        await client.indices.delete(index=INDEX_NAME)
+        print(f"✓ Deleted OpenSearch index: {INDEX_NAME}")
+    await client.indices.create(index=INDEX_NAME, body=document_index_body())
+    print(f"✓ Created OpenSearch index: {INDEX_NAME}")
+
+    docs = (
+        db.query(VendorDocument)
+        .filter(VendorDocument.processing_status == "completed")
+        .all()
     )
+    vendors = {
+        v.id: v
+        for v in db.query(Vendor)
+        .filter(Vendor.id.in_({d.vendor_id for d in docs}))
+        .all()
+    }
 
-    total = len(pending)
     succeeded = 0
     failed = 0
-
-    print(f"Processing {total} pending document(s)...")
-
-    for doc in pending:
-        ok = await process_vendor_document(doc.id, db)
-        if ok:
+    for doc in docs:
+        vendor = vendors.get(doc.vendor_id)
+        try:
+            embedding = await asyncio.to_thread(
+                generate_embedding, _document_embed_text(vendor, doc)
+            )
+            await index_to_opensearch(
+                doc.id, embedding, _document_metadata(vendor, doc)
+            )
             succeeded += 1
-        else:
+        except Exception as e:
+            print(f"⚠ Failed to re-index document {doc.id}: {e}")
             failed += 1
 
-    return {"total": total, "succeeded": succeeded, "failed": failed}
+    return {"total": len(docs), "succeeded": succeeded, "failed": failed}
 
 
 # ---------------------------------------------------------------------------
@@ -516,14 +925,14 @@ async def search_documents(query: str, db: Session, limit: int = 10) -> list[dic
     # Generate query embedding
     query_embedding = await asyncio.to_thread(generate_embedding, query)
 
-    client = _get_opensearch_client()
+    client = get_opensearch_client()
 
     search_body = {
         "size": limit,
         "query": {
             "knn": {
                 "embedding": {
-                    "vector": query_embedding,
+                    "vector": encode_vector(query_embedding),
                     "k": limit,
                 }
             }
@@ -531,7 +940,7 @@ async def search_documents(query: str, db: Session, limit: int = 10) -> list[dic
         "_source": {"excludes": ["embedding"]},
     }
 
-    response = client.search(index=INDEX_NAME, body=search_body)
+    response = await client.search(index=INDEX_NAME, body=search_body)
 
     results = []
     for hit in response["hits"]["hits"]:
@@ -544,7 +953,7 @@ async def search_documents(query: str, db: Session, limit: int = 10) -> list[dic
             results.append(
                 {
                     "document": doc,
-                    "score": hit["_score"],
+                    "score": knn_score_to_similarity(hit["_score"]),
                     "vendor_name": source.get("vendor_name", ""),
                 }
             )
@@ -17,12 +17,12 @@ import json
 import re
 from typing import Optional
 
-import boto3
-
 from nylas import Client  # nylas>=6.0.0 (Nylas API v3)
 
+from app.core.aws import aws_client
 from app.core.config import settings
-from app.services.rfp import get_bedrock_client
+from app.core import llm as llm_gateway
+from app.services.llm_cache import cached_llm_call
 
 
 # ---------------------------------------------------------------------------
@@ -61,12 +61,7 @@ def download_rfp_pdf_from_s3(project_id: str) -> bytes:
         raise RuntimeError("S3_RFP_BUCKET is not configured")
 
     region = settings.S3_RFP_BUCKET_REGION or settings.AWS_REGION
-    s3 = boto3.client(
-        "s3",
-        region_name=region,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
+    s3 = aws_client("s3", region)
 
     s3_key = f"{project_id}.pdf"
     response = s3.get_object(Bucket=bucket, Key=s3_key)
@@ -839,7 +834,11 @@ def extract_project_id_from_subject(subject: str) -> Optional[str]:
     return match.group(1) if match else None
 
 
-def parse_quotation_with_bedrock(
+# Bump when the quotation prompt or its response parsing changes
+_QUOTATION_PROMPT_VERSION = "1"
+
+
+async def parse_quotation_with_bedrock(
     email_body: str, project_name: str, attachments: list[dict] = None
 ) -> dict:
     """
@@ -847,7 +846,9 @@ def parse_quotation_with_bedrock(
     and any attached new files (PDFs/Images).
 
     Returns a dict with: price, currency, delivery_timeline, quality_standards, warranty_terms, compliance_certifications, notes, po_number, contract_number, payment_schedule, delivery_milestones, payment_terms.
-    Falls back to empty defaults if Bedrock is unavailable.
+    Falls back to empty defaults if Bedrock is unavailable.  Successful parses
+    are cached by the full request (email text and attachment bytes), so a
+    redelivered webhook or a re-sync does not call Bedrock again.
     """
     prompt = f"""
 You are an AI procurement assistant. A vendor has replied to an RFP for "{project_name}".
@@ -929,12 +930,14 @@ Return only the JSON object, no markdown formatting.
         }
     )
 
-    try:
-        bedrock = get_bedrock_client()
-        response = bedrock.converse(
+    messages = [{"role": "user", "content": messages_content}]
+    inference_config = {"maxTokens": 1024, "temperature": 0.1}
+
+    async def _parse() -> dict:
+        response = await llm_gateway.converse(
             modelId=settings.BEDROCK_NOVA_MODEL_ID,
-            messages=[{"role": "user", "content": messages_content}],
-            inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
+            messages=messages,
+            inferenceConfig=inference_config,
         )
 
         raw_text = response["output"]["message"]["content"][0]["text"].strip()
@@ -942,8 +945,16 @@ Return only the JSON object, no markdown formatting.
         raw_text = re.sub(r"^```(?:json)?\s*", "", raw_text)
         raw_text = re.sub(r"\s*```$", "", raw_text)
 
-        parsed = json.loads(raw_text)
-        return parsed
+        return json.loads(raw_text)
+
+    try:
+        return await cached_llm_call(
+            "parse_quotation",
+            _QUOTATION_PROMPT_VERSION,
+            settings.BEDROCK_NOVA_MODEL_ID,
+            {"messages": messages, "config": inference_config},
+            _parse,
+        )
     except Exception as exc:
         print(f"[email service] Bedrock quotation parsing failed: {exc}")
         return {
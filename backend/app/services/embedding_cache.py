@@ -0,0 +1,88 @@
+"""
+Content-addressed embedding cache.
+
+Two tiers sit in front of Titan: an in-process LRU for hot repeat queries and
+the `embedding_cache` Postgres table so vectors survive restarts and full
+reindexes.  Entries are keyed by a SHA-256 of the model ID, output dimensions
+and normalised input text, so a model or dimension change never serves a stale
+vector.
+
+All store access is best-effort: a database error is logged and treated as a
+miss, never surfaced to the embedding caller.
+"""
+
+import hashlib
+import re
+import unicodedata
+from array import array
+from typing import Optional
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.models.domain import EmbeddingCacheEntry
+
+
+class _EmbeddingCache(TwoTierCache):
+    """Vectors stored as packed float32 bytes; callers get their own list."""
+
+    def to_columns(self, vector: list[float]) -> dict:
+        return {"vector": array("f", vector).tobytes()}
+
+    def from_row(self, row: EmbeddingCacheEntry) -> list[float]:
+        vec = array("f")
+        vec.frombytes(row.vector)
+        return vec.tolist()
+
+    def copy(self, vector: list[float]) -> list[float]:
+        return list(vector)
+
+
+_cache = _EmbeddingCache(
+    "Embedding cache",
+    EmbeddingCacheEntry,
+    memory_entries=settings.EMBEDDING_CACHE_MEMORY_ENTRIES,
+    enabled=lambda: settings.EMBEDDING_CACHE_ENABLED,
+    persist=lambda: settings.EMBEDDING_CACHE_PERSIST,
+    max_rows=settings.EMBEDDING_CACHE_STORE_MAX_ROWS,
+    prune_every=500,
+)
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Canonicalise text so trivially different inputs share one cache entry."""
+    text = unicodedata.normalize("NFC", text or "")
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    return text.strip()
+
+
+def embedding_cache_key(text: str, model_id: str, dimensions: int) -> str:
+    payload = f"{model_id}\x1f{dimensions}\x1f{text}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def get_cached_embedding(
+    text: str, model_id: str, dimensions: int
+) -> Optional[list[float]]:
+    """Return a cached vector for already-normalised `text`, or None on a miss."""
+    return _cache.get(embedding_cache_key(text, model_id, dimensions))
+
+
+def store_embedding(text: str, model_id: str, dimensions: int, vector: list[float]):
+    """Write a freshly generated vector through both cache tiers."""
+    _cache.set(
+        embedding_cache_key(text, model_id, dimensions),
+        vector,
+        model_id=model_id,
+        dimensions=dimensions,
+    )
+
+
+def embedding_cache_stats() -> dict:
+    """Hit/miss counters for both tiers."""
+    return _cache.stats()
+
+
+def clear_embedding_cache():
+    """Drop the in-process tier (the persistent tier is left intact)."""
+    _cache.clear_memory()
@@ -0,0 +1,182 @@
+"""
+Content-addressed store of certificate extraction results.
+
+The same ISO or GST certificate is often linked from many vendor rows, and
+re-uploading a catalogue replaces every VendorDocument.  Extraction results
+are therefore kept per document *content*: the `document_extractions` table
+maps the SHA-256 of the document bytes to Nova's summary, with an in-process
+LRU in front (app.core.cache.TwoTierCache).  `extract_once` returns the stored summary when there is one and
+otherwise runs the extraction once, even if several pipeline workers ask for
+the same bytes at the same time.
+
+`document_sources` remembers, per URL, the content hash last downloaded from
+it and the response's ETag / Last-Modified.  documents.download_stage uses it
+as a cheap pre-check: when a HEAD request still reports the same validators,
+the stored summary is reused without downloading the file.
+
+A row written by another model or extraction version is treated as missing.
+Store errors are logged and treated as misses.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.domain import DocumentExtraction, DocumentSource
+
+
+class _ExtractionStore(TwoTierCache):
+    """Keyed by (digest, model_id, version); the table holds one row per digest."""
+
+    def store_key(self, key: tuple[str, str, str]) -> str:
+        return key[0]
+
+    def accepts(self, row: DocumentExtraction, key: tuple[str, str, str]) -> bool:
+        _, model_id, version = key
+        return row.model_id == model_id and row.extraction_version == version
+
+    def to_columns(self, summary: dict) -> dict:
+        return {"summary": summary}
+
+    def from_row(self, row: DocumentExtraction) -> dict:
+        return row.summary
+
+    def copy(self, summary: dict) -> dict:
+        return dict(summary)
+
+
+_cache = _ExtractionStore(
+    "Extraction store",
+    DocumentExtraction,
+    memory_entries=settings.EXTRACTION_STORE_MEMORY_ENTRIES,
+    enabled=lambda: settings.EXTRACTION_STORE_ENABLED,
+    persist=lambda: True,
+    key_column="content_sha256",
+    extra_counters=("shared_inflight", "url_precheck_hits"),
+)
+
+# Extractions in progress, so concurrent requests for one document share a call
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def content_digest(doc_bytes: bytes) -> str:
+    return hashlib.sha256(doc_bytes).hexdigest()
+
+
+async def stored_extraction(digest: str, model_id: str, version: str) -> Optional[dict]:
+    """The stored summary for content `digest`, or None."""
+    return await _cache.aget((digest, model_id, version))
+
+
+async def extract_once(
+    digest: str,
+    model_id: str,
+    version: str,
+    compute: Callable[[], Awaitable[dict]],
+) -> dict:
+    """
+    Return the stored summary for content `digest`, or `await compute()` and
+    store it.  Concurrent calls for the same digest share one `compute`.
+    """
+    if not settings.EXTRACTION_STORE_ENABLED:
+        return await compute()
+
+    summary = await stored_extraction(digest, model_id, version)
+    if summary is not None:
+        return summary
+
+    key = f"{version}\x1f{model_id}\x1f{digest}"
+    pending = _inflight.get(key)
+    if pending is not None:
+        _cache.bump("shared_inflight")
+        return dict(await asyncio.shield(pending))
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        summary = await compute()
+        # Stored before the in-flight entry goes away, so a caller arriving in
+        # between always finds one or the other
+        await _cache.aset(
+            (digest, model_id, version),
+            summary,
+            model_id=model_id,
+            extraction_version=version,
+        )
+        future.set_result(summary)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters receive the error; don't warn about an unretrieved one
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+    return dict(summary)
+
+
+# ---------------------------------------------------------------------------
+# URL validators
+# ---------------------------------------------------------------------------
+
+
+def _load_source(url: str) -> Optional[tuple[Optional[str], Optional[str], str]]:
+    db = SessionLocal()
+    try:
+        row = db.get(DocumentSource, url)
+        if row is None:
+            return None
+        return row.etag, row.last_modified, row.content_sha256
+    except Exception as e:
+        _cache.bump("store_errors")
+        print(f"⚠ Extraction store lookup failed: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def record_source(
+    url: str, etag: Optional[str], last_modified: Optional[str], digest: str
+):
+    """Remember which content `url` served, with its ETag / Last-Modified."""
+    if not settings.EXTRACTION_STORE_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        db.merge(
+            DocumentSource(
+                url=url,
+                etag=etag,
+                last_modified=last_modified,
+                content_sha256=digest,
+                checked_at=datetime.utcnow(),
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _cache.bump("store_errors")
+        print(f"⚠ Extraction store write failed: {e}")
+    finally:
+        db.close()
+
+
+async def known_source(url: str) -> Optional[tuple[Optional[str], Optional[str], str]]:
+    """(etag, last_modified, content digest) last recorded for `url`, if any."""
+    if not (settings.EXTRACTION_STORE_ENABLED and settings.EXTRACTION_URL_PRECHECK):
+        return None
+    return await asyncio.to_thread(_load_source, url)
+
+
+def note_precheck_hit():
+    _cache.bump("url_precheck_hits")
+
+
+def extraction_store_stats() -> dict:
+    return _cache.stats()
@@ -0,0 +1,106 @@
+"""
+Rank fusion for multi-retriever vendor search.
+
+Generalises Reciprocal Rank Fusion (Cormack et al., 2009) to any number of
+ranked lists with per-list weights:
+
+    score(doc) = Σ_lists  w_list / (k + rank_in_list)
+
+With `score_aware=True` each contribution is additionally scaled by the
+document's min-max normalised raw score within its list (mapped to [0.5, 1]),
+so a large score gap between neighbours is not flattened entirely by ranks.
+
+Everything runs over NumPy arrays of ids, ranks and scores, so adding a
+retriever (certificate match, geo, …) adds one array concatenation rather than
+another pass of Python dict bookkeeping.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class RankedList:
+    """One retriever's output: ids in rank order with their raw scores."""
+
+    name: str
+    ids: np.ndarray
+    scores: np.ndarray
+    weight: float = 1.0
+
+    @classmethod
+    def from_hits(cls, name: str, hits: dict[str, dict], weight: float = 1.0):
+        """Build from a {vendor_id: {"score": ...}} hit map, ranking by score."""
+        ids = np.fromiter(hits.keys(), dtype=object, count=len(hits))
+        scores = np.fromiter(
+            (h["score"] or 0.0 for h in hits.values()), dtype=np.float64, count=len(hits)
+        )
+        order = np.argsort(-scores, kind="stable")
+        return cls(name=name, ids=ids[order], scores=scores[order], weight=weight)
+
+
+@dataclass
+class FusionResult:
+    """Fused ranking plus each list's raw score aligned to it (NaN if absent)."""
+
+    ids: np.ndarray
+    scores: np.ndarray
+    list_scores: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def raw_score(self, name: str, i: int) -> float:
+        """Raw score of the i-th fused document in list `name` (0.0 if absent)."""
+        scores = self.list_scores.get(name)
+        if scores is None or np.isnan(scores[i]):
+            return 0.0
+        return float(scores[i])
+
+    def in_list(self, name: str, i: int) -> bool:
+        scores = self.list_scores.get(name)
+        return scores is not None and not np.isnan(scores[i])
+
+
+def fuse_ranked_lists(
+    lists: list[RankedList], k: int = 60, score_aware: bool = False
+) -> FusionResult:
+    """Weighted (optionally score-aware) RRF over any number of ranked lists."""
+    lists = [lst for lst in lists if len(lst.ids)]
+    if not lists:
+        empty = np.empty(0, dtype=object)
+        return FusionResult(ids=empty, scores=np.empty(0))
+
+    all_ids = np.concatenate([lst.ids for lst in lists]).astype(str)
+    uniq, inverse = np.unique(all_ids, return_inverse=True)
+
+    contributions = []
+    for lst in lists:
+        ranks = np.arange(1, len(lst.ids) + 1, dtype=np.float64)
+        contrib = lst.weight / (k + ranks)
+        if score_aware:
+            lo, hi = lst.scores.min(), lst.scores.max()
+            norm = (lst.scores - lo) / (hi - lo) if hi > lo else np.ones_like(ranks)
+            contrib = contrib * (0.5 + 0.5 * norm)
+        contributions.append(contrib)
+
+    fused = np.bincount(
+        inverse, weights=np.concatenate(contributions), minlength=len(uniq)
+    )
+    order = np.argsort(-fused, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+
+    list_scores: dict[str, np.ndarray] = {}
+    offset = 0
+    for lst in lists:
+        n = len(lst.ids)
+        aligned = np.full(len(uniq), np.nan)
+        aligned[position[inverse[offset : offset + n]]] = lst.scores
+        list_scores[lst.name] = aligned
+        offset += n
+
+    return FusionResult(
+        ids=uniq[order].astype(object), scores=fused[order], list_scores=list_scores
+    )
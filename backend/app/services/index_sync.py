@@ -0,0 +1,299 @@
+"""
+Shared vendor-index change log.
+
+Every write to the vendor OpenSearch index appends to `vendor_index_changes`:
+one row per written vendor, or a row without vendor_id when the whole index
+was rebuilt.  API processes and job workers (worker.py) all write to it, and
+every API process follows it:
+
+- `sync_vendor_index` reads the changes made by other processes since the
+  last one it applied and refreshes the local copies of the index: changed
+  vendors are re-read into the in-process mirror and their vocabulary is
+  folded into the query-parser gazetteer and the /suggest index; a full
+  rebuild (or a backlog too long to replay) reloads all three.
+- The last applied sequence number is the vendor index version behind the
+  search result cache, so cached results are invalidated only once the
+  mirror they may be computed from has caught up.
+
+The log is read at most once per SEARCH_INDEX_VERSION_TTL_SECONDS per
+process, by a lifespan task or by `cached_search` itself, whichever comes
+first; with nothing new that is one primary-key range query.  Rows are inserted under a
+transaction-level advisory lock, so sequence numbers become visible in
+commit order and a reader that has seen `seq` N has seen every change up to
+N.  Rows older than a day are pruned periodically; the newest row is always
+kept so the version never goes back.  Log errors are printed and leave the
+local state unchanged until the next attempt.
+"""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select, text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.domain import Vendor, VendorIndexChange
+
+# Identifies this process in the log, so it can skip its own changes
+ORIGIN = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# pg_advisory_xact_lock key serialising writers ("vidx" in ASCII)
+_LOCK_KEY = 0x76696478
+
+_RETENTION = timedelta(days=1)
+_PRUNE_EVERY = 500
+
+# Changes replayed one by one per sync; a longer backlog triggers a full reload
+_REPLAY_LIMIT = 1000
+
+_lock = threading.Lock()
+_writes = 0
+
+# Follower state (event-loop side)
+_applied_seq: Optional[int] = None
+_checked_at: Optional[float] = None  # last attempt, for the TTL
+_synced_at: Optional[float] = None  # last successful sync
+_sync_lock = asyncio.Lock()
+_follower: Optional[asyncio.Task] = None
+
+
+def record_vendor_index_change(
+    vendor_ids: Optional[Iterable[str]] = None,
+) -> Optional[int]:
+    """
+    Append a change for `vendor_ids` (None = the whole index) and return its
+    sequence number, or None when the log could not be written.
+    """
+    global _writes
+    ids = [None] if vendor_ids is None else list(dict.fromkeys(vendor_ids))
+    if not ids:
+        return None
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        now = datetime.utcnow()
+        rows = [
+            VendorIndexChange(vendor_id=vendor_id, origin=ORIGIN, created_at=now)
+            for vendor_id in ids
+        ]
+        db.add_all(rows)
+        db.flush()
+        seq = max(row.seq for row in rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠ Vendor index change log write failed: {e}")
+        return None
+    finally:
+        db.close()
+
+    with _lock:
+        _writes += 1
+        prune = _writes % _PRUNE_EVERY == 0
+    if prune:
+        _prune_changes()
+    return seq
+
+
+def _prune_changes():
+    db = SessionLocal()
+    try:
+        newest = db.scalar(select(func.max(VendorIndexChange.seq)))
+        result = db.execute(
+            delete(VendorIndexChange).where(
+                VendorIndexChange.created_at < datetime.utcnow() - _RETENTION,
+                VendorIndexChange.seq < newest,
+            )
+        )
+        db.commit()
+        if result.rowcount:
+            print(f"✓ Pruned {result.rowcount} vendor index change rows")
+    except Exception as e:
+        db.rollback()
+        print(f"⚠ Vendor index change log prune failed: {e}")
+    finally:
+        db.close()
+
+
+def read_latest_seq() -> int:
+    """The newest sequence number in the log (0 when it is empty)."""
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.max(VendorIndexChange.seq))) or 0
+    finally:
+        db.close()
+
+
+def _changes_since(seq: int) -> list[tuple[int, Optional[str], str]]:
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                VendorIndexChange.seq,
+                VendorIndexChange.vendor_id,
+                VendorIndexChange.origin,
+            )
+            .where(VendorIndexChange.seq > seq)
+            .order_by(VendorIndexChange.seq)
+            .limit(_REPLAY_LIMIT)
+        ).all()
+        return [tuple(row) for row in rows]
+    finally:
+        db.close()
+
+
+def applied_seq() -> int:
+    """The last change this process has applied, without a query."""
+    return _applied_seq or 0
+
+
+async def init_vendor_index_sync():
+    """
+    Start following from the current end of the log.  Called from the app
+    lifespan before the mirror and vocabulary indexes are loaded, so changes
+    committed during the load are replayed rather than lost.
+    """
+    global _applied_seq, _checked_at, _synced_at
+    try:
+        _applied_seq = await asyncio.to_thread(read_latest_seq)
+        _checked_at = _synced_at = time.monotonic()
+    except Exception as e:
+        print(f"⚠ Could not read the vendor index change log: {e}")
+
+
+async def _reload_all():
+    """Reload the mirror and rebuild the vocabulary indexes from scratch."""
+    from app.core.opensearch import get_opensearch_client
+    from app.services import query_parser, suggest
+    from app.services.documents import VENDOR_INDEX_NAME
+    from app.services.vendor_mirror import mirror_enabled, vendor_mirror
+
+    if mirror_enabled():
+        await vendor_mirror.load_from_opensearch(
+            get_opensearch_client(), VENDOR_INDEX_NAME
+        )
+    await asyncio.to_thread(query_parser.build_gazetteer)
+    await asyncio.to_thread(suggest.build_suggest_index)
+
+
+async def _apply_vendors(vendor_ids: list[str]):
+    """Re-read changed vendors into the mirror and the vocabulary indexes."""
+    from app.core.opensearch import get_opensearch_client
+    from app.services.documents import VENDOR_INDEX_NAME
+    from app.services.vendor_mirror import mirror_enabled, vendor_mirror
+
+    if mirror_enabled() and vendor_mirror.ready:
+        response = await get_opensearch_client().mget(
+            index=VENDOR_INDEX_NAME, body={"ids": vendor_ids}
+        )
+        for doc in response.get("docs", []):
+            if doc.get("found"):
+                source = doc["_source"]
+                vendor_mirror.upsert(
+                    source.get("vendor_id") or doc["_id"],
+                    source,
+                    source.get("embedding"),
+                )
+            else:
+                vendor_mirror.remove(doc["_id"])
+    await asyncio.to_thread(_register_vocabulary, vendor_ids)
+
+
+def _register_vocabulary(vendor_ids: list[str]):
+    from app.services.vendors import register_vendor_vocabulary
+
+    db = SessionLocal()
+    try:
+        for vendor in db.query(Vendor).filter(Vendor.id.in_(vendor_ids)):
+            register_vendor_vocabulary(vendor)
+    finally:
+        db.close()
+
+
+async def sync_vendor_index(force: bool = False) -> int:
+    """
+    Apply other processes' index changes (see module docstring) and return
+    the last applied sequence number.  Without `force`, the log is read at
+    most once per SEARCH_INDEX_VERSION_TTL_SECONDS and a sync already in
+    progress is not waited for.
+    """
+    global _applied_seq, _checked_at, _synced_at
+    if not force:
+        checked_at = _checked_at
+        if _sync_lock.locked() or (
+            checked_at is not None
+            and time.monotonic() - checked_at < settings.SEARCH_INDEX_VERSION_TTL_SECONDS
+        ):
+            return applied_seq()
+
+    async with _sync_lock:
+        _checked_at = time.monotonic()
+        try:
+            if _applied_seq is None:
+                # Nothing loaded from the index yet; start at the end of the log
+                _applied_seq = await asyncio.to_thread(read_latest_seq)
+                _synced_at = time.monotonic()
+                return _applied_seq
+
+            # Changes older than the retention may already be pruned
+            overdue = (
+                _synced_at is None
+                or time.monotonic() - _synced_at > _RETENTION.total_seconds() / 2
+            )
+            changes = await asyncio.to_thread(_changes_since, _applied_seq)
+            foreign = [change for change in changes if change[2] != ORIGIN]
+            if foreign and (
+                overdue
+                or len(changes) >= _REPLAY_LIMIT
+                or any(vendor_id is None for _, vendor_id, _ in foreign)
+            ):
+                # Read first: changes committed during the reload are replayed later
+                newest = await asyncio.to_thread(read_latest_seq)
+                await _reload_all()
+                print(f"[index-sync] reloaded vendor index state at change {newest}")
+            else:
+                newest = changes[-1][0] if changes else _applied_seq
+                vendor_ids = list(dict.fromkeys(vendor_id for _, vendor_id, _ in foreign))
+                if vendor_ids:
+                    await _apply_vendors(vendor_ids)
+            _applied_seq = max(_applied_seq, newest)
+            _synced_at = time.monotonic()
+        except Exception as e:
+            print(f"⚠ Vendor index sync failed: {e}")
+        return _applied_seq
+
+
+async def _follow():
+    while True:
+        # Not forced: a sync run by cached_search in the meantime counts, so
+        # each process reads the log at most once per interval
+        await sync_vendor_index()
+        interval = settings.SEARCH_INDEX_VERSION_TTL_SECONDS
+        due = (_checked_at or time.monotonic()) + interval
+        await asyncio.sleep(max(due - time.monotonic(), interval / 10))
+
+
+def start_index_sync():
+    """Follow the change log in the background (called from the app lifespan)."""
+    global _follower
+    if _follower is None:
+        _follower = asyncio.create_task(_follow())
+
+
+async def stop_index_sync():
+    global _follower
+    task, _follower = _follower, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
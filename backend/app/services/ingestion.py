@@ -0,0 +1,150 @@
+"""
+Staged, bounded-concurrency ingestion pipeline.
+
+Document ingestion is a chain of mostly-waiting steps: download (network),
+extract (Nova), embed (Titan), index (OpenSearch).  Running them one document
+at a time leaves every service idle while another works.  `run_pipeline`
+instead gives each stage its own pool of worker tasks and a bounded queue to
+the next stage:
+
+    items → [download ×N] → q → [extract ×N] → q → [embed ×N] → q → [index ×N] → sink
+
+so all stages are busy at once and throughput is set by the slowest stage's
+configured concurrency rather than the sum of stage latencies.  A full queue
+blocks the stage feeding it (backpressure), so a fast downloader cannot pile
+up hundreds of PDFs in memory ahead of extraction.
+
+Failures are isolated per item: an exception in a stage marks that item
+failed (`error`, `failed_stage`) and sends it straight to the sink; other
+items keep flowing.  The sink runs in the caller's task, one item at a time in
+completion order, so it is the place for database writes on a shared Session.
+Stage functions should work on `item.state` only.  Resources a stage leaves in
+`item.state` (open files) are handed to the optional `release` callback once
+the item is done with, including items dropped when the pipeline is cancelled.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence, Union
+
+from app.core.config import settings
+
+
+@dataclass
+class IngestItem:
+    """One unit of work flowing through the pipeline."""
+
+    key: Any
+    state: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[IngestItem], Awaitable[None]]
+    concurrency: int = 1
+
+
+_DONE = object()
+
+
+def stage_concurrency(name: str) -> int:
+    """Configured worker count for a standard stage (download/extract/embed/index)."""
+    return max(
+        1,
+        {
+            "download": settings.INGEST_DOWNLOAD_CONCURRENCY,
+            "extract": settings.INGEST_EXTRACT_CONCURRENCY,
+            "embed": settings.INGEST_EMBED_CONCURRENCY,
+            "index": settings.INGEST_INDEX_CONCURRENCY,
+        }.get(name, 1),
+    )
+
+
+async def run_pipeline(
+    items: Iterable[IngestItem],
+    stages: Sequence[Stage],
+    sink: Callable[[IngestItem], Union[None, Awaitable[None]]],
+    queue_size: Optional[int] = None,
+    release: Optional[Callable[[IngestItem], None]] = None,
+) -> dict:
+    """
+    Push `items` through `stages` and hand each finished item to `sink`, then
+    to `release` (which must tolerate being called again for the same item).
+
+    Returns {"total", "succeeded", "failed"}.  An exception raised by `sink`
+    itself cancels the pipeline and propagates.
+    """
+    size = queue_size or settings.INGEST_QUEUE_SIZE
+    queues = [asyncio.Queue(maxsize=size) for _ in range(len(stages) + 1)]
+    out = queues[-1]
+
+    fed: list[IngestItem] = []
+
+    async def feed():
+        for item in items:
+            fed.append(item)
+            await queues[0].put(item)
+        for _ in range(stages[0].concurrency if stages else 1):
+            await queues[0].put(_DONE)
+
+    async def work(index: int, stage: Stage, remaining: list[int]):
+        inbox, outbox = queues[index], queues[index + 1]
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            if item.error is None:
+                try:
+                    await stage.fn(item)
+                except Exception as e:
+                    item.error = f"{type(e).__name__}: {e}"
+                    item.failed_stage = stage.name
+            await outbox.put(item)
+        # The last worker of a stage to finish closes the next stage's queue
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            followers = (
+                stages[index + 1].concurrency if index + 1 < len(stages) else 1
+            )
+            for _ in range(followers):
+                await outbox.put(_DONE)
+
+    tasks = [asyncio.ensure_future(feed())]
+    if stages:
+        for index, stage in enumerate(stages):
+            remaining = [stage.concurrency]
+            tasks.extend(
+                asyncio.ensure_future(work(index, stage, remaining))
+                for _ in range(stage.concurrency)
+            )
+    else:
+        out = queues[0]
+
+    stats = {"total": 0, "succeeded": 0, "failed": 0}
+    try:
+        while True:
+            item = await out.get()
+            if item is _DONE:
+                break
+            stats["total"] += 1
+            stats["failed" if item.error else "succeeded"] += 1
+            try:
+                result = sink(item)
+                if asyncio.iscoroutine(result):
+                    await result
+            finally:
+                if release is not None:
+                    release(item)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Items still in flight when the pipeline stopped early
+        if release is not None:
+            for item in fed:
+                release(item)
+    return stats
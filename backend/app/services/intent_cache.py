@@ -0,0 +1,76 @@
+"""
+Memoised query-intent decomposition.
+
+`decompose_query` and `decompose_rfp_to_intent` each spend an LLM call turning
+input into a `QueryIntent`.  Results are cached here by normalised query text
+(or a hash of the RFP payload), the model ID and the caller's prompt version,
+with a TTL: an in-process LRU answers hot repeats in microseconds and the
+`query_intent_cache` table keeps entries across restarts and workers.  Bump a
+prompt version whenever the prompt or the intent fields change.
+
+Intents are stored as plain dicts; callers rebuild the pydantic model so this
+module stays free of the search-service imports.
+"""
+
+import copy
+import hashlib
+import json
+import re
+from typing import Optional
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.models.domain import QueryIntentCacheEntry
+
+
+class _IntentCache(TwoTierCache):
+    def to_columns(self, intent: dict) -> dict:
+        return {"intent": intent}
+
+    def from_row(self, row: QueryIntentCacheEntry) -> dict:
+        return row.intent
+
+    def copy(self, intent: dict) -> dict:
+        return copy.deepcopy(intent)
+
+
+_cache = _IntentCache(
+    "Intent cache",
+    QueryIntentCacheEntry,
+    memory_entries=settings.INTENT_CACHE_MEMORY_ENTRIES,
+    enabled=lambda: settings.INTENT_CACHE_ENABLED,
+    persist=lambda: settings.INTENT_CACHE_PERSIST,
+    ttl_seconds=settings.INTENT_CACHE_TTL_SECONDS,
+    prune_every=200,
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, collapse whitespace and trim edge punctuation."""
+    text = re.sub(r"\s+", " ", (query or "").lower()).strip()
+    return text.strip(" .,;:!?\"'")
+
+
+def query_intent_key(query: str, model_id: str, version: str) -> str:
+    payload = f"query\x1f{version}\x1f{model_id}\x1f{normalize_query(query)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def rfp_intent_key(rfp_data: dict, model_id: str, version: str) -> str:
+    canonical = json.dumps(rfp_data, sort_keys=True, default=str, ensure_ascii=False)
+    payload = f"rfp\x1f{version}\x1f{model_id}\x1f{canonical}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_cached_intent(key: str) -> Optional[dict]:
+    """Return the cached intent dict for `key`, or None on a miss."""
+    return await _cache.aget(key)
+
+
+async def store_intent(key: str, kind: str, intent: dict):
+    """Cache a freshly extracted intent in both tiers."""
+    await _cache.aset(key, intent, kind=kind)
+
+
+def intent_cache_stats() -> dict:
+    return _cache.stats()
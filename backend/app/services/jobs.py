@@ -0,0 +1,339 @@
+"""
+Postgres-backed background job queue.
+
+Jobs are rows in the `jobs` table.  Workers claim the oldest claimable job
+with SELECT … FOR UPDATE SKIP LOCKED, so any number of workers on any number
+of nodes can poll the same table without a job being handed out twice.
+
+A claimed job is leased to its worker.  Handlers call `JobContext.checkpoint`
+as they go: it records progress, renews the heartbeat and commits the
+handler's pending work in the same transaction, so progress never runs ahead
+of (or behind) what is actually stored.  A job whose heartbeat goes stale —
+its worker crashed or was stopped — is claimed again and the handler resumes
+from the last checkpoint; after JOBS_MAX_ATTEMPTS claims it is marked failed.
+An exception raised by a handler fails the job straight away.
+
+Handlers are registered per job kind with `@job_handler(kind)`, receive
+(db, ctx) and return the job result.  `run_worker` is the polling loop, run
+by the standalone `worker.py` entry point (and, for development only, inside
+the API process with JOBS_WORKER_IN_APP).
+"""
+
+import asyncio
+import os
+import socket
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.domain import Job
+
+_ACTIVE = ("queued", "running")
+
+_handlers: dict[str, Callable[[Session, "JobContext"], Awaitable[dict]]] = {}
+
+# Lets enqueue_job wake a worker running in this process without waiting for
+# the next poll
+_wakeup: Optional[asyncio.Event] = None
+_wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+_app_worker: Optional[asyncio.Task] = None
+
+
+class JobLeaseLost(Exception):
+    """The job was reclaimed by another worker after our heartbeat went stale."""
+
+
+def job_handler(kind: str):
+    """Register the coroutine that runs jobs of `kind`."""
+
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Queue operations
+# ---------------------------------------------------------------------------
+
+
+def enqueue_job(
+    db: Session, kind: str, payload: Optional[dict] = None, data: Optional[bytes] = None
+) -> Job:
+    """Insert a queued job and commit; returns the new row."""
+    job = Job(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        status="queued",
+        payload=payload,
+        data=data,
+        attempts=0,
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    if _wakeup is not None and _wakeup_loop is not None:
+        _wakeup_loop.call_soon_threadsafe(_wakeup.set)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[Job]:
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def find_active_job(db: Session, kind: str) -> Optional[Job]:
+    """The oldest queued or running job of `kind`, if any."""
+    return (
+        db.query(Job)
+        .filter(Job.kind == kind, Job.status.in_(_ACTIVE))
+        .order_by(Job.created_at)
+        .first()
+    )
+
+
+def list_jobs(db: Session, kind: Optional[str] = None, limit: int = 50) -> list[Job]:
+    query = db.query(Job)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    return query.order_by(Job.created_at.desc()).limit(limit).all()
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[Job]:
+    """Lease the oldest queued (or stale running) job to `worker_id`."""
+    while True:
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.JOBS_STALE_AFTER_SECONDS)
+        job = (
+            db.query(Job)
+            .filter(
+                or_(
+                    Job.status == "queued",
+                    and_(Job.status == "running", Job.heartbeat_at < stale_before),
+                )
+            )
+            .order_by(Job.created_at)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+
+        if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+            job.status = "failed"
+            job.error = job.error or f"Abandoned after {job.attempts} attempt(s)"
+            job.finished_at = now
+            db.commit()
+            continue
+
+        job.status = "running"
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.heartbeat_at = now
+        job.started_at = job.started_at or now
+        db.commit()
+        return job
+
+
+def _touch(job_id: str, worker_id: str) -> bool:
+    """Renew the heartbeat from a separate session; False once the lease is gone."""
+    db = SessionLocal()
+    try:
+        updated = (
+            db.query(Job)
+            .filter(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        return bool(updated)
+    except Exception as e:
+        db.rollback()
+        print(f"⚠ Job heartbeat failed for {job_id}: {e}")
+        return True
+    finally:
+        db.close()
+
+
+def _finish(
+    db: Session,
+    job_id: str,
+    worker_id: str,
+    status: str,
+    result: Optional[dict] = None,
+    error: Optional[str] = None,
+):
+    # Drop whatever a failed handler left uncommitted
+    db.rollback()
+    db.query(Job).filter(Job.id == job_id, Job.worker_id == worker_id).update(
+        {
+            "status": status,
+            "result": result,
+            "error": error,
+            "finished_at": datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+class JobContext:
+    """What a handler sees of its job: inputs, last checkpoint, checkpointing."""
+
+    def __init__(self, db: Session, job: Job, worker_id: str):
+        self._db = db
+        self.job_id = job.id
+        self.worker_id = worker_id
+        self.payload: dict = job.payload or {}
+        self.data: Optional[bytes] = job.data
+        self.progress: Optional[dict] = job.progress
+        self.attempt: int = job.attempts
+
+    def checkpoint(self, progress: dict):
+        """Commit the handler's pending work together with `progress`."""
+        updated = (
+            self._db.query(Job)
+            .filter(Job.id == self.job_id, Job.worker_id == self.worker_id)
+            .update(
+                {"progress": progress, "heartbeat_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            self._db.rollback()
+            raise JobLeaseLost(self.job_id)
+        self._db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+async def _keep_alive(job_id: str, worker_id: str):
+    interval = max(5.0, settings.JOBS_STALE_AFTER_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        if not await asyncio.to_thread(_touch, job_id, worker_id):
+            return
+
+
+async def run_next_job(worker_id: str) -> bool:
+    """Claim and run one job; False when the queue had nothing claimable."""
+    db = SessionLocal()
+    try:
+        job = await asyncio.to_thread(claim_job, db, worker_id)
+        if job is None:
+            return False
+
+        job_id, kind = job.id, job.kind
+        print(f"[jobs] {kind} {job_id}: attempt {job.attempts} on {worker_id}")
+        heartbeat = asyncio.create_task(_keep_alive(job_id, worker_id))
+        try:
+            handler = _handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{kind}'")
+            result = await handler(db, JobContext(db, job, worker_id))
+        except JobLeaseLost:
+            print(f"⚠ Job {job_id} was reclaimed by another worker; stopping")
+        except Exception as e:
+            traceback.print_exc()
+            await asyncio.to_thread(
+                _finish, db, job_id, worker_id, "failed", error=f"{type(e).__name__}: {e}"
+            )
+            print(f"  ✗ Job {kind} {job_id} failed: {e}")
+        else:
+            await asyncio.to_thread(
+                _finish, db, job_id, worker_id, "completed", result=result
+            )
+            print(f"  ✓ Job {kind} {job_id} completed")
+        finally:
+            heartbeat.cancel()
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"⚠ Job worker error: {e}")
+        return False
+    finally:
+        db.close()
+
+
+async def run_worker(worker_id: Optional[str] = None, once: bool = False):
+    """Poll for jobs until cancelled (or, with `once`, until the queue is empty)."""
+    global _wakeup, _wakeup_loop
+    worker_id = worker_id or _worker_id()
+    _wakeup = asyncio.Event()
+    _wakeup_loop = asyncio.get_running_loop()
+    print(f"✓ Job worker {worker_id} started")
+    try:
+        while True:
+            if await run_next_job(worker_id):
+                continue
+            if once:
+                return
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    _wakeup.wait(), timeout=settings.JOBS_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _wakeup = None
+        _wakeup_loop = None
+
+
+def start_app_worker():
+    """
+    Run a worker loop inside the API process when JOBS_WORKER_IN_APP is set
+    (called from the app lifespan).
+    """
+    global _app_worker
+    if settings.JOBS_WORKER_IN_APP and _app_worker is None:
+        _app_worker = asyncio.create_task(run_worker())
+
+
+async def stop_app_worker():
+    """Cancel the in-process worker; an interrupted job resumes once its lease goes stale."""
+    global _app_worker
+    task, _app_worker = _app_worker, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+
+@job_handler("vendor_bulk_upload")
+async def _vendor_bulk_upload(db: Session, ctx: JobContext) -> dict:
+    from app.services.vendors import bulk_create_vendors
+
+    return await bulk_create_vendors(
+        db, ctx.data, progress=ctx.progress, on_progress=ctx.checkpoint
+    )
+
+
+@job_handler("process_pending_documents")
+async def _process_pending_documents(db: Session, ctx: JobContext) -> dict:
+    from app.services.documents import process_pending_documents
+
+    return await process_pending_documents(
+        db, progress=ctx.progress, on_progress=ctx.checkpoint
+    )
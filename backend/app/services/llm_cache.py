@@ -0,0 +1,111 @@
+"""
+Content-addressed cache for deterministic LLM calls.
+
+Call sites opt in by wrapping their model call in `cached_llm_call`.  Entries
+are keyed by a SHA-256 of the call site name, its prompt version, the model ID
+and the call's inputs; bytes anywhere in the inputs (attachments, documents)
+are folded in by their own SHA-256, so identical files hit regardless of where
+they came from.  Bump a site's version whenever its prompt or response parsing
+changes.
+
+Two tiers (app.core.cache.TwoTierCache), as with the embedding and intent
+caches: an in-process LRU and the `llm_response_cache` table (zlib-compressed
+JSON, TTL plus least-recently-used pruning).  Only successful results are
+stored; an exception (or None) from the wrapped call is passed through and
+nothing is cached.  Store errors are logged and treated as misses.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Awaitable, Callable
+
+from app.core.cache import TwoTierCache
+from app.core.config import settings
+from app.models.domain import LLMResponseCacheEntry
+
+
+class _LLMCache(TwoTierCache):
+    """Responses held packed, so every hit unpacks its own copy."""
+
+    def to_columns(self, blob: bytes) -> dict:
+        return {"response": blob}
+
+    def from_row(self, row: LLMResponseCacheEntry) -> bytes:
+        return row.response
+
+
+_cache = _LLMCache(
+    "LLM cache",
+    LLMResponseCacheEntry,
+    memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+    enabled=lambda: settings.LLM_CACHE_ENABLED,
+    persist=lambda: settings.LLM_CACHE_PERSIST,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    max_rows=settings.LLM_CACHE_STORE_MAX_ROWS,
+    prune_every=200,
+)
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready form of `value` with bytes replaced by their digest."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def llm_cache_key(site: str, version: str, model_id: str, inputs: Any) -> str:
+    canonical = json.dumps(
+        _canonical(inputs), sort_keys=True, default=str, ensure_ascii=False
+    )
+    payload = f"{site}\x1f{version}\x1f{model_id}\x1f{canonical}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+async def cached_llm_call(
+    site: str,
+    version: str,
+    model_id: str,
+    inputs: Any,
+    compute: Callable[[], Awaitable[Any]],
+    refresh: bool = False,
+) -> Any:
+    """
+    Return the cached result for these inputs, or `await compute()` and cache it.
+
+    `inputs` must capture everything the response depends on (rendered prompt,
+    attachments, parameters); `compute` must return JSON-serialisable data.
+    `refresh=True` skips the lookup and overwrites the entry.
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return await compute()
+
+    key = llm_cache_key(site, version, model_id, inputs)
+    if refresh:
+        _cache.bump("misses")
+    else:
+        blob = await _cache.aget(key)
+        if blob is not None:
+            return _unpack(blob)
+
+    result = await compute()
+    if result is None:
+        return result
+    await _cache.aset(key, _pack(result), site=site, model_id=model_id)
+    return result
+
+
+def llm_cache_stats() -> dict:
+    return _cache.stats()
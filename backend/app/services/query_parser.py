@@ -0,0 +1,250 @@
+"""
+Deterministic fast-path query parser.
+
+Short procurement queries ("ISO 9001 steel pipes Pune") are mostly a bag of
+known products, certifications and places.  This module matches them against a
+gazetteer built from the vendor vocabulary (see app.services.vendor_vocabulary)
+with a token-level trie, leftmost-longest, so multi-word entries such as
+"tamil nadu" or "ms steel pipes" win over their single-word prefixes.
+
+`parse_query` returns the extracted fields plus a confidence score: the share
+of meaningful query tokens explained by gazetteer matches, discounted when no
+product was recognised.  `decompose_query` only calls the LLM when the score
+is below QUERY_PARSER_MIN_CONFIDENCE.
+
+Fields are returned as a plain dict; callers build the `QueryIntent` so this
+module stays free of the search-service imports.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from app.core.database import SessionLocal
+from app.services.vendor_vocabulary import (
+    CERTIFICATION,
+    LOCATION,
+    PRODUCT,
+    harvest_vendor_terms,
+    static_terms,
+)
+
+VENDOR_TYPE = "vendor_type"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# When a phrase is known under several kinds, the more specific one wins
+_KIND_PRIORITY = (CERTIFICATION, LOCATION, VENDOR_TYPE, PRODUCT)
+
+_VENDOR_TYPES = {
+    "manufacturer": "manufacturer",
+    "manufacturing": "manufacturer",
+    "maker": "manufacturer",
+    "producer": "manufacturer",
+    "trader": "trader",
+    "trading": "trader",
+    "distributor": "distributor",
+    "dealer": "distributor",
+    "wholesaler": "distributor",
+    "stockist": "distributor",
+    "service provider": "service_provider",
+    "contractor": "service_provider",
+}
+
+# Filler that carries no intent; ignored when scoring coverage
+_STOPWORDS = frozenset(
+    """
+    a an the and or of for in at on to from by with near around within
+    i we me my our need needs want looking find search show get list give
+    best top good reliable trusted verified certified approved registered
+    supplier vendor company firm business provider source sourcing
+    who which that can please any some all
+    """.split()
+)
+
+# Products dominate retrieval; a parse that found none is rarely complete
+_NO_PRODUCT_PENALTY = 0.5
+
+
+def _stem(token: str) -> str:
+    """Crude plural folding applied identically to gazetteer and query."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").lower())]
+
+
+@dataclass
+class _Node:
+    children: dict[str, "_Node"] = field(default_factory=dict)
+    # kind -> canonical display form
+    entries: Optional[dict[str, str]] = None
+
+
+@dataclass
+class ParsedQuery:
+    fields: dict
+    confidence: float
+    matched: list[tuple[str, str]]
+
+
+class Gazetteer:
+    """Token trie of known phrases; supports incremental inserts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._size = 0
+        self.ready = False
+        for phrase, vendor_type in _VENDOR_TYPES.items():
+            self.add(VENDOR_TYPE, phrase, vendor_type)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, kind: str, phrase: str, canonical: Optional[str] = None):
+        tokens = tokenize(phrase)
+        # A lone stopword or single character is never a useful entity
+        if not tokens:
+            return
+        if len(tokens) == 1 and (tokens[0] in _STOPWORDS or len(tokens[0]) < 2):
+            return
+        with self._lock:
+            node = self._root
+            for token in tokens:
+                node = node.children.setdefault(token, _Node())
+            if node.entries is None:
+                node.entries = {}
+            if kind not in node.entries:
+                node.entries[kind] = canonical or " ".join(phrase.split())
+                self._size += 1
+
+    def add_terms(self, terms: Iterable[tuple[str, str]]):
+        for kind, phrase in terms:
+            self.add(kind, phrase)
+
+    def match(self, tokens: list[str]) -> list[tuple[int, int, dict[str, str]]]:
+        """Leftmost-longest non-overlapping matches as (start, end, entries)."""
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            best = None
+            j = i
+            while j < len(tokens):
+                node = node.children.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if node.entries:
+                    best = (i, j, node.entries)
+            if best:
+                matches.append(best)
+                i = best[1]
+            else:
+                i += 1
+        return matches
+
+
+_gazetteer = Gazetteer()
+_build_lock = threading.Lock()
+
+
+def build_gazetteer() -> int:
+    """(Re)build the gazetteer from the vendors table and the static lists."""
+    fresh = Gazetteer()
+    db = SessionLocal()
+    try:
+        fresh.add_terms(harvest_vendor_terms(db))
+    except Exception as e:
+        print(f"⚠ Could not harvest vendor vocabulary, using static terms only: {e}")
+        fresh = Gazetteer()
+        fresh.add_terms(static_terms())
+    finally:
+        db.close()
+    fresh.ready = True
+
+    global _gazetteer
+    _gazetteer = fresh
+    return len(fresh)
+
+
+def get_gazetteer() -> Gazetteer:
+    if not _gazetteer.ready:
+        with _build_lock:
+            if not _gazetteer.ready:
+                build_gazetteer()
+    return _gazetteer
+
+
+def add_vendor_terms(terms: Iterable[tuple[str, str]]):
+    """Fold a new or updated vendor's vocabulary into the live gazetteer."""
+    if _gazetteer.ready:
+        _gazetteer.add_terms(terms)
+
+
+def warm_query_parser():
+    """Build the gazetteer at startup (called from the app lifespan)."""
+    try:
+        count = build_gazetteer()
+        print(f"✓ Query parser gazetteer ready ({count} phrases)")
+    except Exception as e:
+        print(f"⚠ Could not build query parser gazetteer: {e}")
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Extract intent fields from `query` using the gazetteer alone."""
+    raw_tokens = _TOKEN_RE.findall((query or "").lower())
+    tokens = [_stem(t) for t in raw_tokens]
+    matches = get_gazetteer().match(tokens)
+
+    products: list[str] = []
+    certifications: list[str] = []
+    locations: list[str] = []
+    vendor_type: Optional[str] = None
+    matched: list[tuple[str, str]] = []
+    covered: set[int] = set()
+
+    for start, end, entries in matches:
+        kind = next(k for k in _KIND_PRIORITY if k in entries)
+        value = entries[kind]
+        matched.append((kind, value))
+        covered.update(range(start, end))
+        if kind == PRODUCT and value not in products:
+            products.append(value)
+        elif kind == CERTIFICATION and value not in certifications:
+            certifications.append(value)
+        elif kind == LOCATION and value not in locations:
+            locations.append(value)
+        elif kind == VENDOR_TYPE and vendor_type is None:
+            vendor_type = value
+
+    content = [i for i, t in enumerate(tokens) if t not in _STOPWORDS]
+    if content:
+        confidence = sum(1 for i in content if i in covered) / len(content)
+    else:
+        confidence = 0.0
+    if not products:
+        confidence *= _NO_PRODUCT_PENALTY
+
+    keywords = [raw_tokens[i] for i in content][:8]
+    search_text = " ".join(
+        [*products, vendor_type or "", *locations, *certifications]
+    ).strip()
+
+    fields = {
+        "products": products,
+        # QueryIntent carries a single place; keep the first one mentioned
+        "location": locations[0] if locations else None,
+        "certifications": certifications,
+        "vendor_type": vendor_type,
+        "keywords": keywords,
+        "search_text": " ".join(search_text.split()) or (query or "")[:200],
+    }
+    return ParsedQuery(fields=fields, confidence=round(confidence, 4), matched=matched)
@@ -1,10 +1,12 @@
-import asyncio
 import json
 import re
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.services.rfp import get_bedrock_client, get_llm
+from app.core import llm as llm_gateway
+from app.services.llm_cache import cached_llm_call
+from app.services.rfp import get_llm
 from langchain_core.messages import SystemMessage, HumanMessage
 from app.schemas.domain import AIRecommendationsResponse
 from app.models.domain import Project, Quote, ProjectInvitedVendor
@@ -28,8 +30,6 @@ async def score_quotes(quotes: list) -> list:
     Use AWS Bedrock to review, normalize, and score quotes.
     Returns the quotes annotated with risk_score and reasoning.
     """
-    bedrock = get_bedrock_client()
-
     prompt = f"""
     You are an AI Procurement Analyst. Review the following vendor quotes and score them based on Price, SLA completeness, and Risk.
     
@@ -41,26 +41,16 @@ async def score_quotes(quotes: list) -> list:
     Do not output any markdown formatting, just the raw JSON array.
     """
 
-    body = json.dumps(
-        {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    )
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 1000,
+        "messages": [{"role": "user", "content": prompt}],
+    }
 
     try:
-
-        def _invoke():
-            r = bedrock.invoke_model(
-                modelId=settings.BEDROCK_MODEL_ID,
-                body=body,
-                contentType="application/json",
-                accept="application/json",
-            )
-            return json.loads(r.get("body").read())
-
-        response_body = await asyncio.to_thread(_invoke)
+        response_body = await llm_gateway.invoke_model_json(
+            settings.BEDROCK_MODEL_ID, body
+        )
         content = response_body.get("content", [])[0].get("text", "[]")
 
         return json.loads(content)
@@ -75,8 +65,6 @@ async def generate_negotiation_email(
     """
     Generate a negotiation email using Bedrock.
     """
-    bedrock = get_bedrock_client()
-
     prompt = f"""
     Write a professional and polite negotiation email to a vendor.
     
@@ -89,26 +77,16 @@ async def generate_negotiation_email(
     Output only the email body.
     """
 
-    body = json.dumps(
-        {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    )
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 1000,
+        "messages": [{"role": "user", "content": prompt}],
+    }
 
     try:
-
-        def _invoke():
-            r = bedrock.invoke_model(
-                modelId=settings.BEDROCK_MODEL_ID,
-                body=body,
-                contentType="application/json",
-                accept="application/json",
-            )
-            return json.loads(r.get("body").read())
-
-        response_body = await asyncio.to_thread(_invoke)
+        response_body = await llm_gateway.invoke_model_json(
+            settings.BEDROCK_MODEL_ID, body
+        )
         return response_body.get("content", [])[0].get("text", "")
     except Exception as e:
         print(f"Error generating email: {e}")
@@ -247,13 +225,25 @@ async def generate_ai_recommendations(
         flush=True,
     )
 
+    async def _recommend() -> Optional[dict]:
+        response = await llm_gateway.ainvoke(
+            structured_llm, messages, settings.BEDROCK_NOVA_MODEL_ID
+        )
+        return response.model_dump() if response is not None else None
+
     try:
-        response = await asyncio.to_thread(structured_llm.invoke, messages)
-        if response is None:
+        # Same prompt → same stored evaluation; force_refresh asks for a new one
+        res_dict = await cached_llm_call(
+            "ai_recommendations",
+            "1",
+            settings.BEDROCK_NOVA_MODEL_ID,
+            [system_prompt, human_content],
+            _recommend,
+            refresh=force_refresh,
+        )
+        if res_dict is None:
             return {"recommendations": []}
 
-        res_dict = response.model_dump()
-
         # Add thread_id mapping and metadata
         quote_by_email = {}
         for q in quotes:
@@ -370,7 +360,9 @@ RULES:
 - Return ONLY the JSON object, no markdown formatting."""
 
     try:
-        response = await asyncio.to_thread(llm.invoke, prompt)
+        response = await llm_gateway.ainvoke(
+            llm, prompt, settings.BEDROCK_NOVA_MODEL_ID
+        )
         content = response.content if hasattr(response, "content") else str(response)
 
         # Parse JSON from response
@@ -1,36 +1,25 @@
-import asyncio
-import boto3
 import re
 from datetime import datetime
 from io import BytesIO
-from langchain_aws import ChatBedrockConverse
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
+from app.core.aws import aws_client
 from app.core.config import settings
+from app.core.http import download_sync
+from app.core import llm as llm_gateway
 from app.schemas.rfp import RFPGenerateResponse, RFPChatResponse
 
 
 def get_bedrock_client():
-    return boto3.client(
-        service_name="bedrock-runtime",
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
+    return aws_client("bedrock-runtime")
 
 
 def get_llm(model_id: str):
     """
-    Returns a configured LangChain ChatBedrockConverse instance.
+    Returns the shared LangChain ChatBedrockConverse instance for `model_id`.
+    Invoke it through app.core.llm.ainvoke so the gateway limits apply.
     """
-    return ChatBedrockConverse(
-        model=model_id,
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        temperature=0.7,
-        max_tokens=1024,
-    )
+    return llm_gateway.chat_model(model_id, temperature=0.7, max_tokens=1024)
 
 
 async def generate_rfp_draft(
@@ -60,8 +49,8 @@ async def generate_rfp_draft(
     """
 
     try:
-        response: RFPGenerateResponse = await asyncio.to_thread(
-            structured_llm.invoke, prompt
+        response: RFPGenerateResponse = await llm_gateway.ainvoke(
+            structured_llm, prompt, settings.BEDROCK_MODEL_ID
         )
         return response.model_dump()
     except Exception as e:
@@ -147,8 +136,8 @@ async def chat_rfp_assistant(project_name: str, messages: list[dict]) -> dict:
     structured_llm = llm.with_structured_output(RFPChatResponse)
 
     try:
-        response: RFPChatResponse = await asyncio.to_thread(
-            structured_llm.invoke, lc_messages
+        response: RFPChatResponse = await llm_gateway.ainvoke(
+            structured_llm, lc_messages, settings.BEDROCK_NOVA_MODEL_ID
         )
         return response.model_dump()
 
@@ -199,14 +188,13 @@ def _logo_page_callback(logo_url: str):
     semi-transparent centred watermark on every page.
     Returns None if the image cannot be fetched.
     """
-    from urllib.request import urlopen
     from reportlab.lib.utils import ImageReader
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.units import cm
 
     try:
-        with urlopen(logo_url, timeout=5) as resp:
-            img_data = BytesIO(resp.read())
+        with download_sync(logo_url, timeout=5) as logo:
+            img_data = BytesIO(logo.read())
         img_reader = ImageReader(img_data)
     except Exception as exc:
         print(f"[RFP PDF] Could not fetch company logo ({logo_url}): {exc}")
@@ -637,12 +625,7 @@ def publish_rfp_to_s3(
     )
     s3_key = f"{project_id}.pdf"
 
-    s3 = boto3.client(
-        "s3",
-        region_name=region,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
+    s3 = aws_client("s3", region)
     s3.put_object(
         Bucket=bucket,
         Key=s3_key,
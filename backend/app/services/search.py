@@ -1,16 +1,38 @@
 import os
 import asyncio
+import time
+from dataclasses import dataclass, field
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from google import genai
+from app.core.budget import LatencyWindow, hedged
 from app.core.config import settings
+from app.core import llm as llm_gateway
+from app.core.opensearch import get_opensearch_client
+from app.core.timing import record, timed, timed_call
 from app.services.documents import (
+    cached_embedding,
+    encode_vector,
     generate_embedding,
-    _get_opensearch_client,
+    hybrid_pipeline_available,
+    knn_filters_available,
+    knn_score_to_similarity,
+    similarity_to_knn_score,
+    HYBRID_SEARCH_PIPELINE,
     VENDOR_INDEX_NAME,
 )
+from app.services.search_cache import cached_search, search_cache_key
+from app.services.fusion import FusionResult, RankedList, fuse_ranked_lists
+from app.services.vendor_mirror import mirror_enabled, vendor_mirror
+from app.services.intent_cache import (
+    get_cached_intent,
+    query_intent_key,
+    rfp_intent_key,
+    store_intent,
+)
+from app.services.query_parser import parse_query
+from app.services.vendor_vocabulary import certificate_keyword, location_keywords
 
 
 class GeminiVendor(BaseModel):
@@ -51,6 +73,14 @@ class QueryIntent(BaseModel):
         None,
         description="Type of vendor if specified: manufacturer, trader, distributor, service_provider",
     )
+    min_estd: Optional[int] = Field(
+        None,
+        description="Earliest acceptable establishment year, if the query restricts how recently the vendor was founded",
+    )
+    max_estd: Optional[int] = Field(
+        None,
+        description="Latest acceptable establishment year, e.g. 2000 for 'established before 2001' or current year minus 10 for '10+ years in business'",
+    )
     keywords: List[str] = Field(
         default_factory=list,
         description="Core meaningful keywords stripped of stop words and filler (4-8 words)",
@@ -67,6 +97,11 @@ def get_gemini_client() -> genai.Client:
     return genai.Client(api_key=api_key)
 
 
+# Part of the intent cache key; bump when the prompt or QueryIntent changes
+_QUERY_INTENT_PROMPT_VERSION = "1"
+
+
+@timed_call("decompose_query")
 async def decompose_query(query: str) -> QueryIntent:
     """
     Use Gemini to extract structured search intent from a natural language query.
@@ -75,17 +110,34 @@ async def decompose_query(query: str) -> QueryIntent:
     clean search_text phrase optimised for semantic embedding.
 
     Falls back to treating the raw query as search_text if Gemini is unavailable.
+    Successful extractions are memoised by normalised query text (see
+    app.services.intent_cache); fallbacks are never cached.
+
+    Queries the gazetteer parser (app.services.query_parser) explains with at
+    least QUERY_PARSER_MIN_CONFIDENCE never reach the LLM.
     """
+    if settings.QUERY_PARSER_ENABLED:
+        try:
+            parsed = await asyncio.to_thread(parse_query, query)
+            if parsed.confidence >= settings.QUERY_PARSER_MIN_CONFIDENCE:
+                print(
+                    f"[search] fast-path intent ({parsed.confidence:.2f}): "
+                    f"{parsed.matched}"
+                )
+                return QueryIntent(**parsed.fields)
+        except Exception as e:
+            print(f"[search] fast-path parse failed: {e}")
+
+    cache_key = query_intent_key(
+        query, settings.GEMINI_MODEL, _QUERY_INTENT_PROMPT_VERSION
+    )
+    cached = await get_cached_intent(cache_key)
+    if cached is not None:
+        print(f"[search] intent cache hit: '{query}'")
+        return QueryIntent(**cached)
+
     try:
-        api_key = settings.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not configured")
-
-        llm = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            temperature=0,
-            api_key=api_key,
-        )
+        llm = llm_gateway.gemini_model()
         structured_llm = llm.with_structured_output(schema=QueryIntent)
 
         prompt = f"""Extract structured vendor search intent from this query.
@@ -97,15 +149,19 @@ Extract the following fields:
 - location: city or state in India (null if not mentioned)
 - certifications: required certifications e.g. ISO 9001, BIS, NABL, FSSAI, GeM, CE, CMMI (empty list if none)
 - vendor_type: manufacturer / trader / distributor / service_provider (null if unclear)
+- min_estd / max_estd: establishment-year bounds if the query asks for vendor age/experience, e.g. "established before 2000" → max_estd 1999 (null otherwise)
 - keywords: 4-8 core meaningful words, no stop words or filler phrases
 - search_text: clean 6-12 word phrase for semantic search, e.g. "steel pipe manufacturer Maharashtra ISO certified"
 """
 
-        result = await structured_llm.ainvoke(prompt)
+        result = await llm_gateway.ainvoke(
+            structured_llm, prompt, settings.GEMINI_MODEL, max_tokens=512
+        )
         print(
             f"[search] intent: products={result.products} loc={result.location} "
             f"certs={result.certifications} type={result.vendor_type} text='{result.search_text}'"
         )
+        await store_intent(cache_key, "query", result.model_dump())
         return result
     except Exception as e:
         print(f"[search] query decomposition failed, using raw query: {e}")
@@ -113,27 +169,32 @@ Extract the following fields:
         return QueryIntent(keywords=words[:8], search_text=query[:200])
 
 
+# Part of the intent cache key; bump when the prompt or QueryIntent changes
+_RFP_INTENT_PROMPT_VERSION = "1"
+
+
+@timed_call("decompose_rfp")
 async def decompose_rfp_to_intent(rfp_data: dict) -> QueryIntent:
     """
     Use Amazon Nova to extract structured search intent from the full RFP content.
     Extracts key products, required certifications, and an optimized search phrase.
+    Results are memoised by a hash of the RFP payload.
     """
-    from langchain_aws import ChatBedrockConverse
     import json
 
     print(
         f"[search-rfp] incoming rfp_data keys: {list(rfp_data.keys()) if isinstance(rfp_data, dict) else type(rfp_data)}"
     )
 
+    model_id = settings.BEDROCK_NOVA_MODEL_ID or "us.amazon.nova-2-lite-v1:0"
+    cache_key = rfp_intent_key(rfp_data, model_id, _RFP_INTENT_PROMPT_VERSION)
+    cached = await get_cached_intent(cache_key)
+    if cached is not None:
+        print("[search-rfp] intent cache hit")
+        return QueryIntent(**cached)
+
     try:
-        model_id = settings.BEDROCK_NOVA_MODEL_ID or "us.amazon.nova-2-lite-v1:0"
-        llm = ChatBedrockConverse(
-            model=model_id,
-            region_name=settings.AWS_REGION,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            temperature=0,
-        )
+        llm = llm_gateway.chat_model(model_id, temperature=0)
         structured_llm = llm.with_structured_output(schema=QueryIntent)
 
         rfp_summary = json.dumps(rfp_data, indent=2)
@@ -155,14 +216,16 @@ Fill in the QueryIntent:
 - location: City or region if specified in RFP, otherwise null.
 - certifications: Required certifications/standards mentioned (ISO, BIS, CMMI, AWS, etc.).
 - vendor_type: "manufacturer", "service_provider", "distributor" etc. based on RFP context.
+- min_estd / max_estd: establishment-year bounds only if the RFP requires a minimum number of years in business or founding date, otherwise null.
 - keywords: 4-8 highly specific technical keywords from the RFP content.
 - search_text: A precise 8-12 word search phrase using ONLY terms from the RFP. NO generic words.
 """
-        result = await structured_llm.ainvoke(prompt)
+        result = await llm_gateway.ainvoke(structured_llm, prompt, model_id)
         print(
             f"[search-rfp] extracted intent: products={result.products} loc={result.location} "
             f"certs={result.certifications} type={result.vendor_type} text='{result.search_text}'"
         )
+        await store_intent(cache_key, "rfp", result.model_dump())
         return result
     except Exception as e:
         print(f"[search-rfp] Nova decomposition failed: {e}")
@@ -287,6 +350,99 @@ def _build_keyword_query(intent: QueryIntent) -> dict:
     return {"bool": {"should": should_clauses, "minimum_should_match": 1}}
 
 
+@dataclass
+class KnnFilter:
+    """
+    Structured pre-filter for the vector phase, derived from QueryIntent.
+
+    Applied inside the kNN query (efficient filtering) so only matching
+    vendors are walked: any of the intent's location parts, any of its
+    certifications (prefix match, so "ISO 9001" matches "ISO 9001:2015") and
+    the establishment-year range.  `matches` evaluates the same conditions
+    against a vendor source for the in-process mirror.
+    """
+
+    locations: List[str] = field(default_factory=list)
+    certifications: List[str] = field(default_factory=list)
+    min_estd: Optional[int] = None
+    max_estd: Optional[int] = None
+
+    def to_query(self) -> dict:
+        clauses = []
+        if self.locations:
+            clauses.append({"terms": {"location_terms": self.locations}})
+        if self.certifications:
+            clauses.append(
+                {
+                    "bool": {
+                        "should": [
+                            {"prefix": {"certificates.keyword": cert}}
+                            for cert in self.certifications
+                        ],
+                        "minimum_should_match": 1,
+                    }
+                }
+            )
+        if self.min_estd is not None or self.max_estd is not None:
+            bounds = {}
+            if self.min_estd is not None:
+                bounds["gte"] = self.min_estd
+            if self.max_estd is not None:
+                bounds["lte"] = self.max_estd
+            clauses.append({"range": {"estd": bounds}})
+        return {"bool": {"filter": clauses}}
+
+    def matches(self, source: dict) -> bool:
+        if self.locations:
+            terms = source.get("location_terms") or location_keywords(
+                source.get("location")
+            )
+            if not set(self.locations).intersection(terms):
+                return False
+        if self.certifications:
+            held = [certificate_keyword(c) for c in source.get("certificates") or []]
+            if not any(h.startswith(c) for c in self.certifications for h in held):
+                return False
+        if self.min_estd is not None or self.max_estd is not None:
+            estd = source.get("estd")
+            if not isinstance(estd, int):
+                return False
+            if self.min_estd is not None and estd < self.min_estd:
+                return False
+            if self.max_estd is not None and estd > self.max_estd:
+                return False
+        return True
+
+
+def _build_knn_filter(intent: QueryIntent) -> Optional[KnnFilter]:
+    """The intent's structured constraints as a kNN pre-filter, or None."""
+    if not settings.VENDOR_SEARCH_KNN_FILTERS:
+        return None
+    knn_filter = KnnFilter(
+        locations=location_keywords(intent.location),
+        certifications=[
+            c for c in (certificate_keyword(c) for c in intent.certifications) if c
+        ],
+        min_estd=intent.min_estd,
+        max_estd=intent.max_estd,
+    )
+    if not (
+        knn_filter.locations
+        or knn_filter.certifications
+        or knn_filter.min_estd is not None
+        or knn_filter.max_estd is not None
+    ):
+        return None
+    return knn_filter
+
+
+def _vector_candidates(top_n: int, knn_filter: Optional[KnnFilter]) -> int:
+    """kNN depth: a filtered phase only walks relevant vectors, so it needs fewer."""
+    if knn_filter is not None:
+        return top_n * settings.VENDOR_SEARCH_FILTERED_CANDIDATE_MULTIPLIER
+    return top_n * settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER
+
+
 def _rrf_fuse(
     vector_hits: dict[str, dict],
     keyword_hits: dict[str, dict],
@@ -301,30 +457,275 @@ def _rrf_fuse(
     it requires no score normalisation and is robust to outlier raw scores in
     either retrieval list.  Documents appearing in both lists receive an additive
     boost from the second term.
+
+    Two-list convenience wrapper over app.services.fusion.fuse_ranked_lists.
+    """
+    fused = fuse_ranked_lists(
+        [
+            RankedList.from_hits("vector", vector_hits),
+            RankedList.from_hits("keyword", keyword_hits),
+        ],
+        k=k,
+    )
+    return [(str(vid), float(score)) for vid, score in zip(fused.ids, fused.scores)]
+
+
+def _fuse_hits(retrievers: dict[str, dict[str, dict]]) -> FusionResult:
     """
-    vec_ranked = sorted(
-        vector_hits, key=lambda v: vector_hits[v]["score"], reverse=True
+    Fuse any number of named retriever hit maps with the configured per-list
+    weights (VENDOR_SEARCH_RRF_WEIGHTS, default 1.0) and fusion mode.
+    """
+    weights = settings.VENDOR_SEARCH_RRF_WEIGHTS
+    return fuse_ranked_lists(
+        [
+            RankedList.from_hits(name, hits, weight=weights.get(name, 1.0))
+            for name, hits in retrievers.items()
+        ],
+        k=settings.VENDOR_SEARCH_RRF_K,
+        score_aware=settings.VENDOR_SEARCH_SCORE_AWARE_FUSION,
     )
-    kw_ranked = sorted(
-        keyword_hits, key=lambda v: keyword_hits[v]["score"], reverse=True
+
+
+def _knn_clause(
+    query_embedding: list[float], k: int, knn_filter: Optional[KnnFilter] = None
+) -> dict:
+    """kNN query on the embedding field, with the filter applied during the search."""
+    spec = {"vector": encode_vector(query_embedding), "k": k}
+    if knn_filter is not None:
+        spec["filter"] = knn_filter.to_query()
+    return {"knn": {"embedding": spec}}
+
+
+def _build_vector_search_body(
+    query_embedding: list[float],
+    candidates: int,
+    min_score: float,
+    knn_filter: Optional[KnnFilter] = None,
+) -> dict:
+    """kNN retrieval body; `min_score` is on the 1 + cosine scale."""
+    return {
+        "min_score": similarity_to_knn_score(min_score),
+        "size": candidates,
+        "query": _knn_clause(query_embedding, candidates, knn_filter),
+        "_source": {"excludes": ["embedding"]},
+    }
+
+
+def _build_keyword_search_body(intent: QueryIntent, candidates: int) -> dict:
+    """BM25 retrieval body for the vendor index."""
+    return {
+        "size": candidates,
+        "query": _build_keyword_query(intent),
+        "_source": {"excludes": ["embedding"]},
+    }
+
+
+async def _msearch(client, index: str, bodies: list[dict]) -> list[dict]:
+    """
+    Run several search bodies against `index` in a single _msearch request.
+
+    Returns one response per body, in order.  A failed sub-search comes back as
+    a dict with an "error" key rather than raising, so the other retrievers
+    still contribute.
+    """
+    payload: list[dict] = []
+    for body in bodies:
+        payload.append({"index": index})
+        payload.append(body)
+    return (await client.msearch(body=payload))["responses"]
+
+
+def _collect_hits(response: dict, phase: str = "keyword") -> dict[str, dict]:
+    """
+    Map vendor_id -> {source, score} for one search response.  Vector scores
+    are converted to the 1 + cosine scale whatever the kNN engine.
+    """
+    hits: dict[str, dict] = {}
+    for hit in response.get("hits", {}).get("hits", []):
+        vid = hit["_source"].get("vendor_id") or hit["_id"]
+        score = hit["_score"]
+        if phase == "vector":
+            score = knn_score_to_similarity(score)
+        hits[vid] = {"source": hit["_source"], "score": score}
+    return hits
+
+
+async def _retrieve_from_opensearch(
+    intent: QueryIntent,
+    embed_text: str,
+    candidates: int,
+    vec_min_score: float,
+    knn_filter: Optional[KnnFilter] = None,
+    vector_candidates: Optional[int] = None,
+) -> tuple[dict[str, dict], dict[str, dict], bool]:
+    """
+    Run the kNN and BM25 phases against OpenSearch.  `knn_filter` restricts
+    the kNN phase only; `vector_candidates` defaults to `candidates`.
+
+    Returns (vector_hits, keyword_hits, failed) where `failed` is True when
+    OpenSearch itself could not be reached for any retrieval phase.
+    """
+    import traceback
+
+    vector_hits: dict[str, dict] = {}
+    keyword_hits: dict[str, dict] = {}
+    failures: list[str] = []
+    vector_candidates = vector_candidates or candidates
+
+    try:
+        client = get_opensearch_client()
+    except Exception as e:
+        print(f"[search] OpenSearch unavailable: {e}")
+        return vector_hits, keyword_hits, True
+
+    msearch = settings.VENDOR_SEARCH_RETRIEVAL_MODE == "msearch"
+    query_embedding = (
+        await asyncio.to_thread(cached_embedding, embed_text) if msearch else None
     )
 
-    vec_ranks = {vid: i + 1 for i, vid in enumerate(vec_ranked)}
-    kw_ranks = {vid: i + 1 for i, vid in enumerate(kw_ranked)}
+    if query_embedding is not None:
+        # ── Phases 1 & 2: one _msearch round trip for every retriever ────────
+        phases: dict[str, dict] = {
+            "vector": _build_vector_search_body(
+                query_embedding, vector_candidates, vec_min_score, knn_filter
+            ),
+            "keyword": _build_keyword_search_body(intent, candidates),
+        }
+        try:
+            with timed("msearch"):
+                responses = await _msearch(
+                    client, VENDOR_INDEX_NAME, list(phases.values())
+                )
+            phase_hits = {
+                name: _collect_hits(response, name)
+                for name, response in zip(phases, responses)
+            }
+            vector_hits = phase_hits["vector"]
+            keyword_hits = phase_hits["keyword"]
+            for name, response in zip(phases, responses):
+                if "error" in response:
+                    print(f"[search] {name} phase failed: {response['error']}")
+                    failures.append(name)
+            print(
+                f"[search] msearch: vector={len(vector_hits)} hits above {vec_min_score} "
+                f"keyword={len(keyword_hits)} hits | embed: '{embed_text}'"
+            )
+        except Exception as e:
+            print(f"[search] msearch failed: {e}")
+            traceback.print_exc()
+            failures.append("msearch")
+    else:
+        # ── Phases 1 & 2: Run kNN vector search and BM25 keyword search concurrently ──
+        # (msearch mode lands here on an embedding cache miss, so BM25 runs
+        # while Titan embeds instead of waiting for it)
+        async def run_vector_search():
+            try:
+                query_embedding = await asyncio.to_thread(
+                    generate_embedding, embed_text, not msearch
+                )
+            except Exception as e:
+                print(f"[search] embedding failed, skipping vector phase: {e}")
+                traceback.print_exc()
+                return
+            try:
+                with timed("knn"):
+                    response = await client.search(
+                        index=VENDOR_INDEX_NAME,
+                        body=_build_vector_search_body(
+                            query_embedding,
+                            vector_candidates,
+                            vec_min_score,
+                            knn_filter,
+                        ),
+                    )
+                vector_hits.update(_collect_hits(response, "vector"))
+                print(
+                    f"[search] vector phase: {len(vector_hits)} hits above {vec_min_score} | embed: '{embed_text}'"
+                )
+            except Exception as e:
+                print(f"[search] vector phase failed: {e}")
+                traceback.print_exc()
+                failures.append("vector")
+
+        async def run_keyword_search():
+            try:
+                with timed("bm25"):
+                    response = await client.search(
+                        index=VENDOR_INDEX_NAME,
+                        body=_build_keyword_search_body(intent, candidates),
+                    )
+                keyword_hits.update(_collect_hits(response))
+                print(
+                    f"[search] keyword phase: {len(keyword_hits)} hits | products={intent.products} loc={intent.location} certs={intent.certifications}"
+                )
+            except Exception as e:
+                print(f"[search] keyword phase failed: {e}")
+                traceback.print_exc()
+                failures.append("keyword")
+
+        await asyncio.gather(run_vector_search(), run_keyword_search())
+
+    return vector_hits, keyword_hits, bool(failures)
 
-    scored: list[tuple[str, float]] = []
-    for vid in set(vector_hits) | set(keyword_hits):
-        rrf = 0.0
-        if vid in vec_ranks:
-            rrf += 1.0 / (k + vec_ranks[vid])
-        if vid in kw_ranks:
-            rrf += 1.0 / (k + kw_ranks[vid])
-        scored.append((vid, rrf))
 
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return scored
+def _mirror_keyword_terms(intent: QueryIntent) -> list[tuple[str, str, float]]:
+    """(field, text, boost) triples mirroring the clauses of _build_keyword_query."""
+    terms: list[tuple[str, str, float]] = []
+    for product in intent.products:
+        terms.append(("products", product, 5.0))
+    if intent.location:
+        terms.append(("location", intent.location, 4.0))
+    for cert in intent.certifications:
+        terms.append(("certificates", cert, 4.0))
+    if intent.keywords:
+        terms.append(("vendor_name", " ".join(intent.keywords), 4.0))
+    if intent.vendor_type:
+        terms.append(("products", intent.vendor_type, 1.5))
+    if intent.search_text:
+        terms.extend(
+            [
+                ("vendor_name", intent.search_text, 3.0),
+                ("products", intent.search_text, 4.0),
+                ("certificates", intent.search_text, 2.0),
+                ("location", intent.search_text, 2.0),
+            ]
+        )
+    return terms
+
+
+async def _retrieve_from_mirror(
+    intent: QueryIntent,
+    embed_text: str,
+    candidates: int,
+    vec_min_score: float,
+    knn_filter: Optional[KnnFilter] = None,
+    vector_candidates: Optional[int] = None,
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Run both retrieval phases against the in-process vendor mirror."""
+    vector_hits: dict[str, dict] = {}
+    try:
+        query_embedding = await asyncio.to_thread(generate_embedding, embed_text)
+        with timed("mirror_knn"):
+            vector_hits = vendor_mirror.vector_search(
+                query_embedding,
+                vector_candidates or candidates,
+                vec_min_score,
+                row_filter=knn_filter.matches if knn_filter else None,
+            )
+    except Exception as e:
+        print(f"[search] embedding failed, mirror keyword phase only: {e}")
+    with timed("mirror_bm25"):
+        keyword_hits = vendor_mirror.keyword_search(
+            _mirror_keyword_terms(intent), candidates
+        )
+    print(
+        f"[search] mirror: vector={len(vector_hits)} hits above {vec_min_score} "
+        f"keyword={len(keyword_hits)} hits | embed: '{embed_text}'"
+    )
+    return vector_hits, keyword_hits
 
 
+@timed_call("internal")
 async def search_vendors_hybrid(
     intent: Optional[QueryIntent] = None,
     query: Optional[str] = None,
@@ -341,13 +742,17 @@ async def search_vendors_hybrid(
 
     Score fusion — RRF:
         Results are merged with Reciprocal Rank Fusion.
-    """
-    import traceback
 
-    top_n = settings.VENDOR_SEARCH_TOP_N
-    candidates = top_n * settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER
-    rrf_k = settings.VENDOR_SEARCH_RRF_K
+    With VENDOR_SEARCH_ENGINE=server_hybrid both phases run as one native
+    `hybrid` query and are fused by an OpenSearch search pipeline instead;
+    client-side RRF remains the fallback when the pipeline is unavailable.
+    With VENDOR_SEARCH_ENGINE=local both phases are answered from the
+    in-process vendor mirror, which also serves as the fallback whenever
+    OpenSearch cannot be reached.
 
+    Shaped results are cached per intent and invalidated by vendor index
+    writes (see app.services.search_cache).
+    """
     # ── Phase 0: structured intent ──────────────────────────────────────────
     if not intent:
         if not query:
@@ -358,81 +763,91 @@ async def search_vendors_hybrid(
         query = intent
         intent = await decompose_query(query)
 
-    client = _get_opensearch_client()
+    # Identical intents are answered from the versioned result cache
+    cache_key = search_cache_key(intent.model_dump_json(), top_n)
+    return await cached_search(
+        cache_key, lambda: _search_vendors_hybrid_uncached(intent, query, top_n)
+    )
 
-    vector_hits: dict[str, dict] = {}
-    keyword_hits: dict[str, dict] = {}
 
-    # ── Phases 1 & 2: Run kNN vector search and BM25 keyword search concurrently ──
-    async def run_vector_search():
-        vec_min_score = settings.VENDOR_SEARCH_VECTOR_MIN_SCORE
-        embed_text = intent.search_text or query or ""
-        try:
-            query_embedding = await asyncio.to_thread(generate_embedding, embed_text)
-            response = await asyncio.to_thread(
-                client.search,
-                index=VENDOR_INDEX_NAME,
-                body={
-                    "min_score": vec_min_score,
-                    "size": candidates,
-                    "query": {
-                        "knn": {
-                            "embedding": {
-                                "vector": query_embedding,
-                                "k": candidates,
-                            }
-                        }
-                    },
-                    "_source": {"excludes": ["embedding"]},
-                },
-            )
-            for hit in response["hits"]["hits"]:
-                vid = hit["_source"].get("vendor_id") or hit["_id"]
-                vector_hits[vid] = {"source": hit["_source"], "score": hit["_score"]}
-            print(
-                f"[search] vector phase: {len(vector_hits)} hits above {vec_min_score} | embed: '{embed_text}'"
-            )
-        except Exception as e:
-            print(f"[search] vector phase failed: {e}")
-            traceback.print_exc()
+async def _search_vendors_hybrid_uncached(
+    intent: QueryIntent, query: Optional[str], top_n: int
+) -> list[dict]:
+    """Retrieval, fusion and result shaping for an already-resolved intent."""
+    candidates = top_n * settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER
 
-    async def run_keyword_search():
-        try:
-            response = await asyncio.to_thread(
-                client.search,
-                index=VENDOR_INDEX_NAME,
-                body={
-                    "size": candidates,
-                    "query": _build_keyword_query(intent),
-                    "_source": {"excludes": ["embedding"]},
-                },
+    embed_text = intent.search_text or query or ""
+    vec_min_score = settings.VENDOR_SEARCH_VECTOR_MIN_SCORE
+    engine = settings.VENDOR_SEARCH_ENGINE
+    knn_filter = _build_knn_filter(intent)
+    mirror_args = (knn_filter, _vector_candidates(top_n, knn_filter))
+
+    if engine == "local" and vendor_mirror.ready:
+        vector_hits, keyword_hits = await _retrieve_from_mirror(
+            intent, embed_text, candidates, vec_min_score, *mirror_args
+        )
+    else:
+        # Indices built before the filter fields existed search unfiltered
+        if knn_filter is not None and not await knn_filters_available():
+            os_filter = None
+        else:
+            os_filter = knn_filter
+        vector_candidates = _vector_candidates(top_n, os_filter)
+
+        if engine == "server_hybrid":
+            results = await _search_server_hybrid(
+                get_opensearch_client(),
+                intent,
+                embed_text,
+                top_n,
+                candidates,
+                vec_min_score,
+                os_filter,
+                vector_candidates,
             )
-            for hit in response["hits"]["hits"]:
-                vid = hit["_source"].get("vendor_id") or hit["_id"]
-                keyword_hits[vid] = {"source": hit["_source"], "score": hit["_score"]}
-            print(
-                f"[search] keyword phase: {len(keyword_hits)} hits | products={intent.products} loc={intent.location} certs={intent.certifications}"
+            if results is not None:
+                return results
+            print("[search] server-side hybrid unavailable, using client-side RRF")
+
+        vector_hits, keyword_hits, failed = await _retrieve_from_opensearch(
+            intent,
+            embed_text,
+            candidates,
+            vec_min_score,
+            os_filter,
+            vector_candidates,
+        )
+        if failed and mirror_enabled() and vendor_mirror.ready:
+            # Keep serving from the in-process mirror while OpenSearch is down
+            print("[search] OpenSearch retrieval failed, answering from mirror")
+            vector_hits, keyword_hits = await _retrieve_from_mirror(
+                intent, embed_text, candidates, vec_min_score, *mirror_args
             )
-        except Exception as e:
-            print(f"[search] keyword phase failed: {e}")
-            traceback.print_exc()
 
-    await asyncio.gather(run_vector_search(), run_keyword_search())
+    return _rank_hits(vector_hits, keyword_hits, top_n)
+
 
+def _rank_hits(
+    vector_hits: dict[str, dict], keyword_hits: dict[str, dict], top_n: int
+) -> list[dict]:
+    """Fuse the two phases' hits and shape the top_n name-deduplicated vendors."""
     if not vector_hits and not keyword_hits:
         print("[search] both phases returned no results")
         return []
 
     # ── RRF score fusion ─────────────────────────────────────────────────────
     # RRF determines rank order. We include all vendors that appeared in
-    # either retrieval phase (vector or keyword).
-    fused = _rrf_fuse(vector_hits, keyword_hits, k=rrf_k)
+    # any retrieval phase (vector or keyword).
+    retrievers = {"vector": vector_hits, "keyword": keyword_hits}
+    with timed("fuse"):
+        fused = _fuse_hits(retrievers)
 
+    shaping_started = time.perf_counter()
     results = []
     seen_names = set()
-    for vid, rrf_score in fused:
+    for i, vid in enumerate(fused.ids):
         # vendor_data must exist in at least one of the hit lists
-        hit_data = vector_hits.get(vid) or keyword_hits.get(vid)
+        hit_data = next((h[vid] for h in retrievers.values() if vid in h), None)
         if not hit_data:
             continue
 
@@ -448,67 +863,183 @@ async def search_vendors_hybrid(
         if len(results) >= top_n:
             break
 
-        raw_vec = vector_hits.get(vid, {}).get("score", 0.0)
-        raw_kw = keyword_hits.get(vid, {}).get("score", 0.0)
+        raw_vec = fused.raw_score("vector", i)
+        raw_kw = fused.raw_score("keyword", i)
+        cosine_sim = _display_score(raw_vec, raw_kw, fused.in_list("vector", i))
 
-        # final_score = cosine similarity, derived from the OpenSearch cosinesimil
-        # score formula: opensearch_score = 1 + cosine → cosine = score - 1.
-        if vid in vector_hits:
-            cosine_sim = max(0.0, min(1.0, raw_vec - 1.0))
-        else:
-            # Heuristic for keyword-only matches to avoid 0% in UI.
-            # BM25 scores typically range 5-30. We map them into [0.70, 0.95]
-            # to better reflect semantic relevance even if vector hits are missing.
-            # 25+ -> 0.95, 15 -> 0.85, 5 -> 0.70
-            if raw_kw >= 25:
-                cosine_sim = 0.95
-            elif raw_kw <= 5:
-                cosine_sim = 0.70
-            else:
-                # Linear interpolation between 5 and 25
-                cosine_sim = 0.70 + (raw_kw - 5) * (0.25 / 20)
-            cosine_sim = round(cosine_sim, 4)
-
-        csv_certs: list[str] = vendor_data.get("certificates") or []
-        doc_certs: list[str] = [
-            d.get("document_name") or d.get("document_type", "")
-            for d in (vendor_data.get("certificate_details") or [])
-            if d.get("document_name") or d.get("document_type")
-        ]
-        seen: set[str] = set()
-        all_certs: list[str] = []
-        for c in csv_certs + doc_certs:
-            c = c.strip()
-            if c and c not in seen:
-                seen.add(c)
-                all_certs.append(c)
-
-        raw_details: list[dict] = vendor_data.get("certificate_details") or []
         print(
             f"[search] {vendor_data.get('vendor_name')}: "
-            f"cosine={cosine_sim:.4f} rrf={rrf_score:.6f} vec={raw_vec:.4f} kw={raw_kw:.4f}"
+            f"cosine={cosine_sim:.4f} rrf={fused.scores[i]:.6f} vec={raw_vec:.4f} kw={raw_kw:.4f}"
         )
-
         results.append(
-            {
-                "vendor_id": vid,
-                "vendor_name": vendor_data.get("vendor_name", ""),
-                "source": "internal",
-                "description": "",
-                "location": vendor_data.get("location", ""),
-                "products": vendor_data.get("products") or [],
-                "certificates": all_certs,
-                "certificate_details": raw_details,
-                "website": vendor_data.get("website", ""),
-                "contact_email": vendor_data.get("contact_email", ""),
-                "mobile": vendor_data.get("mobile", ""),
-                "estd": vendor_data.get("estd"),
-                "final_score": round(cosine_sim, 4),
-                "keyword_score": round(raw_kw, 4),
-                "vector_score": round(raw_vec, 4),
-            }
+            _shape_vendor_result(vid, vendor_data, cosine_sim, raw_vec, raw_kw)
+        )
+
+    record("shape", time.perf_counter() - shaping_started)
+    return results
+
+
+def _display_score(raw_vec: float, raw_kw: float, vector_matched: bool) -> float:
+    """
+    Map raw retrieval scores to the [0, 1] final_score shown in the UI.
+    """
+    # final_score = cosine similarity; vector scores are on the 1 + cosine
+    # scale (see documents.knn_score_to_similarity) → cosine = score - 1.
+    if vector_matched:
+        return max(0.0, min(1.0, raw_vec - 1.0))
+
+    # Heuristic for keyword-only matches to avoid 0% in UI.
+    # BM25 scores typically range 5-30. We map them into [0.70, 0.95]
+    # to better reflect semantic relevance even if vector hits are missing.
+    # 25+ -> 0.95, 15 -> 0.85, 5 -> 0.70
+    if raw_kw >= 25:
+        cosine_sim = 0.95
+    elif raw_kw <= 5:
+        cosine_sim = 0.70
+    else:
+        # Linear interpolation between 5 and 25
+        cosine_sim = 0.70 + (raw_kw - 5) * (0.25 / 20)
+    return round(cosine_sim, 4)
+
+
+def _shape_vendor_result(
+    vid: str,
+    vendor_data: dict,
+    final_score: float,
+    raw_vec: float,
+    raw_kw: float,
+) -> dict:
+    """Build the VendorSearchResult-shaped dict for one internal vendor hit."""
+    csv_certs: list[str] = vendor_data.get("certificates") or []
+    doc_certs: list[str] = [
+        d.get("document_name") or d.get("document_type", "")
+        for d in (vendor_data.get("certificate_details") or [])
+        if d.get("document_name") or d.get("document_type")
+    ]
+    seen: set[str] = set()
+    all_certs: list[str] = []
+    for c in csv_certs + doc_certs:
+        c = c.strip()
+        if c and c not in seen:
+            seen.add(c)
+            all_certs.append(c)
+
+    return {
+        "vendor_id": vid,
+        "vendor_name": vendor_data.get("vendor_name", ""),
+        "source": "internal",
+        "description": "",
+        "location": vendor_data.get("location", ""),
+        "products": vendor_data.get("products") or [],
+        "certificates": all_certs,
+        "certificate_details": vendor_data.get("certificate_details") or [],
+        "website": vendor_data.get("website", ""),
+        "contact_email": vendor_data.get("contact_email", ""),
+        "mobile": vendor_data.get("mobile", ""),
+        "estd": vendor_data.get("estd"),
+        "final_score": round(final_score, 4),
+        "keyword_score": round(raw_kw, 4),
+        "vector_score": round(raw_vec, 4),
+    }
+
+
+async def _search_server_hybrid(
+    client,
+    intent: QueryIntent,
+    embed_text: str,
+    top_n: int,
+    candidates: int,
+    vec_min_score: float,
+    knn_filter: Optional[KnnFilter] = None,
+    vector_candidates: Optional[int] = None,
+) -> Optional[list[dict]]:
+    """
+    Server-side hybrid retrieval via a native `hybrid` query.
+
+    The normalization search pipeline (see ensure_hybrid_search_pipeline)
+    min-max normalises the kNN and BM25 sub-query scores and combines them with
+    a weighted arithmetic mean, so only the fused top documents travel over
+    the wire.  That combined score only orders the results (the top hit is
+    always ~1.0), so the raw per-phase scores are fetched alongside in one
+    _msearch that returns ids and scores only, and final_score is derived from
+    them exactly as on the client-side RRF path.  The kNN sub-query keeps
+    VENDOR_SEARCH_VECTOR_MIN_SCORE.
+
+    Returns None when the pipeline is unavailable or the query fails so the
+    caller can fall back to client-side RRF.
+    """
+    import traceback
+
+    if not await hybrid_pipeline_available():
+        return None
+
+    vector_candidates = vector_candidates or candidates
+    try:
+        query_embedding = await asyncio.to_thread(generate_embedding, embed_text)
+        vector_body = _build_vector_search_body(
+            query_embedding, vector_candidates, vec_min_score, knn_filter
         )
+        keyword_body = _build_keyword_search_body(intent, candidates)
+        with timed("hybrid_query"):
+            response, phase_responses = await asyncio.gather(
+                client.search(
+                    index=VENDOR_INDEX_NAME,
+                    search_pipeline=HYBRID_SEARCH_PIPELINE,
+                    body={
+                        # Over-fetch slightly to leave room for name de-duplication
+                        "size": top_n * 2,
+                        "query": {
+                            "hybrid": {
+                                "queries": [
+                                    {
+                                        "function_score": {
+                                            "query": vector_body["query"],
+                                            "min_score": vector_body["min_score"],
+                                        }
+                                    },
+                                    keyword_body["query"],
+                                ]
+                            }
+                        },
+                        "_source": {"excludes": ["embedding"]},
+                    },
+                ),
+                _msearch(
+                    client,
+                    VENDOR_INDEX_NAME,
+                    [
+                        {**vector_body, "_source": ["vendor_id"]},
+                        {**keyword_body, "_source": ["vendor_id"]},
+                    ],
+                ),
+            )
+        for name, phase in zip(("vector", "keyword"), phase_responses):
+            if "error" in phase:
+                raise RuntimeError(f"{name} score phase failed: {phase['error']}")
+        vector_hits = _collect_hits(phase_responses[0], "vector")
+        keyword_hits = _collect_hits(phase_responses[1])
+    except Exception as e:
+        print(f"[search] server-side hybrid query failed: {e}")
+        traceback.print_exc()
+        return None
+
+    results = []
+    seen_names = set()
+    for hit in response["hits"]["hits"]:
+        vendor_data = hit["_source"]
+        canonical_name = (vendor_data.get("vendor_name") or "").strip().lower()
+        if canonical_name in seen_names:
+            continue
+        seen_names.add(canonical_name)
+        if len(results) >= top_n:
+            break
+        vid = vendor_data.get("vendor_id") or hit["_id"]
+        raw_vec = vector_hits.get(vid, {}).get("score", 0.0)
+        raw_kw = keyword_hits.get(vid, {}).get("score", 0.0)
+        score = _display_score(raw_vec, raw_kw, vid in vector_hits)
+        results.append(_shape_vendor_result(vid, vendor_data, score, raw_vec, raw_kw))
 
+    print(f"[search] server-side hybrid: {len(results)} fused hits")
     return results
 
 
@@ -527,6 +1058,257 @@ async def search_vendors_by_rfp(rfp_data: dict) -> list[dict]:
     return await search_vendors_hybrid(intent=intent)
 
 
+# ---------------------------------------------------------------------------
+# Batched multi-line-item search
+# ---------------------------------------------------------------------------
+
+
+class LineItemIntents(BaseModel):
+    """Structured search intents for several RFP line items."""
+
+    items: List[QueryIntent] = Field(
+        description="Exactly one search intent per line item, in input order"
+    )
+
+
+def _fallback_line_item_intent(item: str, rfp_data: dict) -> QueryIntent:
+    """Deterministic intent for one line item when the LLM is unavailable."""
+    fields = parse_query(item).fields
+    if not fields["products"]:
+        fields["products"] = [item[:120]]
+        fields["search_text"] = item[:200]
+    certs = rfp_data.get("qualityStandards") or []
+    if isinstance(certs, list):
+        fields["certifications"] = list(dict.fromkeys(fields["certifications"] + certs))
+    return QueryIntent(**fields)
+
+
+# Part of the intent cache key; bump when the prompt or LineItemIntents changes
+_LINE_ITEM_PROMPT_VERSION = "1"
+
+
+@timed_call("decompose_line_items")
+async def decompose_line_items(
+    line_items: list[str], rfp_data: Optional[dict] = None
+) -> list[QueryIntent]:
+    """
+    Build one QueryIntent per RFP line item.
+
+    Items the gazetteer parser explains confidently are resolved locally; the
+    rest are extracted together in a single structured Nova call (memoised like
+    decompose_rfp_to_intent).  Items the LLM cannot cover fall back to a
+    deterministic intent, so the result always lines up with `line_items`.
+    """
+    import json
+
+    rfp_data = rfp_data or {}
+    intents: list[Optional[QueryIntent]] = [None] * len(line_items)
+
+    if settings.QUERY_PARSER_ENABLED:
+        parsed = await asyncio.to_thread(lambda: [parse_query(i) for i in line_items])
+        for idx, p in enumerate(parsed):
+            if p.confidence >= settings.QUERY_PARSER_MIN_CONFIDENCE:
+                intents[idx] = QueryIntent(**p.fields)
+
+    pending = [idx for idx, intent in enumerate(intents) if intent is None]
+    if pending:
+        model_id = settings.BEDROCK_NOVA_MODEL_ID or "us.amazon.nova-2-lite-v1:0"
+        pending_items = [line_items[idx] for idx in pending]
+        cache_key = rfp_intent_key(
+            {"line_items": pending_items, "rfp": rfp_data},
+            model_id,
+            _LINE_ITEM_PROMPT_VERSION,
+        )
+        extracted: Optional[list[QueryIntent]] = None
+
+        cached = await get_cached_intent(cache_key)
+        if cached is not None:
+            print("[search-batch] intent cache hit")
+            extracted = [QueryIntent(**i) for i in cached["items"]]
+        else:
+            try:
+                llm = llm_gateway.chat_model(model_id, temperature=0)
+                structured_llm = llm.with_structured_output(schema=LineItemIntents)
+                numbered = "\n".join(
+                    f"{n}. {item}" for n, item in enumerate(pending_items, start=1)
+                )
+                context = json.dumps(
+                    {
+                        k: rfp_data[k]
+                        for k in ("projectName", "qualityStandards", "deliveryTimeline")
+                        if rfp_data.get(k)
+                    },
+                    indent=2,
+                )
+                prompt = f"""You are a procurement search expert. For EACH numbered RFP line item
+below, extract a vendor search intent. Return exactly {len(pending_items)} items, in the same order.
+
+Use the exact product/service terms of each line item. Apply RFP-wide requirements
+(quality standards, location) from the context to every item where relevant.
+
+RFP context:
+{context}
+
+Line items:
+{numbered}
+
+For each item fill in the QueryIntent:
+- products: the specific products or services of that line item.
+- location: city or region if specified, otherwise null.
+- certifications: required certifications/standards for that item.
+- vendor_type: "manufacturer", "service_provider", "distributor" etc.
+- min_estd / max_estd: establishment-year bounds only if years in business are required, otherwise null.
+- keywords: 4-8 specific technical keywords for the item.
+- search_text: a precise 6-12 word search phrase for the item. NO generic words.
+"""
+                result = await llm_gateway.ainvoke(structured_llm, prompt, model_id)
+                if len(result.items) != len(pending_items):
+                    raise ValueError(
+                        f"expected {len(pending_items)} intents, got {len(result.items)}"
+                    )
+                extracted = result.items
+                await store_intent(
+                    cache_key,
+                    "rfp_items",
+                    {"items": [i.model_dump() for i in extracted]},
+                )
+            except Exception as e:
+                print(f"[search-batch] line item decomposition failed: {e}")
+
+        for n, idx in enumerate(pending):
+            intents[idx] = (
+                extracted[n]
+                if extracted
+                else _fallback_line_item_intent(line_items[idx], rfp_data)
+            )
+
+    print(
+        f"[search-batch] {len(line_items)} line item intent(s), "
+        f"{len(line_items) - len(pending)} via fast path"
+    )
+    return intents
+
+
+async def search_vendors_batch(
+    intents: list[QueryIntent], top_n: int = settings.VENDOR_SEARCH_TOP_N
+) -> list[list[dict]]:
+    """
+    Hybrid search for several intents at once.
+
+    Query embeddings are generated concurrently and every item's kNN and BM25
+    bodies go to OpenSearch in a single _msearch round trip; each item is
+    then fused and shaped exactly like search_vendors_hybrid (client-side RRF
+    regardless of VENDOR_SEARCH_ENGINE, except that the in-process mirror
+    answers when the engine is "local").  If the batched request fails the
+    items fall back to individual search_vendors_hybrid calls.
+    """
+    import traceback
+
+    if not intents:
+        return []
+    candidates = top_n * settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER
+    vec_min_score = settings.VENDOR_SEARCH_VECTOR_MIN_SCORE
+
+    knn_filters = [_build_knn_filter(i) for i in intents]
+
+    if settings.VENDOR_SEARCH_ENGINE == "local" and vendor_mirror.ready:
+        phase_hits = await asyncio.gather(
+            *(
+                _retrieve_from_mirror(
+                    i,
+                    i.search_text,
+                    candidates,
+                    vec_min_score,
+                    f,
+                    _vector_candidates(top_n, f),
+                )
+                for i, f in zip(intents, knn_filters)
+            )
+        )
+        return [_rank_hits(vec, kw, top_n) for vec, kw in phase_hits]
+
+    if any(knn_filters) and not await knn_filters_available():
+        knn_filters = [None] * len(intents)
+
+    embeddings = await asyncio.gather(
+        *(asyncio.to_thread(generate_embedding, i.search_text) for i in intents),
+        return_exceptions=True,
+    )
+
+    bodies: list[dict] = []
+    slots: list[tuple[int, str]] = []  # (item index, phase) per body
+    for idx, (intent, embedding) in enumerate(zip(intents, embeddings)):
+        bodies.append(_build_keyword_search_body(intent, candidates))
+        slots.append((idx, "keyword"))
+        if isinstance(embedding, Exception):
+            print(f"[search-batch] embedding failed for item {idx}: {embedding}")
+            continue
+        knn_filter = knn_filters[idx]
+        bodies.append(
+            _build_vector_search_body(
+                embedding,
+                _vector_candidates(top_n, knn_filter),
+                vec_min_score,
+                knn_filter,
+            )
+        )
+        slots.append((idx, "vector"))
+
+    try:
+        client = get_opensearch_client()
+        with timed("msearch"):
+            responses = await _msearch(client, VENDOR_INDEX_NAME, bodies)
+    except Exception as e:
+        print(f"[search-batch] msearch failed, searching items individually: {e}")
+        traceback.print_exc()
+        return await asyncio.gather(
+            *(search_vendors_hybrid(intent=i, top_n=top_n) for i in intents)
+        )
+
+    hits: list[dict[str, dict]] = [{"vector": {}, "keyword": {}} for _ in intents]
+    for (idx, phase), response in zip(slots, responses):
+        if "error" in response:
+            print(f"[search-batch] item {idx} {phase} phase failed: {response['error']}")
+            continue
+        hits[idx][phase] = _collect_hits(response, phase)
+    print(f"[search-batch] msearch: {len(bodies)} bodies for {len(intents)} item(s)")
+
+    return [_rank_hits(h["vector"], h["keyword"], top_n) for h in hits]
+
+
+def rank_vendor_coverage(item_results: list[list[dict]]) -> list[dict]:
+    """
+    Cross-item ranking: vendors matching the most line items first, ties
+    broken by their mean final_score over the items they matched.
+    """
+    coverage: dict[str, dict] = {}
+    for idx, results in enumerate(item_results):
+        for r in results:
+            entry = coverage.setdefault(
+                r["vendor_id"],
+                {
+                    "vendor_id": r["vendor_id"],
+                    "vendor_name": r["vendor_name"],
+                    "location": r.get("location", ""),
+                    "covered_items": [],
+                    "_scores": [],
+                },
+            )
+            if idx not in entry["covered_items"]:
+                entry["covered_items"].append(idx)
+                entry["_scores"].append(r["final_score"])
+
+    total = len(item_results) or 1
+    ranked = []
+    for entry in coverage.values():
+        scores = entry.pop("_scores")
+        entry["coverage"] = round(len(entry["covered_items"]) / total, 4)
+        entry["average_score"] = round(sum(scores) / len(scores), 4)
+        ranked.append(entry)
+    ranked.sort(key=lambda e: (-len(e["covered_items"]), -e["average_score"]))
+    return ranked
+
+
 async def search_external_vendors(query: str, num_results: int = 10):
     """
     Search for vendors using Exa AI search and OpenSearch local DB.
@@ -535,7 +1317,7 @@ async def search_external_vendors(query: str, num_results: int = 10):
 
     # 1. Search local OpenSearch
     try:
-        os_client = _get_opensearch_client()
+        os_client = get_opensearch_client()
         query_embedding = await asyncio.to_thread(generate_embedding, query)
 
         search_body = {
@@ -543,7 +1325,7 @@ async def search_external_vendors(query: str, num_results: int = 10):
             "query": {
                 "knn": {
                     "embedding": {
-                        "vector": query_embedding,
+                        "vector": encode_vector(query_embedding),
                         "k": num_results,
                     }
                 }
@@ -551,7 +1333,7 @@ async def search_external_vendors(query: str, num_results: int = 10):
             "_source": {"excludes": ["embedding"]},
         }
 
-        os_response = os_client.search(index=VENDOR_INDEX_NAME, body=search_body)
+        os_response = await os_client.search(index=VENDOR_INDEX_NAME, body=search_body)
 
         for hit in os_response["hits"]["hits"]:
             source = hit["_source"]
@@ -572,7 +1354,7 @@ async def search_external_vendors(query: str, num_results: int = 10):
                     "name": source.get("vendor_name", ""),
                     "url": source.get("website", ""),
                     "description": "\n".join(desc_parts),
-                    "relevancy_score": hit["_score"],
+                    "relevancy_score": knn_score_to_similarity(hit["_score"]),
                     "source": "internal",
                 }
             )
@@ -600,60 +1382,85 @@ async def search_external_vendors(query: str, num_results: int = 10):
     return results
 
 
+_gemini_latency = LatencyWindow()
+
+
+def _hedge_delay() -> Optional[float]:
+    """Seconds to wait before hedging the Gemini phase (None = don't hedge)."""
+    if not settings.SEARCH_HEDGE_ENABLED:
+        return None
+    observed = _gemini_latency.percentile(settings.SEARCH_HEDGE_PERCENTILE)
+    if observed is None:
+        return None
+    return max(observed, settings.SEARCH_HEDGE_MIN_DELAY_MS / 1000)
+
+
+@timed_call("external")
 async def search_gemini_vendors(query: str, num_results: int = 5) -> list[dict]:
     """
     Search for external vendors using Gemini Search and structured output via Langchain.
+
+    With SEARCH_HEDGE_ENABLED a second attempt is started once the first runs
+    past the recent p95 (see app.core.budget.hedged).  Errors are raised
+    inside the hedge, so a fast failure neither wins over a slower attempt nor
+    counts towards the latency window, and become an empty result here.
     """
-    try:
-        api_key = settings.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            print("[search] GEMINI_API_KEY not configured. Skipping Gemini Search.")
-            return []
+    api_key = settings.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("[search] GEMINI_API_KEY not configured. Skipping Gemini Search.")
+        return []
 
-        llm = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            temperature=0,
-            api_key=api_key,
+    try:
+        return await hedged(
+            lambda: _search_gemini_vendors_once(query, num_results),
+            hedge_after=_hedge_delay(),
+            window=_gemini_latency,
         )
-        structured_llm = llm.with_structured_output(schema=GeminiVendorList)
-
-        prompt = f"""
-        Find {num_results} actual {query}.
-        Use your internal knowledge and search to find their details. Do NOT return directory sites like Indiamart or Justdial.
-        """
-
-        response = await structured_llm.ainvoke(prompt)
-
-        if not response or not response.vendors:
-            print("[search] Gemini returned empty structured response")
-            return []
-
-        results = []
-        for i, v in enumerate(response.vendors):
-            results.append(
-                {
-                    "vendor_id": f"gemini_{i}",
-                    "vendor_name": v.vendor_name,
-                    "source": "external",
-                    "description": v.description or "",
-                    "location": v.location or "",
-                    "products": v.products or [],
-                    "certificates": [],
-                    "certificate_details": [],
-                    "website": v.website or "",
-                    "contact_email": v.contact_email or "",
-                    "mobile": v.mobile or "",
-                    "estd": v.estd,
-                    "final_score": round(0.9 - (i * 0.05), 4),
-                    "keyword_score": 0.0,
-                    "vector_score": 0.0,
-                }
-            )
-        print(f"[search] Gemini phase: {len(results)} structured hits")
-        return results
     except Exception as e:
         import traceback
 
         print(f"[search] Gemini phase structured json compilation failed: {e}")
         traceback.print_exc()
         return []
+
+
+async def _search_gemini_vendors_once(query: str, num_results: int) -> list[dict]:
+    llm = llm_gateway.gemini_model()
+    structured_llm = llm.with_structured_output(schema=GeminiVendorList)
+
+    prompt = f"""
+    Find {num_results} actual {query}.
+    Use your internal knowledge and search to find their details. Do NOT return directory sites like Indiamart or Justdial.
+    """
+
+    response = await llm_gateway.ainvoke(
+        structured_llm, prompt, settings.GEMINI_MODEL
+    )
+
+    if not response or not response.vendors:
+        print("[search] Gemini returned empty structured response")
+        return []
+
+    results = []
+    for i, v in enumerate(response.vendors):
+        results.append(
+            {
+                "vendor_id": f"gemini_{i}",
+                "vendor_name": v.vendor_name,
+                "source": "external",
+                "description": v.description or "",
+                "location": v.location or "",
+                "products": v.products or [],
+                "certificates": [],
+                "certificate_details": [],
+                "website": v.website or "",
+                "contact_email": v.contact_email or "",
+                "mobile": v.mobile or "",
+                "estd": v.estd,
+                "final_score": round(0.9 - (i * 0.05), 4),
+                "keyword_score": 0.0,
+                "vector_score": 0.0,
+            }
+        )
+    print(f"[search] Gemini phase: {len(results)} structured hits")
+    return results
@@ -0,0 +1,148 @@
+"""
+Versioned result cache for `search_vendors_hybrid`.
+
+Fully shaped result lists are cached under a hash of the `QueryIntent`,
+`top_n` and every setting that influences retrieval or fusion.  Each entry
+records the vendor-index version it was computed against; the version is
+bumped on every vendor index write (`index_vendor_to_opensearch`,
+`reindex_all_vendors`, `rebuild_vendor_index`), which invalidates all entries
+at once without scanning the cache.
+
+The version is the last change of the shared Postgres change log that this
+process has applied (app.services.index_sync, checked at most once per
+SEARCH_INDEX_VERSION_TTL_SECONDS), so writes made by other uvicorn workers
+or job workers invalidate this process's entries too, once its mirror has
+caught up.  A local counter is folded in so this process's own writes take
+effect immediately, even when the log could not be written.
+
+Stale-while-revalidate: an entry whose version is out of date but which is
+younger than SEARCH_RESULT_CACHE_STALE_SECONDS is still served while a single
+background task recomputes it, so latency stays flat during reindexes.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services import index_sync
+
+_version_lock = threading.Lock()
+_local_bumps = 0
+
+_results = LRUCache(
+    max_entries=settings.SEARCH_RESULT_CACHE_ENTRIES,
+    ttl_seconds=settings.SEARCH_RESULT_CACHE_TTL_SECONDS,
+)
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+_counters = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+
+def vendor_index_version() -> tuple[int, int]:
+    """The last version seen by this process (no database round trip)."""
+    return index_sync.applied_seq(), _local_bumps
+
+
+async def current_vendor_index_version() -> tuple[int, int]:
+    return await index_sync.sync_vendor_index(), _local_bumps
+
+
+async def bump_vendor_index_version(
+    vendor_ids: Optional[Iterable[str]] = None,
+) -> tuple[int, int]:
+    """
+    Invalidate every cached search result, here and in every other process
+    (called on vendor index writes).  `vendor_ids` names the vendors written;
+    None means the whole index changed.
+    """
+    global _local_bumps
+    with _version_lock:
+        _local_bumps += 1
+    await asyncio.to_thread(index_sync.record_vendor_index_change, vendor_ids)
+    return vendor_index_version()
+
+
+def search_cache_key(intent_json: str, top_n: int) -> str:
+    """Hash of the intent, result size and all retrieval/fusion settings."""
+    payload = {
+        "intent": json.loads(intent_json),
+        "top_n": top_n,
+        "engine": settings.VENDOR_SEARCH_ENGINE,
+        "multiplier": settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER,
+        "min_score": settings.VENDOR_SEARCH_VECTOR_MIN_SCORE,
+        "rrf_k": settings.VENDOR_SEARCH_RRF_K,
+        "rrf_weights": settings.VENDOR_SEARCH_RRF_WEIGHTS,
+        "score_aware": settings.VENDOR_SEARCH_SCORE_AWARE_FUSION,
+        "hybrid_weights": [
+            settings.VENDOR_SEARCH_VECTOR_WEIGHT,
+            settings.VENDOR_SEARCH_KEYWORD_WEIGHT,
+        ],
+    }
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _store(key: str, version: tuple, results: list[dict]):
+    _results.set(key, (version, time.monotonic(), copy.deepcopy(results)))
+
+
+def _schedule_refresh(
+    key: str, version: tuple, compute: Callable[[], Awaitable[list[dict]]]
+):
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+
+    async def _refresh():
+        try:
+            _store(key, version, await compute())
+            _counters["refreshes"] += 1
+        except Exception as e:
+            print(f"[search-cache] background refresh failed: {e}")
+        finally:
+            _refreshing.discard(key)
+
+    task = asyncio.create_task(_refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def cached_search(
+    key: str, compute: Callable[[], Awaitable[list[dict]]]
+) -> list[dict]:
+    """Return cached results for `key`, computing (or revalidating) as needed."""
+    if not settings.SEARCH_RESULT_CACHE_ENABLED:
+        return await compute()
+
+    version = await current_vendor_index_version()
+    entry: Optional[tuple] = _results.get(key)
+    if entry is not None:
+        cached_version, stored_at, results = entry
+        if cached_version == version:
+            _counters["fresh_hits"] += 1
+            return copy.deepcopy(results)
+        age = time.monotonic() - stored_at
+        if age <= settings.SEARCH_RESULT_CACHE_STALE_SECONDS:
+            _counters["stale_hits"] += 1
+            _schedule_refresh(key, version, compute)
+            return copy.deepcopy(results)
+
+    _counters["misses"] += 1
+    results = await compute()
+    _store(key, version, results)
+    return results
+
+
+def search_cache_stats() -> dict:
+    return {
+        **_counters,
+        "vendor_index_version": list(vendor_index_version()),
+        "refreshing": len(_refreshing),
+        "memory": _results.stats(),
+    }
@@ -0,0 +1,163 @@
+"""
+Typeahead suggestions over the vendor vocabulary.
+
+Product names, certificate names and locations (see
+app.services.vendor_vocabulary) are kept in one sorted Python list of
+(key, kind, term) tuples.  A prefix lookup is a `bisect` to the first key
+≥ prefix followed by a short forward scan, so `/api/search/suggest` answers
+in well under a millisecond without touching the database or OpenSearch.
+
+Every word of a multi-word term is indexed as well ("pipes" → "MS Steel
+Pipes"); matches at the start of a term rank above mid-term matches, then by
+the number of vendors carrying the term.
+
+Vendor create / bulk upload insert new terms in place (`bisect.insort`);
+reindex rebuilds the whole index.  Vendor counts only grow between rebuilds,
+so updating a vendor can over-count its terms until the next reindex.
+"""
+
+import bisect
+import threading
+from typing import Iterable, Optional
+
+from app.core.database import SessionLocal
+from app.services.vendor_vocabulary import harvest_vendor_terms, static_terms
+
+# Upper bound on candidates inspected per lookup (short prefixes match a lot)
+_MAX_SCAN = 512
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class SuggestIndex:
+    """Sorted-array prefix index with per-term vendor counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (key, kind, normalised term), sorted
+        self._keys: list[tuple[str, str, str]] = []
+        # (kind, normalised term) -> [display text, vendor count]
+        self._terms: dict[tuple[str, str], list] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, kind: str, text: str, vendor_count: int = 1):
+        term = _normalize(text)
+        if len(term) < 2:
+            return
+        with self._lock:
+            entry = self._terms.get((kind, term))
+            if entry is not None:
+                entry[1] += vendor_count
+                return
+            self._terms[(kind, term)] = [" ".join(text.split()), vendor_count]
+            words = term.split(" ")
+            keys = {term} | {" ".join(words[i:]) for i in range(1, len(words))}
+            for key in keys:
+                bisect.insort(self._keys, (key, kind, term))
+
+    def add_terms(self, terms: Iterable[tuple[str, str]], vendor_count: int = 1):
+        for kind, text in terms:
+            self.add(kind, text, vendor_count)
+
+    def _bulk_load(
+        self, terms: Iterable[tuple[str, str]], static: Iterable[tuple[str, str]]
+    ):
+        """Build without per-insert sorting (startup / full rebuild)."""
+        for kind, text in static:
+            term = _normalize(text)
+            if len(term) >= 2:
+                self._terms.setdefault((kind, term), [" ".join(text.split()), 0])
+        for kind, text in terms:
+            term = _normalize(text)
+            if len(term) < 2:
+                continue
+            entry = self._terms.setdefault((kind, term), [" ".join(text.split()), 0])
+            entry[1] += 1
+        keys = []
+        for kind, term in self._terms:
+            words = term.split(" ")
+            for key in {term} | {" ".join(words[i:]) for i in range(1, len(words))}:
+                keys.append((key, kind, term))
+        keys.sort()
+        self._keys = keys
+
+    def suggest(
+        self, prefix: str, limit: int = 8, kinds: Optional[set[str]] = None
+    ) -> list[dict]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (prefix,))
+            seen: dict[tuple[str, str], bool] = {}
+            for key, kind, term in self._keys[start : start + _MAX_SCAN]:
+                if not key.startswith(prefix):
+                    break
+                if kinds and kind not in kinds:
+                    continue
+                # True when the prefix matches the start of the term itself
+                seen[(kind, term)] = seen.get((kind, term), False) or key == term
+            candidates = [
+                (kind, term, whole, *self._terms[(kind, term)])
+                for (kind, term), whole in seen.items()
+            ]
+
+        candidates.sort(key=lambda c: (not c[2], -c[4], len(c[1]), c[1]))
+        return [
+            {"text": display, "kind": kind, "vendor_count": count}
+            for kind, _term, _whole, display, count in candidates[:limit]
+        ]
+
+
+_index = SuggestIndex()
+_build_lock = threading.Lock()
+
+
+def build_suggest_index() -> int:
+    """(Re)build the typeahead index from the vendors table and static lists."""
+    global _index
+    fresh = SuggestIndex()
+    db = SessionLocal()
+    try:
+        vendor_rows = list(harvest_vendor_terms(db, include_static=False))
+    except Exception as e:
+        print(f"⚠ Could not harvest vendor vocabulary for suggestions: {e}")
+        vendor_rows = []
+    finally:
+        db.close()
+    fresh._bulk_load(vendor_rows, static_terms())
+    fresh.ready = True
+    _index = fresh
+    return len(fresh)
+
+
+def suggest_index_ready() -> bool:
+    return _index.ready
+
+
+def get_suggest_index() -> SuggestIndex:
+    if not _index.ready:
+        with _build_lock:
+            if not _index.ready:
+                build_suggest_index()
+    return _index
+
+
+def add_vendor_terms(terms: Iterable[tuple[str, str]]):
+    """Fold a new or updated vendor's vocabulary into the live index."""
+    if _index.ready:
+        _index.add_terms(terms)
+
+
+def warm_suggest_index():
+    """Build the typeahead index at startup (called from the app lifespan)."""
+    try:
+        count = build_suggest_index()
+        print(f"✓ Typeahead index ready ({count} terms)")
+    except Exception as e:
+        print(f"⚠ Could not build typeahead index: {e}")
@@ -1,15 +1,9 @@
 import asyncio
-import boto3
-from app.core.config import settings
+from app.core.aws import aws_client
 
 
 def get_translate_client():
-    return boto3.client(
-        service_name="translate",
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
+    return aws_client("translate")
 
 
 async def translate_text(
@@ -0,0 +1,312 @@
+"""
+In-process mirror of the vendor OpenSearch index.
+
+Holds every vendor document from VENDOR_INDEX_NAME in memory: embeddings as a
+contiguous, L2-normalised float32 NumPy matrix searched by brute-force cosine
+similarity, and a compact per-field inverted index over products, certificates,
+location and vendor name scored with BM25.  `search_vendors_hybrid` can answer
+entirely from the mirror (VENDOR_SEARCH_ENGINE=local) or fall back to it when
+OpenSearch is unreachable.
+
+The mirror is bulk-loaded from OpenSearch at startup and kept in sync
+incrementally by `index_vendor_to_opensearch`, and by app.services.index_sync
+for writes made in other processes.  Hit dicts use the same
+{vendor_id: {"source", "score"}} shape and score scales as the OpenSearch
+phases (vector score = 1 + cosine, keyword score = BM25) so fusion and result
+shaping are shared.
+"""
+
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field → source keys that feed it
+_FIELDS = {
+    "products": ("products",),
+    "certificates": ("certificates",),
+    "location": ("location",),
+    "vendor_name": ("vendor_name",),
+}
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _field_text(source: dict, keys: tuple[str, ...]) -> str:
+    parts = []
+    for key in keys:
+        value = source.get(key)
+        if isinstance(value, list):
+            parts.extend(str(v) for v in value if v)
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+class VendorMirror:
+    """Thread-safe in-memory vector + BM25 index over vendor documents."""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        self._initial_capacity = initial_capacity
+        self._ids: list[Optional[str]] = []
+        self._sources: list[Optional[dict]] = []
+        self._row_of: dict[str, int] = {}
+        self._free_rows: list[int] = []
+        # field -> term -> {row: term frequency}
+        self._postings: dict[str, dict[str, dict[int, int]]] = {
+            f: defaultdict(dict) for f in _FIELDS
+        }
+        # field -> row -> field length in tokens
+        self._field_len: dict[str, dict[int, int]] = {f: {} for f in _FIELDS}
+        self._field_len_total: dict[str, int] = {f: 0 for f in _FIELDS}
+        self.ready = False
+
+    # ── Maintenance ─────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _swap(self, fresh: "VendorMirror"):
+        with self._lock:
+            self.__dict__.update(
+                {k: v for k, v in fresh.__dict__.items() if k != "_lock"}
+            )
+
+    def clear(self):
+        """Empty the mirror (e.g. when the vendor index is dropped and rebuilt)."""
+        fresh = VendorMirror(self._initial_capacity)
+        # An empty mirror of an empty index is still authoritative
+        fresh.ready = True
+        self._swap(fresh)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._matrix.shape[0]:
+            return
+        capacity = max(rows, self._initial_capacity, self._matrix.shape[0] * 2)
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[: self._matrix.shape[0]] = self._matrix
+        active = np.zeros(capacity, dtype=bool)
+        active[: self._active.shape[0]] = self._active
+        self._matrix = matrix
+        self._active = active
+
+    def _unindex_terms(self, row: int):
+        for field in _FIELDS:
+            length = self._field_len[field].pop(row, 0)
+            self._field_len_total[field] -= length
+        source = self._sources[row] or {}
+        for field, keys in _FIELDS.items():
+            for term in set(_tokenize(_field_text(source, keys))):
+                postings = self._postings[field].get(term)
+                if postings is not None:
+                    postings.pop(row, None)
+                    if not postings:
+                        del self._postings[field][term]
+
+    def _index_terms(self, row: int, source: dict):
+        for field, keys in _FIELDS.items():
+            tokens = _tokenize(_field_text(source, keys))
+            self._field_len[field][row] = len(tokens)
+            self._field_len_total[field] += len(tokens)
+            counts: dict[str, int] = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for term, tf in counts.items():
+                self._postings[field][term][row] = tf
+
+    def upsert(self, vendor_id: str, source: dict, embedding: Optional[list[float]]):
+        """Insert or replace one vendor document (source must exclude the embedding)."""
+        source = {k: v for k, v in source.items() if k != "embedding"}
+        with self._lock:
+            row = self._row_of.get(vendor_id)
+            if row is not None:
+                self._unindex_terms(row)
+            else:
+                row = self._free_rows.pop() if self._free_rows else len(self._ids)
+                if row == len(self._ids):
+                    self._ids.append(None)
+                    self._sources.append(None)
+                self._row_of[vendor_id] = row
+
+            self._ids[row] = vendor_id
+            self._sources[row] = source
+            self._index_terms(row, source)
+
+            if embedding:
+                vec = np.asarray(embedding, dtype=np.float32)
+                if self._dim is None:
+                    self._dim = vec.shape[0]
+                    self._matrix = np.zeros((0, self._dim), dtype=np.float32)
+                if vec.shape[0] == self._dim:
+                    norm = float(np.linalg.norm(vec))
+                    self._ensure_capacity(row + 1)
+                    self._matrix[row] = vec / norm if norm else vec
+                    self._active[row] = True
+            elif row < self._active.shape[0]:
+                self._active[row] = False
+
+    def remove(self, vendor_id: str):
+        with self._lock:
+            row = self._row_of.pop(vendor_id, None)
+            if row is None:
+                return
+            self._unindex_terms(row)
+            self._ids[row] = None
+            self._sources[row] = None
+            if row < self._active.shape[0]:
+                self._active[row] = False
+                self._matrix[row] = 0.0
+            self._free_rows.append(row)
+
+    async def load_from_opensearch(self, client, index: str) -> int:
+        """Replace the mirror contents with a full scan of `index`."""
+        from opensearchpy import helpers
+
+        fresh = VendorMirror(self._initial_capacity)
+        async for hit in helpers.async_scan(
+            client, index=index, query={"query": {"match_all": {}}}
+        ):
+            source = hit["_source"]
+            vid = source.get("vendor_id") or hit["_id"]
+            fresh.upsert(vid, source, source.get("embedding"))
+        fresh.ready = True
+        self._swap(fresh)
+        return len(self)
+
+    # ── Retrieval ───────────────────────────────────────────────────────────
+
+    def vector_search(
+        self,
+        query_embedding: list[float],
+        k: int,
+        min_score: float = 0.0,
+        row_filter: Optional[Callable[[dict], bool]] = None,
+    ) -> dict[str, dict]:
+        """
+        Top-k cosine search; scores follow OpenSearch cosinesimil (1 + cosine).
+
+        `row_filter(source)` restricts hits to matching vendors, like a filter
+        inside an OpenSearch kNN query.  Candidates are checked best-first in
+        growing windows until k pass.
+        """
+        with self._lock:
+            # Rows past the matrix end were upserted without an embedding
+            n = min(len(self._ids), self._matrix.shape[0])
+            if self._dim is None or n == 0:
+                return {}
+            q = np.asarray(query_embedding, dtype=np.float32)
+            if q.shape[0] != self._dim:
+                return {}
+            norm = float(np.linalg.norm(q))
+            if norm:
+                q = q / norm
+            scores = self._matrix[:n] @ q + 1.0
+            scores[~self._active[:n]] = -np.inf
+            k = min(k, n)
+            window = k if row_filter is None else min(n, k * 4)
+            checked = 0
+            hits: dict[str, dict] = {}
+            while True:
+                top = np.argpartition(-scores, window - 1)[:window]
+                top = top[np.argsort(-scores[top])]
+                for row in top[checked:]:
+                    score = float(scores[row])
+                    if score == -np.inf or score < min_score:
+                        return hits
+                    source = self._sources[row]
+                    if row_filter is not None and not row_filter(source):
+                        continue
+                    hits[self._ids[row]] = {"source": source, "score": score}
+                    if len(hits) >= k:
+                        return hits
+                if window >= n:
+                    return hits
+                checked = window
+                window = min(n, window * 4)
+
+    def keyword_search(
+        self, weighted_terms: list[tuple[str, str, float]], k: int
+    ) -> dict[str, dict]:
+        """
+        BM25 over the mirrored fields.
+
+        `weighted_terms` is a list of (field, text, boost); each text is
+        tokenised and scored against its field, mirroring the should-clauses
+        of the OpenSearch keyword query.
+        """
+        with self._lock:
+            n_docs = len(self._row_of)
+            if not n_docs:
+                return {}
+            scores: dict[int, float] = defaultdict(float)
+            for field, text, boost in weighted_terms:
+                postings_by_term = self._postings.get(field)
+                if postings_by_term is None:
+                    continue
+                avg_len = (self._field_len_total[field] / n_docs) or 1.0
+                lengths = self._field_len[field]
+                for term in set(_tokenize(text)):
+                    postings = postings_by_term.get(term)
+                    if not postings:
+                        continue
+                    df = len(postings)
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    for row, tf in postings.items():
+                        norm = 1 - _BM25_B + _BM25_B * lengths.get(row, 0) / avg_len
+                        scores[row] += (
+                            boost * idf * tf * (_BM25_K1 + 1) / (tf + _BM25_K1 * norm)
+                        )
+            ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+            return {
+                self._ids[row]: {"source": self._sources[row], "score": score}
+                for row, score in ranked
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "vendors": len(self._row_of),
+                "dimensions": self._dim,
+                "matrix_bytes": int(self._matrix.nbytes),
+                "terms": sum(len(p) for p in self._postings.values()),
+            }
+
+
+vendor_mirror = VendorMirror()
+
+
+def mirror_enabled() -> bool:
+    return settings.VENDOR_MIRROR_ENABLED or settings.VENDOR_SEARCH_ENGINE == "local"
+
+
+async def warm_vendor_mirror():
+    """Bulk-load the mirror from OpenSearch (called from the app lifespan)."""
+    if not mirror_enabled():
+        return
+    try:
+        from app.core.opensearch import get_opensearch_client
+        from app.services.documents import VENDOR_INDEX_NAME
+
+        count = await vendor_mirror.load_from_opensearch(
+            get_opensearch_client(), VENDOR_INDEX_NAME
+        )
+        print(f"✓ Loaded {count} vendor(s) into the in-process mirror")
+    except Exception as e:
+        print(f"⚠ Could not load vendor mirror: {e}")
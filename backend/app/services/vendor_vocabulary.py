@@ -0,0 +1,116 @@
+"""
+Vendor vocabulary harvested from the `vendors` table.
+
+Products, certificates and locations stored on Vendor rows, plus static lists
+of Indian states/cities and common procurement certifications, feed the
+in-memory query tooling (the gazetteer query parser and typeahead).
+"""
+
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.models.domain import Vendor
+
+PRODUCT = "product"
+CERTIFICATION = "certification"
+LOCATION = "location"
+
+INDIAN_STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh",
+    "Goa", "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka",
+    "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim",
+    "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand",
+    "West Bengal", "Andaman and Nicobar Islands", "Chandigarh",
+    "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Jammu and Kashmir",
+    "Ladakh", "Lakshadweep", "Puducherry",
+]  # fmt: skip
+
+INDIAN_CITIES = [
+    "Mumbai", "Delhi", "New Delhi", "Bengaluru", "Bangalore", "Hyderabad",
+    "Ahmedabad", "Chennai", "Kolkata", "Surat", "Pune", "Jaipur", "Lucknow",
+    "Kanpur", "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam",
+    "Pimpri-Chinchwad", "Patna", "Vadodara", "Ghaziabad", "Ludhiana", "Agra",
+    "Nashik", "Faridabad", "Meerut", "Rajkot", "Varanasi", "Srinagar",
+    "Aurangabad", "Dhanbad", "Amritsar", "Navi Mumbai", "Prayagraj", "Ranchi",
+    "Howrah", "Coimbatore", "Jabalpur", "Gwalior", "Vijayawada", "Jodhpur",
+    "Madurai", "Raipur", "Kota", "Guwahati", "Solapur", "Mysuru", "Mysore",
+    "Noida", "Gurugram", "Gurgaon", "Bhubaneswar", "Kochi", "Cochin",
+    "Thiruvananthapuram", "Vapi", "Ankleshwar", "Jamshedpur", "Hosur",
+    "Tiruppur", "Ludhiana", "Rourkela", "Bhiwandi", "Sonipat", "Manesar",
+]  # fmt: skip
+
+COMMON_CERTIFICATIONS = [
+    "ISO 9001", "ISO 14001", "ISO 45001", "ISO 27001", "ISO 22000",
+    "ISO 13485", "IATF 16949", "OHSAS 18001", "BIS", "ISI", "NABL", "FSSAI",
+    "GeM", "CE", "FDA", "CMMI", "CMMI Level 3", "CMMI Level 5", "SOC 2",
+    "PCI DSS", "GDPR", "HACCP", "GMP", "WHO GMP", "MSME", "Udyam", "NSIC",
+    "GST", "RoHS", "UL", "API", "ASME", "PED", "ZED", "LEED", "BEE",
+]  # fmt: skip
+
+
+def _clean(value) -> str:
+    return " ".join(str(value).split()) if value else ""
+
+
+def location_parts(location: str) -> list[str]:
+    """'Pune, Maharashtra' → ['Pune', 'Maharashtra'] (plus the full string)."""
+    location = _clean(location)
+    if not location:
+        return []
+    parts = [p.strip() for p in location.split(",") if p.strip()]
+    return parts if len(parts) == 1 else [location, *parts]
+
+
+def location_keywords(location: str | None) -> list[str]:
+    """Lower-cased location_parts, as stored in the vendor index's location_terms."""
+    return sorted({part.lower() for part in location_parts(location)})
+
+
+def certificate_keyword(certificate: str | None) -> str:
+    """Normalised certificate name as compared by the certificates.keyword filter."""
+    return _clean(certificate).lower()
+
+
+def vendor_terms(
+    products: Iterable[str] | None,
+    certificates: Iterable[str] | None,
+    location: str | None,
+) -> Iterator[tuple[str, str]]:
+    """(kind, term) pairs contributed by one vendor's columns."""
+    # JSON columns: anything other than a list is treated as empty
+    products = products if isinstance(products, list) else []
+    certificates = certificates if isinstance(certificates, list) else []
+    for product in products:
+        if _clean(product):
+            yield PRODUCT, _clean(product)
+    for cert in certificates:
+        cert = _clean(cert)
+        # CSV uploads occasionally carry document URLs in the certificate column
+        if cert and not cert.startswith(("http://", "https://")):
+            yield CERTIFICATION, cert
+    for part in location_parts(location or ""):
+        yield LOCATION, part
+
+
+def static_terms() -> Iterator[tuple[str, str]]:
+    for state in INDIAN_STATES:
+        yield LOCATION, state
+    for city in INDIAN_CITIES:
+        yield LOCATION, city
+    for cert in COMMON_CERTIFICATIONS:
+        yield CERTIFICATION, cert
+
+
+def harvest_vendor_terms(
+    db: Session, include_static: bool = True
+) -> Iterator[tuple[str, str]]:
+    """Static terms (optionally) followed by every term stored on Vendor rows."""
+    if include_static:
+        yield from static_terms()
+    rows = db.query(Vendor.products, Vendor.certificates, Vendor.location).yield_per(
+        1000
+    )
+    for products, certificates, location in rows:
+        yield from vendor_terms(products, certificates, location)
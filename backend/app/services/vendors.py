@@ -1,24 +1,28 @@
 import asyncio
-import boto3
 import csv
 import io
+import itertools
 import uuid
+from datetime import datetime
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.aws import aws_client
 from app.core.config import settings
+from app.core import llm as llm_gateway
+from app.core.opensearch import get_opensearch_client
 from app.models.domain import Vendor, VendorDocument
-from app.services.rfp import get_bedrock_client
 import json
 from app.services.activity import log_activity
+from app.services.search_cache import bump_vendor_index_version
+from app.services.vendor_mirror import mirror_enabled, vendor_mirror
+from app.services.vendor_vocabulary import location_keywords, vendor_terms
+from app.services import query_parser, suggest
 
 
 def get_textract_client():
-    return boto3.client(
-        service_name="textract",
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    )
+    return aws_client("textract")
 
 
 async def verify_vendor_certification(document_bytes: bytes, cert_type: str) -> dict:
@@ -36,7 +40,6 @@ async def verify_vendor_certification(document_bytes: bytes, cert_type: str) ->
         )
 
         # Pass the extracted text to Bedrock for semantic validation
-        bedrock = get_bedrock_client()
         prompt = f"""
         Analyze the following extracted text from a vendor certification document.
         Target Certification Type expected: {cert_type}
@@ -48,24 +51,16 @@ async def verify_vendor_certification(document_bytes: bytes, cert_type: str) ->
         Return strictly a JSON object: {{"is_valid": true/false, "expiration_date": "YYYY-MM-DD or null", "reason": "short explanation"}}
         """
 
-        body = json.dumps(
-            {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 500,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-        )
-
-        def _invoke_br():
-            r = bedrock.invoke_model(
-                modelId=settings.BEDROCK_MODEL_ID,
-                body=body,
-                contentType="application/json",
-                accept="application/json",
-            )
-            return json.loads(r.get("body").read()).get("content", [])[0].get("text", "{}")
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 500,
+            "messages": [{"role": "user", "content": prompt}],
+        }
 
-        content = await asyncio.to_thread(_invoke_br)
+        response_body = await llm_gateway.invoke_model_json(
+            settings.BEDROCK_MODEL_ID, body
+        )
+        content = response_body.get("content", [])[0].get("text", "{}")
         return json.loads(content)
 
     except Exception as e:
@@ -115,12 +110,255 @@ def get_csv_template() -> str:
     return output.getvalue()
 
 
+def register_vendor_vocabulary(vendor: Vendor):
+    """Fold a vendor's products, certificates and location into the query
+    parser gazetteer and the typeahead index."""
+    try:
+        terms = list(vendor_terms(vendor.products, vendor.certificates, vendor.location))
+        query_parser.add_vendor_terms(terms)
+        suggest.add_vendor_terms(terms)
+    except Exception as e:
+        print(f"⚠ Could not register vocabulary for vendor {vendor.name}: {e}")
+
+
 def _split_field(value: str) -> list[str]:
     """Split a semicolon-separated field; strip whitespace; drop empties."""
     return [item.strip() for item in value.split(";") if item.strip()]
 
 
-async def bulk_create_vendors(db: Session, csv_bytes: bytes) -> dict:
+def _parse_vendor_row(row: dict) -> tuple[dict, list[str]]:
+    """Validate one CSV row; returns the Vendor column values and its document links."""
+    name = (row.get("vendor_name") or "").strip()
+    if not name:
+        raise ValueError("vendor_name is required")
+
+    estd_raw = (row.get("estd") or "").strip()
+    estd = int(estd_raw) if estd_raw else None
+
+    certs_raw = (row.get("certificates") or "").strip()
+    certs_list = _split_field(certs_raw) if certs_raw else []
+
+    certs = []
+    doc_links = []
+
+    for c in certs_list:
+        if c.startswith("http://") or c.startswith("https://"):
+            doc_links.append(c)
+        else:
+            certs.append(c)
+
+    products_raw = (row.get("products") or "").strip()
+    products = _split_field(products_raw) if products_raw else []
+
+    fields = dict(
+        name=name,
+        location=(row.get("location") or "").strip() or None,
+        estd=estd,
+        mobile=(row.get("mobile") or "").strip() or None,
+        contact_email=(row.get("email") or "").strip() or None,
+        certificates=certs or None,
+        products=products or None,
+        website=(row.get("website") or "").strip() or None,
+    )
+    return fields, doc_links
+
+
+# Columns a CSV row overwrites on an existing vendor
+_UPSERT_COLUMNS = (
+    "name",
+    "location",
+    "estd",
+    "mobile",
+    "contact_email",
+    "certificates",
+    "products",
+    "website",
+)
+
+
+def _upsert_vendor_values(db: Session, values: list[dict]) -> dict[str, tuple[str, bool]]:
+    """
+    INSERT … ON CONFLICT (lower(name)) DO UPDATE for a set of vendors in one
+    statement.  Returns {lower(name): (vendor id, inserted)}.
+    """
+    now = datetime.utcnow()
+    stmt = pg_insert(Vendor).values(
+        [dict(fields, id=str(uuid.uuid4()), created_at=now) for fields in values]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(Vendor.name)],
+        set_={column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+    ).returning(Vendor.id, Vendor.name, literal_column("xmax = 0").label("inserted"))
+    return {
+        name.lower(): (vendor_id, inserted)
+        for vendor_id, name, inserted in db.execute(stmt)
+    }
+
+
+def _upsert_vendor_chunk(
+    db: Session, parsed: list[tuple[int, dict, list[str]]], summary: dict
+) -> list[tuple[Vendor, list[VendorDocument]]]:
+    """
+    Upsert a chunk of validated rows and replace their documents, using a
+    handful of statements for the whole chunk.  Returns each upserted vendor
+    with its new documents, ready for ingestion.
+    """
+    # A name repeated within the chunk is upserted once, from its last row
+    latest: dict[str, tuple[dict, list[str]]] = {}
+    row_numbers: dict[str, list[int]] = {}
+    for i, fields, doc_links in parsed:
+        key = fields["name"].lower()
+        latest[key] = (fields, doc_links)
+        row_numbers.setdefault(key, []).append(i)
+    if not latest:
+        return []
+
+    db.flush()
+    try:
+        with db.begin_nested():
+            upserted = _upsert_vendor_values(db, [fields for fields, _ in latest.values()])
+    except Exception:
+        # Find the offending row(s) so errors are still reported per row
+        upserted = {}
+        for key, (fields, _) in latest.items():
+            try:
+                with db.begin_nested():
+                    upserted.update(_upsert_vendor_values(db, [fields]))
+            except Exception as exc:
+                for i in row_numbers[key]:
+                    summary["failed"] += 1
+                    summary["errors"].append({"row": i, "error": str(exc)})
+
+    for key, (_, inserted) in upserted.items():
+        # Earlier rows for the same name count as updates, as if applied in order
+        summary["created" if inserted else "updated"] += 1
+        summary["updated"] += len(row_numbers[key]) - 1
+
+    vendor_ids = [vendor_id for vendor_id, _ in upserted.values()]
+    # Old documents are replaced by the ones listed in the CSV
+    db.query(VendorDocument).filter(VendorDocument.vendor_id.in_(vendor_ids)).delete(
+        synchronize_session="fetch"
+    )
+    vendors = {
+        vendor.id: vendor
+        for vendor in db.query(Vendor)
+        .filter(Vendor.id.in_(vendor_ids))
+        .execution_options(populate_existing=True)
+    }
+
+    batch = []
+    for key, (vendor_id, _) in upserted.items():
+        docs = [
+            VendorDocument(
+                id=str(uuid.uuid4()),
+                vendor_id=vendor_id,
+                document_url=link,
+                processing_status="completed",
+            )
+            for link in latest[key][1]
+        ]
+        db.add_all(docs)
+        summary["documents_queued"] += len(docs)
+        batch.append((vendors[vendor_id], docs))
+    db.flush()
+    return batch
+
+
+async def _ingest_vendor_batch(batch: list[tuple[Vendor, list[VendorDocument]]]):
+    """
+    Download and summarise the batch's documents, then embed and index its
+    vendors, each through the staged pipeline (app.services.ingestion).  The
+    pipeline sinks are the only code touching the ORM objects.
+    """
+    from app.services.documents import (
+        apply_summary,
+        download_stage,
+        extract_stage,
+        release_download,
+    )
+    from app.services.ingestion import (
+        IngestItem,
+        Stage,
+        run_pipeline,
+        stage_concurrency,
+    )
+
+    summaries: dict[str, dict] = {}
+
+    def record_document(item: IngestItem):
+        doc = item.key
+        if "summary" not in item.state:
+            doc.processing_status = "failed"
+            doc.error_message = str(item.state.get("warning") or item.error)
+            return
+        details = dict(item.state["summary"], document_url=doc.document_url)
+        summaries[doc.id] = details
+        apply_summary(doc, details)
+
+    await run_pipeline(
+        (
+            IngestItem(key=doc, state={"url": doc.document_url})
+            for _, docs in batch
+            for doc in docs
+        ),
+        [
+            Stage("download", download_stage, stage_concurrency("download")),
+            Stage("extract", extract_stage, stage_concurrency("extract")),
+        ],
+        record_document,
+        release=release_download,
+    )
+
+    vendor_items = []
+    for vendor, docs in batch:
+        # Certificate details in the order the links were listed
+        details = [summaries[doc.id] for doc in docs if doc.id in summaries]
+        embed_text, body = _vendor_index_source(vendor, details)
+        vendor_items.append(
+            IngestItem(key=vendor, state={"text": embed_text, "body": body})
+        )
+
+    indexed: list[str] = []
+
+    def record_vendor(item: IngestItem):
+        vendor = item.key
+        if item.error:
+            print(f"⚠ Could not index vendor {vendor.name} to OpenSearch: {item.error}")
+        else:
+            print(f"✓ Indexed vendor {vendor.name} to OpenSearch")
+            indexed.append(vendor.id)
+        register_vendor_vocabulary(vendor)
+
+    try:
+        await run_pipeline(
+            vendor_items,
+            [
+                Stage("embed", _embed_vendor_stage, stage_concurrency("embed")),
+                Stage("index", _index_vendor_stage, stage_concurrency("index")),
+            ],
+            record_vendor,
+        )
+    finally:
+        # One change-log entry per batch, including a batch cut short
+        if indexed:
+            await bump_vendor_index_version(indexed)
+
+
+def _commit_keeping_state(db: Session):
+    """Commit without expiring loaded objects (the batch is still read afterwards)."""
+    expire, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire
+
+
+async def bulk_create_vendors(
+    db: Session,
+    csv_bytes: bytes,
+    progress: Optional[dict] = None,
+    on_progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
     """
     Parse CSV bytes and upsert Vendor rows (matched by vendor_name).
 
@@ -130,229 +368,182 @@ async def bulk_create_vendors(db: Session, csv_bytes: bytes) -> dict:
 
     Multi-value fields (certificates, products, document_links) use
     semicolons as separator.
-    Returns a summary dict: {total, created, updated, failed, documents_queued, errors}.
+    Returns a summary dict: {total, processed, created, updated, failed,
+    documents_queued, errors}.
+
+    The CSV is decoded and parsed as it is read, in chunks of
+    INGEST_BATCH_ROWS rows, so `total` is only known (and set) once the last
+    row has been read; progress checkpoints carry 0 until then.  Each chunk is
+    validated row by row, upserted with a single INSERT … ON CONFLICT on
+    lower(name) (see _upsert_vendor_chunk), and its documents and vendors then
+    go through the ingestion pipeline together.  Errors are reported per row.
+    A chunk's rows are committed before they are indexed.  When run as a
+    background job, `on_progress(summary)` is called after each chunk and
+    commits the extraction results together with the summary (see
+    app.services.jobs); passing the last checkpoint back as `progress` resumes
+    after the rows it already covers.
     """
-    text = csv_bytes.decode("utf-8-sig")  # strip BOM if present
-    reader = csv.DictReader(io.StringIO(text))
-
-    rows = list(reader)
-    created = 0
-    updated = 0
-    failed = 0
-    documents_queued = 0
-    errors: list[dict] = []
-
-    for i, row in enumerate(rows, start=1):
-        try:
-            with db.begin_nested():
-                name = (row.get("vendor_name") or "").strip()
-                if not name:
-                    raise ValueError("vendor_name is required")
-
-                estd_raw = (row.get("estd") or "").strip()
-                estd = int(estd_raw) if estd_raw else None
-
-                certs_raw = (row.get("certificates") or "").strip()
-                certs_list = _split_field(certs_raw) if certs_raw else []
-
-                certs = []
-                doc_links = []
-
-                for c in certs_list:
-                    if c.startswith("http://") or c.startswith("https://"):
-                        doc_links.append(c)
-                    else:
-                        certs.append(c)
-
-                products_raw = (row.get("products") or "").strip()
-                products = _split_field(products_raw) if products_raw else []
-
-                fields = dict(
-                    name=name,
-                    location=(row.get("location") or "").strip() or None,
-                    estd=estd,
-                    mobile=(row.get("mobile") or "").strip() or None,
-                    contact_email=(row.get("email") or "").strip() or None,
-                    certificates=certs or None,
-                    products=products or None,
-                    website=(row.get("website") or "").strip() or None,
-                )
-
-                existing = None
-                if name:
-                    existing = (
-                        db.query(Vendor)
-                        .filter(func.lower(Vendor.name) == name.lower())
-                        .first()
-                    )
-
-                if existing:
-                    for key, value in fields.items():
-                        setattr(existing, key, value)
-                    db.flush()
-                    vendor = existing
-                    # Remove old documents so they are replaced by the new ones below
-                    db.query(VendorDocument).filter(
-                        VendorDocument.vendor_id == vendor.id
-                    ).delete()
-                    updated += 1
-                else:
-                    vendor = Vendor(id=str(uuid.uuid4()), **fields)
-                    db.add(vendor)
-                    db.flush()
-                    created += 1
-
-                certificate_details = []
-
-                # Process document links
-                if doc_links:
-                    from app.services.documents import (
-                        download_document,
-                        _guess_filename,
-                        extract_and_summarize,
-                    )
-
-                    for link in doc_links:
-                        doc = VendorDocument(
-                            id=str(uuid.uuid4()),
-                            vendor_id=vendor.id,
-                            document_url=link,
-                            processing_status="completed",
-                        )
-                        db.add(doc)
-                        documents_queued += 1
-
-                        try:
-                            print(f"DEBUG: Processing document link: {link}")
-                            doc_bytes = await download_document(link)
-                            print(
-                                f"DEBUG: Downloaded {len(doc_bytes)} bytes from {link}"
-                            )
-
-                            filename = _guess_filename(link)
-                            print(f"DEBUG: Guessed filename: {filename}")
-
-                            summary = await extract_and_summarize(doc_bytes, filename)
-                            print(
-                                f"DEBUG: Extracted summary: {json.dumps(summary, indent=2)}"
-                            )
-
-                            summary["document_url"] = link
-                            certificate_details.append(summary)
-
-                            doc.document_name = summary.get("document_name")
-                            doc.issued_to = summary.get("issued_to")
-                            doc.issuing_authority = summary.get("issuing_authority")
-                            doc.issue_date = summary.get("issue_date")
-                            doc.expiry_date = summary.get("expiry_date")
-                            doc.document_summary = summary.get("document_summary")
-                            doc.document_type = summary.get("document_type", "Others")
-                        except Exception as e:
-                            import traceback
-
-                            print(f"Failed to process {link}: {e}")
-                            traceback.print_exc()
-                            doc.processing_status = "failed"
-                            doc.error_message = str(e)
-
-                print(
-                    f"DEBUG: Appended {len(certificate_details)} certificates to details for vendor '{vendor.name}'."
-                )
-                # Index into vector db
-                await asyncio.to_thread(index_vendor_to_opensearch, vendor, certificate_details)
-        except Exception as exc:
-            failed += 1
-            errors.append({"row": i, "error": str(exc)})
+    summary = progress or {
+        "total": 0,
+        "processed": 0,
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "documents_queued": 0,
+        "errors": [],
+    }
+    if summary["processed"]:
+        print(f"[bulk-upload] resuming after row {summary['processed']}")
 
+    # utf-8-sig strips a BOM if present; DictReader skips blank lines
+    reader = csv.DictReader(
+        io.TextIOWrapper(io.BytesIO(csv_bytes), encoding="utf-8-sig", newline="")
+    )
+    rows = itertools.islice(enumerate(reader, start=1), summary["processed"], None)
+    chunk_rows = max(1, settings.INGEST_BATCH_ROWS)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+
+        parsed = []
+        for i, row in chunk:
+            try:
+                parsed.append((i, *_parse_vendor_row(row)))
+            except Exception as exc:
+                summary["failed"] += 1
+                summary["errors"].append({"row": i, "error": str(exc)})
+
+        batch = _upsert_vendor_chunk(db, parsed, summary)
+        if batch:
+            # Commit the chunk's rows before indexing them, so a crash in
+            # between can never leave index docs for rolled-back vendor ids.
+            # A resumed run upserts the same names onto the same ids.
+            _commit_keeping_state(db)
+            print(f"[bulk-upload] ingesting {len(batch)} vendor(s) up to row {chunk[-1][0]}")
+            await _ingest_vendor_batch(batch)
+
+        summary["processed"] = chunk[-1][0]
+        if on_progress is not None:
+            on_progress(summary)
+
+    summary["total"] = summary["processed"]
     db.commit()
     
     # Log activity for bulk upload
-    if created > 0 or updated > 0:
+    if summary["created"] > 0 or summary["updated"] > 0:
         log_activity(
             db,
             type="vendor_uploaded",
             title=f"Vendors data uploaded",
-            description=f"Created: {created}, Updated: {updated}, Documents: {documents_queued}"
+            description=(
+                f"Created: {summary['created']}, Updated: {summary['updated']}, "
+                f"Documents: {summary['documents_queued']}"
+            ),
         )
 
-    return {
-        "total": len(rows),
-        "created": created,
-        "updated": updated,
-        "failed": failed,
-        "documents_queued": documents_queued,
-        "errors": errors,
+    return summary
+
+
+def _vendor_index_source(
+    vendor: Vendor, certificate_details: list[dict]
+) -> tuple[str, dict]:
+    """The text to embed for a vendor and its index document (minus the embedding)."""
+    products_str = ", ".join(vendor.products) if vendor.products else ""
+    certs_str = ", ".join(vendor.certificates) if vendor.certificates else ""
+
+    embed_text = (
+        f"Vendor: {vendor.name}\n"
+        f"Location: {vendor.location or ''}\n"
+        f"Established: {vendor.estd or ''}\n"
+        f"Products: {products_str}\n"
+        f"Certificates: {certs_str}\n"
+        f"Website: {vendor.website or ''}\n"
+    )
+
+    if certificate_details:
+        embed_text += "Certificate Details:\n"
+        for cert in certificate_details:
+            embed_text += f"- {cert.get('document_type', 'Document')}: {cert.get('document_summary', '')}\n"
+
+    metadata = {
+        "vendor_id": vendor.id,
+        "vendor_name": vendor.name,
+        "location": vendor.location or "",
+        # Exact-match keys for filtered kNN (see search._build_knn_filter)
+        "location_terms": location_keywords(vendor.location),
+        "estd": vendor.estd,
+        "mobile": vendor.mobile or "",
+        "contact_email": vendor.contact_email or "",
+        "website": vendor.website or "",
+        "products": vendor.products or [],
+        "certificates": vendor.certificates or [],
     }
 
+    # Sanitize date fields in certificate_details: empty strings must
+    # be null so OpenSearch doesn't try to parse them as dates.
+    sanitized_certs = []
+    for cert in certificate_details:
+        c = dict(cert)
+        for date_field in ("issue_date", "expiry_date"):
+            if c.get(date_field) == "":
+                c[date_field] = None
+        sanitized_certs.append(c)
+
+    body = {
+        "vendor_id": vendor.id,
+        "certificate_details": sanitized_certs,
+        **metadata,
+    }
+    return embed_text, body
 
-def index_vendor_to_opensearch(vendor: Vendor, certificate_details: list[dict] = None):
-    """Generate embedding and index vendor details into OpenSearch."""
-    if certificate_details is None:
-        certificate_details = []
-    try:
-        from app.services.documents import (
-            generate_embedding,
-            _get_opensearch_client,
-            VENDOR_INDEX_NAME,
-        )
 
-        client = _get_opensearch_client()
+async def _write_vendor_index(body: dict, embedding: list[float], bump: bool = True):
+    """Index one vendor document; `bump=False` leaves the version bump to the caller."""
+    from app.services.documents import encode_vector, VENDOR_INDEX_NAME
 
-        products_str = ", ".join(vendor.products) if vendor.products else ""
-        certs_str = ", ".join(vendor.certificates) if vendor.certificates else ""
+    client = get_opensearch_client()
+    body = {**body, "embedding": encode_vector(embedding)}
+    await client.index(index=VENDOR_INDEX_NAME, id=body["vendor_id"], body=body)
 
-        embed_text = (
-            f"Vendor: {vendor.name}\n"
-            f"Location: {vendor.location or ''}\n"
-            f"Established: {vendor.estd or ''}\n"
-            f"Products: {products_str}\n"
-            f"Certificates: {certs_str}\n"
-            f"Website: {vendor.website or ''}\n"
-        )
+    if bump:
+        await bump_vendor_index_version([body["vendor_id"]])
+    if mirror_enabled():
+        vendor_mirror.upsert(body["vendor_id"], body, embedding)
 
-        if certificate_details:
-            embed_text += "Certificate Details:\n"
-            for cert in certificate_details:
-                embed_text += f"- {cert.get('document_type', 'Document')}: {cert.get('document_summary', '')}\n"
-
-        embedding = generate_embedding(embed_text)
-
-        metadata = {
-            "vendor_id": vendor.id,
-            "vendor_name": vendor.name,
-            "location": vendor.location or "",
-            "estd": vendor.estd,
-            "mobile": vendor.mobile or "",
-            "contact_email": vendor.contact_email or "",
-            "website": vendor.website or "",
-            "products": vendor.products or [],
-            "certificates": vendor.certificates or [],
-        }
 
-        # Sanitize date fields in certificate_details: empty strings must
-        # be null so OpenSearch doesn't try to parse them as dates.
-        sanitized_certs = []
-        for cert in certificate_details:
-            c = dict(cert)
-            for date_field in ("issue_date", "expiry_date"):
-                if c.get(date_field) == "":
-                    c[date_field] = None
-            sanitized_certs.append(c)
+async def _embed_vendor_stage(item):
+    from app.services.documents import generate_embedding
 
-        body = {
-            "vendor_id": vendor.id,
-            "embedding": embedding,
-            "certificate_details": sanitized_certs,
-            **metadata,
-        }
+    item.state["embedding"] = await asyncio.to_thread(
+        generate_embedding, item.state["text"]
+    )
+
+
+async def _index_vendor_stage(item):
+    # _ingest_vendor_batch bumps the index version once for the whole batch
+    await _write_vendor_index(item.state["body"], item.state["embedding"], bump=False)
 
-        client.index(index=VENDOR_INDEX_NAME, id=vendor.id, body=body)
+
+async def index_vendor_to_opensearch(
+    vendor: Vendor, certificate_details: list[dict] = None, bump: bool = True
+):
+    """
+    Generate embedding and index vendor details into OpenSearch.  With
+    `bump=False` the caller records the index change (see _write_vendor_index).
+    """
+    try:
+        from app.services.documents import generate_embedding
+
+        embed_text, body = _vendor_index_source(vendor, certificate_details or [])
+        embedding = await asyncio.to_thread(generate_embedding, embed_text)
+        await _write_vendor_index(body, embedding, bump=bump)
         print(f"✓ Indexed vendor {vendor.name} to OpenSearch")
     except Exception as e:
         print(f"⚠ Could not index vendor {vendor.name} to OpenSearch: {e}")
 
 
-def create_vendor(db: Session, data: dict) -> Vendor:
+async def create_vendor(db: Session, data: dict) -> Vendor:
     name = data.get("name", "")
     existing = db.query(Vendor).filter(func.lower(Vendor.name) == name.lower()).first()
     if existing:
@@ -360,14 +551,16 @@ def create_vendor(db: Session, data: dict) -> Vendor:
             setattr(existing, key, value)
         db.commit()
         db.refresh(existing)
-        index_vendor_to_opensearch(existing)
+        await index_vendor_to_opensearch(existing)
+        register_vendor_vocabulary(existing)
         return existing
 
     vendor = Vendor(id=str(uuid.uuid4()), **data)
     db.add(vendor)
     db.commit()
     db.refresh(vendor)
-    index_vendor_to_opensearch(vendor)
+    await index_vendor_to_opensearch(vendor)
+    register_vendor_vocabulary(vendor)
     
     # Log activity for single vendor creation
     log_activity(
@@ -380,7 +573,7 @@ def create_vendor(db: Session, data: dict) -> Vendor:
     return vendor
 
 
-def reindex_all_vendors(db: Session) -> dict:
+async def reindex_all_vendors(db: Session) -> dict:
     """
     Rebuild the vendor OpenSearch index (configured via VENDOR_INDEX_NAME)
     from scratch and re-index every vendor currently stored in the database.
@@ -396,7 +589,7 @@ def reindex_all_vendors(db: Session) -> dict:
     from app.services.documents import rebuild_vendor_index
 
     # Step 1: rebuild index
-    rebuild_vendor_index()
+    await rebuild_vendor_index()
 
     # Step 2: re-index vendors
     vendors = db.query(Vendor).all()
@@ -428,12 +621,18 @@ def reindex_all_vendors(db: Session) -> dict:
                 }
                 for d in docs
             ]
-            index_vendor_to_opensearch(vendor, certificate_details)
+            # One full-index change is recorded below instead of one per vendor
+            await index_vendor_to_opensearch(vendor, certificate_details, bump=False)
             succeeded += 1
         except Exception as e:
             print(f"⚠ Failed to re-index vendor {vendor.name}: {e}")
             failed += 1
 
+    await bump_vendor_index_version()
+    # Full rebuild also drops vocabulary of vendors that no longer exist
+    await asyncio.to_thread(query_parser.build_gazetteer)
+    await asyncio.to_thread(suggest.build_suggest_index)
+
     return {
         "index_rebuilt": True,
         "total": len(vendors),
@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for the vendor search hot path.
+
+Run from the backend directory, e.g.:
+
+    python -m benchmarks.search_bench --vendors 1000,10000,100000
+"""
@@ -0,0 +1,148 @@
+"""
+Synthetic vendor corpus and deterministic fake embeddings.
+
+Vendors are drawn from product families, certifications and Indian
+city/state pairs so BM25 and kNN see realistic term overlap.  The same seed
+always produces the same corpus, query set and vectors.
+"""
+
+import hashlib
+import random
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.vendor_vocabulary import COMMON_CERTIFICATIONS, location_keywords
+
+PRODUCT_FAMILIES = {
+    "pipes": ["MS Steel Pipes", "ERW Pipes", "Seamless Steel Pipes", "GI Pipes",
+              "HDPE Pipes", "PVC Pipes", "Stainless Steel Pipes", "Copper Tubes"],
+    "valves": ["Gate Valves", "Ball Valves", "Butterfly Valves", "Check Valves",
+               "Pressure Relief Valves", "Solenoid Valves"],
+    "electrical": ["Power Cables", "Control Cables", "Distribution Transformers",
+                   "LT Panels", "Switchgear", "LED Luminaires", "Cable Trays"],
+    "mechanical": ["Ball Bearings", "Gearboxes", "Centrifugal Pumps", "Submersible Pumps",
+                   "Air Compressors", "Conveyor Belts", "Industrial Fasteners"],
+    "chemicals": ["Industrial Solvents", "Water Treatment Chemicals", "Lubricants",
+                  "Epoxy Coatings", "Adhesives", "Specialty Polymers"],
+    "safety": ["PPE Kits", "Safety Helmets", "Safety Shoes", "Fire Extinguishers",
+               "Gas Detectors", "Reflective Jackets"],
+    "office": ["Office Chairs", "Modular Workstations", "Printer Cartridges",
+               "Stationery Supplies", "Filing Cabinets"],
+    "it": ["Laptops", "Network Switches", "Data Center Racks", "UPS Systems",
+           "Cloud Migration Services", "DevOps Consulting", "Cybersecurity Audits"],
+    "packaging": ["Corrugated Boxes", "Stretch Film", "Wooden Pallets",
+                  "Flexible Packaging", "Glass Bottles"],
+    "food": ["Basmati Rice", "Edible Oils", "Spices", "Packaged Drinking Water",
+             "Dairy Products"],
+}  # fmt: skip
+
+CITY_STATES = [
+    ("Mumbai", "Maharashtra"), ("Pune", "Maharashtra"), ("Nagpur", "Maharashtra"),
+    ("Ahmedabad", "Gujarat"), ("Surat", "Gujarat"), ("Vadodara", "Gujarat"),
+    ("Rajkot", "Gujarat"), ("Chennai", "Tamil Nadu"), ("Coimbatore", "Tamil Nadu"),
+    ("Bengaluru", "Karnataka"), ("Hyderabad", "Telangana"), ("Kolkata", "West Bengal"),
+    ("New Delhi", "Delhi"), ("Noida", "Uttar Pradesh"), ("Kanpur", "Uttar Pradesh"),
+    ("Gurugram", "Haryana"), ("Faridabad", "Haryana"), ("Ludhiana", "Punjab"),
+    ("Jaipur", "Rajasthan"), ("Indore", "Madhya Pradesh"), ("Kochi", "Kerala"),
+    ("Visakhapatnam", "Andhra Pradesh"), ("Bhubaneswar", "Odisha"),
+    ("Jamshedpur", "Jharkhand"),
+]  # fmt: skip
+
+_NAME_PARTS = ["Shree", "Bharat", "Apex", "Sai", "Om", "Vardhman", "Kaveri",
+               "Ganesh", "Tata", "Sun", "Metro", "Prime", "Galaxy", "Royal",
+               "Jyoti", "Laxmi", "Unique", "Supreme", "National", "Eastern"]  # fmt: skip
+_NAME_SUFFIXES = ["Industries", "Enterprises", "Engineering Works", "Traders",
+                  "Pvt Ltd", "Corporation", "Solutions", "Exports", "Agencies"]  # fmt: skip
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class BenchQuery:
+    products: list[str]
+    location: str | None
+    certifications: list[str]
+    search_text: str
+
+
+def generate_vendors(count: int, seed: int = 7) -> list[dict]:
+    """Vendor documents shaped like the vendor index `_source`."""
+    rng = random.Random(seed)
+    families = list(PRODUCT_FAMILIES)
+    vendors = []
+    for i in range(count):
+        family = PRODUCT_FAMILIES[rng.choice(families)]
+        city, state = rng.choice(CITY_STATES)
+        name = f"{rng.choice(_NAME_PARTS)} {rng.choice(_NAME_PARTS)} {rng.choice(_NAME_SUFFIXES)} {i}"
+        vendors.append(
+            {
+                "vendor_id": f"bench-{i}",
+                "vendor_name": name,
+                "location": f"{city}, {state}",
+                "location_terms": location_keywords(f"{city}, {state}"),
+                "estd": rng.randint(1960, 2023),
+                "mobile": "",
+                "contact_email": "",
+                "website": "",
+                "products": rng.sample(family, k=min(len(family), rng.randint(1, 4))),
+                "certificates": rng.sample(COMMON_CERTIFICATIONS, k=rng.randint(0, 3)),
+                "certificate_details": [],
+            }
+        )
+    return vendors
+
+
+def generate_queries(count: int, seed: int = 11) -> list[BenchQuery]:
+    """Procurement-style queries over the same vocabulary as the corpus."""
+    rng = random.Random(seed)
+    all_products = [p for family in PRODUCT_FAMILIES.values() for p in family]
+    queries = []
+    for _ in range(count):
+        product = rng.choice(all_products)
+        location = rng.choice(CITY_STATES)[rng.randint(0, 1)] if rng.random() < 0.6 else None
+        certs = [rng.choice(COMMON_CERTIFICATIONS)] if rng.random() < 0.4 else []
+        text = " ".join([product, "supplier", location or "", *certs]).strip()
+        queries.append(BenchQuery([product], location, certs, " ".join(text.split())))
+    return queries
+
+
+def vendor_embed_text(vendor: dict) -> str:
+    """Same field layout as index_vendor_to_opensearch's embed text."""
+    return (
+        f"Vendor: {vendor['vendor_name']}\n"
+        f"Location: {vendor['location']}\n"
+        f"Products: {', '.join(vendor['products'])}\n"
+        f"Certificates: {', '.join(vendor['certificates'])}\n"
+    )
+
+
+class FakeEmbedder:
+    """
+    Deterministic bag-of-tokens embeddings: each token maps to a fixed random
+    unit vector (seeded by its hash) and a text embeds to the normalised sum,
+    so texts sharing terms are close in cosine space — enough structure for
+    kNN to behave like it does on real embeddings, at zero cost.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+        self._token_vectors: dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vec = self._token_vectors.get(token)
+        if vec is None:
+            seed = int.from_bytes(hashlib.sha1(token.encode()).digest()[:8], "little")
+            vec = np.random.default_rng(seed).standard_normal(self.dimensions)
+            vec = (vec / np.linalg.norm(vec)).astype(np.float32)
+            self._token_vectors[token] = vec
+        return vec
+
+    def embed(self, text: str) -> list[float]:
+        tokens = _TOKEN_RE.findall((text or "").lower())
+        if not tokens:
+            return [0.0] * self.dimensions
+        vec = np.sum([self._token_vector(t) for t in tokens], axis=0)
+        norm = float(np.linalg.norm(vec))
+        return (vec / norm if norm else vec).tolist()
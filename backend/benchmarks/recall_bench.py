@@ -0,0 +1,308 @@
+"""
+Recall / memory trade-off of embedding dimensions and kNN vector encodings.
+
+Ground truth is the exact cosine top-k over 1024-dim float32 vectors (the
+current production configuration).  Every (dimensions, encoding) candidate
+is searched exhaustively as well, so the reported recall isolates the loss
+from smaller vectors and coarser storage — HNSW approximation comes on top
+of it and is the same for every candidate.
+
+Vectors come from either
+
+  * the synthetic corpus (benchmarks.corpus) with FakeEmbedder; reduced
+    dimensions are a seeded Gaussian random projection of the 1024-dim
+    vectors, which is a pessimistic stand-in for Titan v2's native 256/512
+    outputs, or
+  * ``--vectors DIR`` with real Titan embeddings saved as
+    ``vendors_<dims>.npy`` / ``queries_<dims>.npy`` (one row per text, same
+    row order for every size; 1024 is required for the ground truth).
+
+Encodings mirror the index mapping (app.services.documents): ``float``
+stores float32, ``fp16`` rounds to half precision (faiss SQfp16) and
+``byte`` scales each vector by 127 / max|v| and rounds to int8, exactly as
+`encode_vector` does.
+
+``--pipeline N`` additionally runs every encoding through
+`search_vendors_hybrid` on N vendors, against the in-memory stand-in scoring
+kNN hits on the scale of the engine the encoding maps to (lucene for byte),
+and reports how many results still carry a vector match and how much the
+returned vendors overlap the float baseline.  A score-scale mismatch between
+the engine and VENDOR_SEARCH_VECTOR_MIN_SCORE shows up as vector matches
+dropping to zero.
+
+    python -m benchmarks.recall_bench --vendors 50000 --queries 500
+    python -m benchmarks.recall_bench --encodings float,byte --pipeline 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from benchmarks.corpus import (
+    FakeEmbedder,
+    generate_queries,
+    generate_vendors,
+    vendor_embed_text,
+)
+
+BASE_DIMENSIONS = 1024
+BYTES_PER_DIM = {"float": 4, "fp16": 2, "byte": 1}
+# faiss/lucene HNSW default max connections; OpenSearch sizes native memory
+# as 1.1 * (bytes_per_vector + 8 * M) per vector
+HNSW_M = 16
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _synthetic_vectors(args) -> tuple[dict, dict]:
+    embedder = FakeEmbedder(BASE_DIMENSIONS)
+    vendors = generate_vendors(args.vendors, seed=args.seed)
+    queries = generate_queries(args.queries, seed=args.seed + 1)
+    base_v = np.asarray(
+        [embedder.embed(vendor_embed_text(v)) for v in vendors], dtype=np.float32
+    )
+    base_q = np.asarray(
+        [embedder.embed(q.search_text) for q in queries], dtype=np.float32
+    )
+
+    rng = np.random.default_rng(args.seed)
+    vendor_sets, query_sets = {}, {}
+    for dims in args.dims:
+        if dims == BASE_DIMENSIONS:
+            vendor_sets[dims], query_sets[dims] = base_v, base_q
+            continue
+        projection = rng.standard_normal((BASE_DIMENSIONS, dims)).astype(np.float32)
+        vendor_sets[dims] = _normalise(base_v @ projection)
+        query_sets[dims] = _normalise(base_q @ projection)
+    vendor_sets.setdefault(BASE_DIMENSIONS, base_v)
+    query_sets.setdefault(BASE_DIMENSIONS, base_q)
+    return vendor_sets, query_sets
+
+
+def _file_vectors(args) -> tuple[dict, dict]:
+    vendor_sets, query_sets = {}, {}
+    for dims in {*args.dims, BASE_DIMENSIONS}:
+        vendor_sets[dims] = _normalise(
+            np.load(os.path.join(args.vectors, f"vendors_{dims}.npy"))
+        )
+        query_sets[dims] = _normalise(
+            np.load(os.path.join(args.vectors, f"queries_{dims}.npy"))
+        )
+    return vendor_sets, query_sets
+
+
+def encode(matrix: np.ndarray, encoding: str) -> np.ndarray:
+    """Round-trip float32 vectors through the stored representation."""
+    if encoding == "fp16":
+        return matrix.astype(np.float16).astype(np.float32)
+    if encoding == "byte":
+        peak = np.abs(matrix).max(axis=1, keepdims=True)
+        peak[peak == 0] = 1.0
+        return np.clip(np.round(matrix * (127.0 / peak)), -128, 127).astype(np.float32)
+    return matrix
+
+
+def exact_top_k(
+    vendors: np.ndarray, queries: np.ndarray, k: int, chunk: int = 256
+) -> np.ndarray:
+    """Row indices of the k nearest vendors (cosine) for every query."""
+    vendors = _normalise(vendors)
+    queries = _normalise(queries)
+    out = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), chunk):
+        scores = queries[start : start + chunk] @ vendors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        out[start : start + chunk] = np.take_along_axis(top, order, axis=1)
+    return out
+
+
+def recall_at(truth: np.ndarray, found: np.ndarray, k: int) -> float:
+    hits = sum(
+        len(set(t[:k]).intersection(f[:k])) for t, f in zip(truth, found)
+    )
+    return hits / (k * len(truth))
+
+
+def run(args) -> list[dict]:
+    started = time.perf_counter()
+    if args.vectors:
+        vendor_sets, query_sets = _file_vectors(args)
+    else:
+        vendor_sets, query_sets = _synthetic_vectors(args)
+    print(f"vectors ready in {time.perf_counter() - started:.1f}s")
+
+    k_max = max(args.k)
+    truth = exact_top_k(
+        vendor_sets[BASE_DIMENSIONS], query_sets[BASE_DIMENSIONS], k_max
+    )
+    count = len(vendor_sets[BASE_DIMENSIONS])
+
+    results = []
+    for dims in args.dims:
+        for encoding in args.encodings:
+            found = exact_top_k(
+                encode(vendor_sets[dims], encoding),
+                encode(query_sets[dims], encoding),
+                k_max,
+            )
+            vector_bytes = dims * BYTES_PER_DIM[encoding]
+            results.append(
+                {
+                    "dimensions": dims,
+                    "encoding": encoding,
+                    "recall": {
+                        f"@{k}": round(recall_at(truth, found, k), 4) for k in args.k
+                    },
+                    "bytes_per_vector": vector_bytes,
+                    "vectors_mib": round(vector_bytes * count / 2**20, 1),
+                    "hnsw_estimate_mib": round(
+                        1.1 * (vector_bytes + 8 * HNSW_M) * count / 2**20, 1
+                    ),
+                }
+            )
+    return results
+
+
+def pipeline_check(args) -> list[dict]:
+    """Hybrid search end to end per encoding (see module docstring)."""
+    from app.core.config import settings
+    from app.services import documents, search
+    from app.services.search import QueryIntent
+    from app.services.vendor_mirror import VendorMirror
+    from benchmarks.search_bench import _filters_available, _quiet
+    from benchmarks.standin import InMemoryOpenSearch
+
+    settings.SEARCH_RESULT_CACHE_ENABLED = False
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.VENDOR_SEARCH_ENGINE = "client_rrf"
+    settings.VENDOR_MIRROR_ENABLED = False
+    embedder = FakeEmbedder(BASE_DIMENSIONS)
+    vendors = generate_vendors(args.pipeline, seed=args.seed)
+    embeddings = [embedder.embed(vendor_embed_text(v)) for v in vendors]
+    intents = [
+        QueryIntent(
+            products=q.products,
+            location=q.location,
+            certifications=q.certifications,
+            keywords=q.search_text.split()[:8],
+            search_text=q.search_text,
+        )
+        for q in generate_queries(args.queries, seed=args.seed + 1)
+    ]
+    search.knn_filters_available = _filters_available
+    search.generate_embedding = lambda text, lookup=True: embedder.embed(text)
+    # Query vectors count as cached, so "msearch" mode measures one round trip
+    search.cached_embedding = embedder.embed
+
+    baseline: list[list[str]] = []
+    results = []
+    for encoding in ["float", *(e for e in args.encodings if e != "float")]:
+        documents.VECTOR_ENCODING = encoding
+        mirror = VendorMirror(initial_capacity=len(vendors))
+        for vendor, embedding in zip(vendors, embeddings):
+            mirror.upsert(vendor["vendor_id"], vendor, documents.encode_vector(embedding))
+        client = InMemoryOpenSearch(mirror, engine=documents.vector_engine())
+        search.get_opensearch_client = lambda: client
+
+        async def run_all():
+            return [await search.search_vendors_hybrid(intent=i) for i in intents]
+
+        with _quiet():
+            ranked = asyncio.run(run_all())
+        hits = [r for per_query in ranked for r in per_query]
+        ids = [[r["vendor_id"] for r in per_query] for per_query in ranked]
+        if encoding == "float":
+            baseline = ids
+        overlap = [
+            len(set(a).intersection(b)) / max(len(a), 1) for a, b in zip(baseline, ids)
+        ]
+        results.append(
+            {
+                "encoding": encoding,
+                "engine": documents.vector_engine(),
+                "vector_matched": round(
+                    sum(r["vector_score"] > 0 for r in hits) / max(len(hits), 1), 4
+                ),
+                "mean_final_score": round(
+                    sum(r["final_score"] for r in hits) / max(len(hits), 1), 4
+                ),
+                "overlap_with_float": round(sum(overlap) / max(len(overlap), 1), 4),
+            }
+        )
+    return results
+
+
+def _print_pipeline(results: list[dict], count: int):
+    print(f"\n── search_vendors_hybrid · {count:,} vendors ──")
+    print(f"{'encoding':<8} {'engine':<7} {'vector hits':>11} {'mean score':>10} {'overlap':>8}")
+    baseline = results[0]["vector_matched"]
+    for r in results:
+        flag = " ⚠" if baseline and r["vector_matched"] < baseline / 2 else ""
+        print(
+            f"{r['encoding']:<8} {r['engine']:<7} {r['vector_matched']:>11.4f} "
+            f"{r['mean_final_score']:>10.4f} {r['overlap_with_float']:>8.4f}{flag}"
+        )
+
+
+def _print_results(results: list[dict], count: int):
+    print(f"\n── {count:,} vectors · ground truth 1024d float ──")
+    ks = list(results[0]["recall"])
+    header = f"{'dims':>5} {'encoding':<8} " + " ".join(f"{'recall' + k:>10}" for k in ks)
+    print(header + f" {'B/vector':>9} {'vectors':>10} {'HNSW est.':>10}")
+    for r in results:
+        recalls = " ".join(f"{r['recall'][k]:>10.4f}" for k in ks)
+        print(
+            f"{r['dimensions']:>5} {r['encoding']:<8} {recalls} "
+            f"{r['bytes_per_vector']:>9} {r['vectors_mib']:>7} MiB "
+            f"{r['hnsw_estimate_mib']:>6} MiB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vendors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument(
+        "--dims", default="256,512,1024", help="comma-separated dimensions"
+    )
+    parser.add_argument(
+        "--encodings", default="float,fp16,byte", help="comma-separated encodings"
+    )
+    parser.add_argument("--k", default="10,50", help="comma-separated recall depths")
+    parser.add_argument("--vectors", help="directory of real embeddings (.npy)")
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        default=0,
+        help="also check each encoding through search_vendors_hybrid on N vendors",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+    args.dims = [int(d) for d in args.dims.split(",")]
+    args.encodings = args.encodings.split(",")
+    args.k = [int(k) for k in args.k.split(",")]
+
+    results = run(args)
+    _print_results(results, args.vendors)
+    if args.pipeline:
+        pipeline = pipeline_check(args)
+        _print_pipeline(pipeline, args.pipeline)
+        results = {"recall": results, "pipeline": pipeline}
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Offline throughput / latency benchmark for hybrid vendor search.
+
+Generates a synthetic vendor corpus, embeds it with deterministic fake
+embeddings and runs `search_vendors_hybrid` end to end (keyword query
+building, kNN + BM25 retrieval, RRF fusion, result shaping) without AWS,
+Gemini or a managed OpenSearch domain.  Retrieval runs against either
+
+  * ``--backend memory``      the in-memory stand-in (benchmarks.standin), or
+  * ``--backend opensearch``  a local OpenSearch container, e.g.
+        docker run -p 9200:9200 -e discovery.type=single-node \\
+            -e DISABLE_SECURITY_PLUGIN=true opensearchproject/opensearch:2.17.0
+
+and also micro-benchmarks `_rrf_fuse` and fusion + shaping (`_rank_hits`) on
+synthetic hit lists.  Reports QPS, p50/p95/p99 latency and memory per corpus
+size.
+
+    python -m benchmarks.search_bench --vendors 1000,10000,100000 --dims 256
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import statistics
+import time
+
+from app.core.config import settings
+from app.services import documents, search
+from app.services.search import QueryIntent
+from app.services.vendor_mirror import VendorMirror
+from benchmarks.corpus import (
+    FakeEmbedder,
+    generate_queries,
+    generate_vendors,
+    vendor_embed_text,
+)
+from benchmarks.standin import InMemoryOpenSearch
+
+
+def _percentiles(samples_ms: list[float]) -> dict:
+    ordered = sorted(samples_ms)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """The search path logs per hit; keep that I/O out of the measurements."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _configure(args):
+    """Point the search service at offline stand-ins and disable its caches."""
+    settings.SEARCH_RESULT_CACHE_ENABLED = False
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.INTENT_CACHE_ENABLED = False
+    settings.VENDOR_SEARCH_ENGINE = "client_rrf"
+    settings.VENDOR_SEARCH_RETRIEVAL_MODE = args.retrieval_mode
+    settings.VENDOR_MIRROR_ENABLED = False
+    # Index mapping and query vectors follow the benchmarked vector config
+    documents.EMBEDDING_DIMENSIONS = args.dims
+    documents.VECTOR_ENCODING = args.encoding
+
+
+async def _filters_available() -> bool:
+    return True
+
+
+def _build_memory_backend(vendors, embedder):
+    mirror = VendorMirror(initial_capacity=len(vendors))
+    for vendor in vendors:
+        embedding = embedder.embed(vendor_embed_text(vendor))
+        vector = documents.encode_vector(embedding)
+        mirror.upsert(vendor["vendor_id"], vendor, vector)
+    mirror.ready = True
+    client = InMemoryOpenSearch(mirror, engine=documents.vector_engine())
+    return client, mirror.stats()["matrix_bytes"]
+
+
+def _build_opensearch_backend(vendors, embedder, args):
+    from opensearchpy import AsyncOpenSearch, OpenSearch, helpers
+
+    client = OpenSearch(hosts=[args.opensearch_url], timeout=120)
+    if client.indices.exists(index=args.index):
+        client.indices.delete(index=args.index)
+    client.indices.create(index=args.index, body=documents.vendor_index_body())
+    actions = (
+        {
+            "_index": args.index,
+            "_id": v["vendor_id"],
+            "_source": {
+                **v,
+                "embedding": documents.encode_vector(
+                    embedder.embed(vendor_embed_text(v))
+                ),
+            },
+        }
+        for v in vendors
+    )
+    helpers.bulk(client, actions, chunk_size=1000, request_timeout=300)
+    client.indices.refresh(index=args.index)
+    search.VENDOR_INDEX_NAME = args.index
+    stats = client.indices.stats(index=args.index)
+    client.close()
+    # Queries go through the same async client type the app uses
+    return (
+        AsyncOpenSearch(hosts=[args.opensearch_url], timeout=120),
+        stats["_all"]["primaries"]["store"]["size_in_bytes"],
+    )
+
+
+async def _run_queries(
+    intents: list[QueryIntent], concurrency: int
+) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(intent):
+        async with semaphore:
+            started = time.perf_counter()
+            await search.search_vendors_hybrid(intent=intent)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in intents))
+    return latencies, time.perf_counter() - started
+
+
+def _synthetic_hits(vendors: list[dict], candidates: int, rng: random.Random):
+    sample = rng.sample(vendors, k=min(len(vendors), candidates * 2))
+    vector = {
+        v["vendor_id"]: {"source": v, "score": 2.0 - i * 0.01}
+        for i, v in enumerate(sample[:candidates])
+    }
+    keyword = {
+        v["vendor_id"]: {"source": v, "score": 30.0 - i * 0.2}
+        for i, v in enumerate(sample[candidates // 2 : candidates // 2 + candidates])
+    }
+    return vector, keyword
+
+
+def _micro_bench(vendors: list[dict], iterations: int) -> dict:
+    rng = random.Random(3)
+    candidates = settings.VENDOR_SEARCH_TOP_N * settings.VENDOR_SEARCH_CANDIDATE_MULTIPLIER
+    inputs = [_synthetic_hits(vendors, candidates, rng) for _ in range(iterations)]
+
+    fuse_ms, rank_ms = [], []
+    with _quiet():
+        for vector, keyword in inputs:
+            started = time.perf_counter()
+            search._rrf_fuse(vector, keyword, k=settings.VENDOR_SEARCH_RRF_K)
+            fuse_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            search._rank_hits(vector, keyword, settings.VENDOR_SEARCH_TOP_N)
+            rank_ms.append((time.perf_counter() - started) * 1000)
+    return {
+        "candidates_per_list": candidates,
+        "rrf_fuse": _percentiles(fuse_ms),
+        "fuse_and_shape": _percentiles(rank_ms),
+    }
+
+
+def run_size(size: int, args) -> dict:
+    embedder = FakeEmbedder(args.dims)
+    vendors = generate_vendors(size, seed=args.seed)
+
+    rss_before = _max_rss_mb()
+    started = time.perf_counter()
+    if args.backend == "memory":
+        client, index_bytes = _build_memory_backend(vendors, embedder)
+    else:
+        client, index_bytes = _build_opensearch_backend(vendors, embedder, args)
+    build_seconds = time.perf_counter() - started
+
+    search.get_opensearch_client = lambda: client
+    # Both backends are built from vendor_index_body, filter fields included
+    search.knn_filters_available = _filters_available
+    search.generate_embedding = lambda text, lookup=True: embedder.embed(text)
+    # Query vectors count as cached, so "msearch" mode measures one round trip
+    search.cached_embedding = embedder.embed
+
+    intents = [
+        QueryIntent(
+            products=q.products,
+            location=q.location,
+            certifications=q.certifications,
+            keywords=q.search_text.split()[:8],
+            search_text=q.search_text,
+        )
+        for q in generate_queries(args.queries + args.warmup, seed=args.seed + 1)
+    ]
+    warmup, measured = intents[: args.warmup], intents[args.warmup :]
+
+    result = {
+        "vendors": size,
+        "backend": args.backend,
+        "dimensions": args.dims,
+        "encoding": args.encoding,
+        "retrieval_mode": args.retrieval_mode,
+        "build_seconds": round(build_seconds, 2),
+        "index_bytes": index_bytes,
+        "max_rss_mb": None,
+        "rss_growth_mb": None,
+        "sequential": None,
+        "throughput": [],
+    }
+
+    async def measure():
+        # One event loop for every pass, so the async client's pool is reused
+        await _run_queries(warmup, 1)
+        latencies, _ = await _run_queries(measured, 1)
+        result["sequential"] = _percentiles(latencies)
+        for concurrency in args.concurrency:
+            latencies, wall = await _run_queries(measured, concurrency)
+            result["throughput"].append(
+                {
+                    "concurrency": concurrency,
+                    "qps": round(len(measured) / wall, 1),
+                    **_percentiles(latencies),
+                }
+            )
+        await client.close()
+
+    with _quiet():
+        asyncio.run(measure())
+    result["micro"] = _micro_bench(vendors, args.micro_iterations)
+    result["max_rss_mb"] = _max_rss_mb()
+    result["rss_growth_mb"] = round(result["max_rss_mb"] - rss_before, 1)
+    return result
+
+
+def _print_result(r: dict):
+    print(
+        f"\n── {r['vendors']:,} vendors · {r['backend']} · {r['dimensions']}d "
+        f"{r['encoding']} · "
+        f"{r['retrieval_mode']} ──"
+    )
+    print(
+        f"build {r['build_seconds']}s · index {r['index_bytes'] / 2**20:.1f} MiB · "
+        f"max RSS {r['max_rss_mb']} MiB (+{r['rss_growth_mb']})"
+    )
+    s = r["sequential"]
+    print(f"sequential    p50 {s['p50_ms']} ms  p95 {s['p95_ms']} ms  p99 {s['p99_ms']} ms")
+    for t in r["throughput"]:
+        print(
+            f"concurrency {t['concurrency']:<3} {t['qps']:>8} qps  "
+            f"p50 {t['p50_ms']} ms  p95 {t['p95_ms']} ms  p99 {t['p99_ms']} ms"
+        )
+    m = r["micro"]
+    print(
+        f"_rrf_fuse ({m['candidates_per_list']}/list)  p50 {m['rrf_fuse']['p50_ms']} ms  "
+        f"p99 {m['rrf_fuse']['p99_ms']} ms"
+    )
+    print(
+        f"fuse + shape           p50 {m['fuse_and_shape']['p50_ms']} ms  "
+        f"p99 {m['fuse_and_shape']['p99_ms']} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--vendors",
+        default="1000,10000",
+        help="comma-separated corpus sizes (up to 500000)",
+    )
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="comma-separated concurrency levels"
+    )
+    parser.add_argument("--dims", type=int, default=1024)
+    parser.add_argument(
+        "--encoding", choices=["float", "fp16", "byte"], default="float"
+    )
+    parser.add_argument(
+        "--backend", choices=["memory", "opensearch"], default="memory"
+    )
+    parser.add_argument("--opensearch-url", default="http://localhost:9200")
+    parser.add_argument("--index", default="bench-vendors")
+    parser.add_argument(
+        "--retrieval-mode", choices=["msearch", "parallel"], default="msearch"
+    )
+    parser.add_argument("--micro-iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    _configure(args)
+    results = []
+    for size in (int(v) for v in args.vendors.split(",")):
+        result = run_size(size, args)
+        _print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
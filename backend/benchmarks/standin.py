@@ -0,0 +1,119 @@
+"""
+In-memory stand-in for the OpenSearch client used by vendor search.
+
+Answers the `search` / `msearch` bodies built by app.services.search against a
+`VendorMirror`: kNN bodies go to its brute-force cosine search, and the
+bool/should keyword query is translated clause by clause into BM25
+(field, text, boost) terms.  Fields the mirror does not index
+(certificate_details.*) are skipped.  kNN `filter` clauses (terms / prefix /
+range inside bool) are evaluated against each candidate's source.
+
+kNN scores follow the chosen engine's cosinesimil scale: 1 + cosine for
+faiss, (1 + cosine) / 2 for lucene (the engine behind byte vectors).
+"""
+
+from app.services.vendor_mirror import VendorMirror
+
+_MIRRORED_FIELDS = {"products", "certificates", "location", "vendor_name"}
+
+
+def _keyword_terms(query: dict) -> list[tuple[str, str, float]]:
+    clauses = query.get("bool", {}).get("should", [])
+    terms: list[tuple[str, str, float]] = []
+    for clause in clauses:
+        if "match" in clause:
+            (field, spec), = clause["match"].items()
+            if field in _MIRRORED_FIELDS:
+                terms.append((field, spec["query"], float(spec.get("boost", 1.0))))
+        elif "multi_match" in clause:
+            spec = clause["multi_match"]
+            for entry in spec["fields"]:
+                field, _, boost = entry.partition("^")
+                if field in _MIRRORED_FIELDS:
+                    terms.append((field, spec["query"], float(boost or 1.0)))
+    return terms
+
+
+def _field_values(source: dict, field: str) -> list:
+    value = source.get(field.removesuffix(".keyword"))
+    values = value if isinstance(value, list) else [value]
+    if field.endswith(".keyword"):
+        # lowercase_keyword normalizer
+        values = [" ".join(str(v).split()).lower() for v in values if v]
+    return [v for v in values if v is not None]
+
+
+def _matches(clause: dict, source: dict) -> bool:
+    (kind, spec), = clause.items()
+    if kind == "bool":
+        if not all(_matches(c, source) for c in spec.get("filter", [])):
+            return False
+        should = spec.get("should", [])
+        needed = spec.get("minimum_should_match", 1 if should else 0)
+        return sum(_matches(c, source) for c in should) >= needed
+    (field, value), = spec.items()
+    values = _field_values(source, field)
+    if kind == "terms":
+        return any(v in value for v in values)
+    if kind == "prefix":
+        return any(str(v).startswith(value) for v in values)
+    if kind == "range":
+        return any(
+            isinstance(v, int)
+            and v >= value.get("gte", v)
+            and v <= value.get("lte", v)
+            for v in values
+        )
+    raise NotImplementedError(f"unsupported filter clause: {kind}")
+
+
+class InMemoryOpenSearch:
+    """Duck-typed subset of opensearchpy.AsyncOpenSearch backed by a VendorMirror."""
+
+    def __init__(self, mirror: VendorMirror, engine: str = "faiss"):
+        self.mirror = mirror
+        # The mirror scores 1 + cosine; lucene halves that
+        self.scale = 0.5 if engine == "lucene" else 1.0
+
+    def _run(self, body: dict) -> dict:
+        query = body.get("query", {})
+        size = body.get("size", 10)
+        if "knn" in query:
+            spec = query["knn"]["embedding"]
+            knn_filter = spec.get("filter")
+            hits = self.mirror.vector_search(
+                spec["vector"],
+                spec.get("k", size),
+                body.get("min_score", 0.0) / self.scale,
+                row_filter=(lambda src: _matches(knn_filter, src)) if knn_filter else None,
+            )
+            hits = {
+                vid: {**h, "score": h["score"] * self.scale} for vid, h in hits.items()
+            }
+        elif "hybrid" in query:
+            raise NotImplementedError("hybrid queries need a real OpenSearch cluster")
+        else:
+            hits = self.mirror.keyword_search(_keyword_terms(query), size)
+        return {
+            "hits": {
+                "hits": [
+                    {"_id": vid, "_source": h["source"], "_score": h["score"]}
+                    for vid, h in list(hits.items())[:size]
+                ]
+            }
+        }
+
+    async def search(self, index: str, body: dict, **kwargs) -> dict:
+        return self._run(body)
+
+    async def close(self):
+        pass
+
+    async def msearch(self, body: list[dict], **kwargs) -> dict:
+        responses = []
+        for search_body in body[1::2]:
+            try:
+                responses.append(self._run(search_body))
+            except Exception as e:
+                responses.append({"error": str(e)})
+        return {"responses": responses}
@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.api.routers import (
@@ -12,11 +14,30 @@ from app.api.routers import (
     projects,
     email,
     stats,
+    metrics,
     activities,
+    jobs,
 )
+from app.core.aws import warm_aws_clients
 from app.core.database import SessionLocal
+from app.core.http import close_http_clients, open_http_client
+from app.core.opensearch import close_opensearch_client, open_opensearch_client
 from app.services.auth import seed_superuser
+from app.services.jobs import start_app_worker, stop_app_worker
+from app.services.index_sync import (
+    init_vendor_index_sync,
+    start_index_sync,
+    stop_index_sync,
+)
 from app.services.documents import ensure_opensearch_index
+from app.services.vendor_mirror import warm_vendor_mirror
+from app.services.query_parser import warm_query_parser
+from app.services.suggest import warm_suggest_index
+from app.core.timing import (
+    begin_request_timing,
+    server_timing_header,
+    timing_requested,
+)
 
 
 @asynccontextmanager
@@ -27,10 +48,32 @@ async def lifespan(app: FastAPI):
         seed_superuser(db)
     finally:
         db.close()
+    # Shared boto3 clients (credential + endpoint resolution happens once)
+    warm_aws_clients()
+    # One pooled AsyncOpenSearch client for the whole process
+    await open_opensearch_client()
+    # One pooled HTTP client for document and logo downloads
+    await open_http_client()
     # Ensure the OpenSearch vector index exists
-    ensure_opensearch_index()
+    await ensure_opensearch_index()
+    # Note the change-log position first; later changes are replayed on top of the loads below
+    await init_vendor_index_sync()
+    # Load the in-process vendor mirror (no-op unless enabled)
+    await warm_vendor_mirror()
+    # Build the gazetteer behind the fast-path query parser
+    warm_query_parser()
+    # Build the in-memory typeahead index behind /api/search/suggest
+    warm_suggest_index()
+    # Apply vendor index changes made by other processes (workers, job workers)
+    start_index_sync()
+    # Background job worker (bulk uploads, document processing)
+    start_app_worker()
     yield
     # Shutdown actions
+    await stop_app_worker()
+    await stop_index_sync()
+    await close_opensearch_client()
+    await close_http_clients()
 
 
 app = FastAPI(
@@ -47,8 +90,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Attach per-phase Server-Timing to responses that asked for it."""
+    if not timing_requested(request.headers, request.query_params):
+        return await call_next(request)
+    collector = begin_request_timing()
+    started = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing_header(
+        collector, time.perf_counter() - started
+    )
+    response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
 app.include_router(auth.router)
 app.include_router(search.router)
 app.include_router(rfp.router)
@@ -60,6 +119,8 @@ app.include_router(projects.router)
 app.include_router(email.router)
 app.include_router(stats.router)
 app.include_router(activities.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
 
 
 @app.get("/")
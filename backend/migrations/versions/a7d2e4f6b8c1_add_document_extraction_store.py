@@ -0,0 +1,47 @@
+"""Add document extraction store tables
+
+Revision ID: a7d2e4f6b8c1
+Revises: f6c1a9d3b7e2
+Create Date: 2026-10-18 17:20:48.903166
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d2e4f6b8c1"
+down_revision: Union[str, Sequence[str], None] = "f6c1a9d3b7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "document_extractions",
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("model_id", sa.String(), nullable=False),
+        sa.Column("extraction_version", sa.String(), nullable=False),
+        sa.Column("summary", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("content_sha256"),
+    )
+    op.create_table(
+        "document_sources",
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("checked_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("url"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("document_sources")
+    op.drop_table("document_extractions")
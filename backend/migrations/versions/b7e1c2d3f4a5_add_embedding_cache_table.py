@@ -0,0 +1,45 @@
+"""Add embedding_cache table
+
+Revision ID: b7e1c2d3f4a5
+Revises: 626178472c0a
+Create Date: 2026-10-18 09:12:40.118273
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e1c2d3f4a5"
+down_revision: Union[str, Sequence[str], None] = "626178472c0a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "embedding_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model_id", sa.String(), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_embedding_cache_last_used_at"),
+        "embedding_cache",
+        ["last_used_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_embedding_cache_last_used_at"), table_name="embedding_cache")
+    op.drop_table("embedding_cache")
@@ -0,0 +1,45 @@
+"""Add vendor_index_changes table
+
+Revision ID: b8e3f1a5c7d9
+Revises: a7d2e4f6b8c1
+Create Date: 2026-10-19 09:12:40.318265
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e3f1a5c7d9"
+down_revision: Union[str, Sequence[str], None] = "a7d2e4f6b8c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "vendor_index_changes",
+        sa.Column("seq", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("vendor_id", sa.String(), nullable=True),
+        sa.Column("origin", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("seq"),
+    )
+    op.create_index(
+        op.f("ix_vendor_index_changes_created_at"),
+        "vendor_index_changes",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_vendor_index_changes_created_at"), table_name="vendor_index_changes"
+    )
+    op.drop_table("vendor_index_changes")
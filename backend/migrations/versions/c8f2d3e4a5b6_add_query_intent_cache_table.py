@@ -0,0 +1,46 @@
+"""Add query_intent_cache table
+
+Revision ID: c8f2d3e4a5b6
+Revises: b7e1c2d3f4a5
+Create Date: 2026-10-18 10:03:17.402951
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8f2d3e4a5b6"
+down_revision: Union[str, Sequence[str], None] = "b7e1c2d3f4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "query_intent_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("intent", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_query_intent_cache_expires_at"),
+        "query_intent_cache",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_query_intent_cache_expires_at"), table_name="query_intent_cache"
+    )
+    op.drop_table("query_intent_cache")
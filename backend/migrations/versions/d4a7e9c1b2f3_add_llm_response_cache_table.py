@@ -0,0 +1,57 @@
+"""Add llm_response_cache table
+
+Revision ID: d4a7e9c1b2f3
+Revises: c8f2d3e4a5b6
+Create Date: 2026-10-18 14:21:45.118302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a7e9c1b2f3"
+down_revision: Union[str, Sequence[str], None] = "c8f2d3e4a5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("site", sa.String(), nullable=False),
+        sa.Column("model_id", sa.String(), nullable=False),
+        sa.Column("response", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_llm_response_cache_last_used_at"),
+        "llm_response_cache",
+        ["last_used_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_llm_response_cache_expires_at"),
+        "llm_response_cache",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_llm_response_cache_expires_at"), table_name="llm_response_cache"
+    )
+    op.drop_index(
+        op.f("ix_llm_response_cache_last_used_at"), table_name="llm_response_cache"
+    )
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,66 @@
+"""Add unique index on lower(vendor name)
+
+Revision ID: f6c1a9d3b7e2
+Revises: e5b8f0d2c3a4
+Create Date: 2026-10-18 16:41:27.204583
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6c1a9d3b7e2"
+down_revision: Union[str, Sequence[str], None] = "e5b8f0d2c3a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Duplicate groups listed in the error when the index cannot be created
+_MAX_LISTED = 50
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Vendors whose names differ only in case must be resolved by hand first:
+    # merging them here would orphan their OpenSearch documents and could not
+    # be undone by the downgrade.
+    if not context.is_offline_mode():
+        duplicates = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    """
+                    SELECT lower(name) AS name,
+                           string_agg(id || ' (' || name || ')', ', ' ORDER BY id) AS vendors
+                    FROM vendors
+                    WHERE name IS NOT NULL
+                    GROUP BY lower(name)
+                    HAVING count(*) > 1
+                    ORDER BY lower(name)
+                    """
+                )
+            )
+            .all()
+        )
+        if duplicates:
+            listed = "\n".join(
+                f"  {name}: {vendors}" for name, vendors in duplicates[:_MAX_LISTED]
+            )
+            more = len(duplicates) - _MAX_LISTED
+            if more > 0:
+                listed += f"\n  … and {more} more"
+            raise RuntimeError(
+                f"{len(duplicates)} vendor name(s) differ only in case:\n{listed}\n"
+                "Rename or remove the duplicates, run POST /api/vendors/reindex so "
+                "removed vendors leave the search index, then upgrade again."
+            )
+
+    op.execute("CREATE UNIQUE INDEX ix_vendors_name_lower ON vendors (lower(name))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vendors_name_lower", table_name="vendors")
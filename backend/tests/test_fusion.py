@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app.services.fusion import RankedList, fuse_ranked_lists
+
+
+def _hits(**scores):
+    return {vid: {"score": score} for vid, score in scores.items()}
+
+
+def test_from_hits_ranks_by_score():
+    ranked = RankedList.from_hits("vector", _hits(a=0.2, b=0.9, c=0.5))
+    assert list(ranked.ids) == ["b", "c", "a"]
+    assert list(ranked.scores) == [0.9, 0.5, 0.2]
+
+
+def test_from_hits_treats_missing_score_as_zero():
+    ranked = RankedList.from_hits("keyword", _hits(a=None, b=1.0))
+    assert list(ranked.ids) == ["b", "a"]
+    assert ranked.scores[1] == 0.0
+
+
+def test_rrf_sums_reciprocal_ranks_across_lists():
+    vector = RankedList.from_hits("vector", _hits(a=1.9, b=1.8))
+    keyword = RankedList.from_hits("keyword", _hits(b=12.0, c=8.0))
+    fused = fuse_ranked_lists([vector, keyword], k=60)
+
+    assert list(fused.ids) == ["b", "a", "c"]
+    assert fused.scores[0] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused.scores[1] == pytest.approx(1 / 61)
+    assert fused.scores[2] == pytest.approx(1 / 62)
+
+
+def test_weights_scale_each_list():
+    vector = RankedList.from_hits("vector", _hits(a=1.0), weight=3.0)
+    keyword = RankedList.from_hits("keyword", _hits(b=1.0), weight=1.0)
+    fused = fuse_ranked_lists([vector, keyword], k=60)
+
+    assert list(fused.ids) == ["a", "b"]
+    assert fused.scores[0] == pytest.approx(3 / 61)
+
+
+def test_raw_scores_are_aligned_to_the_fused_order():
+    vector = RankedList.from_hits("vector", _hits(a=1.9, b=1.8))
+    keyword = RankedList.from_hits("keyword", _hits(b=12.0, c=8.0))
+    fused = fuse_ranked_lists([vector, keyword])
+
+    by_id = {vid: i for i, vid in enumerate(fused.ids)}
+    assert fused.raw_score("vector", by_id["a"]) == 1.9
+    assert fused.raw_score("keyword", by_id["b"]) == 12.0
+    assert fused.raw_score("vector", by_id["c"]) == 0.0
+    assert fused.in_list("keyword", by_id["c"])
+    assert not fused.in_list("vector", by_id["c"])
+    assert not fused.in_list("geo", by_id["a"])
+
+
+def test_score_aware_breaks_rank_ties_by_score_gap():
+    # a and b swap ranks between the lists, so plain RRF ties them; b trails
+    # a closely in the vector list but a trails b by far in the keyword list
+    vector = RankedList.from_hits("vector", _hits(a=2.0, b=1.9, c=0.0))
+    keyword = RankedList.from_hits("keyword", _hits(b=10.0, a=1.0, c=0.0))
+
+    plain = fuse_ranked_lists([vector, keyword])
+    assert plain.scores[0] == pytest.approx(plain.scores[1])
+
+    aware = fuse_ranked_lists([vector, keyword], score_aware=True)
+    assert list(aware.ids[:2]) == ["b", "a"]
+    assert aware.scores[0] > aware.scores[1]
+
+
+def test_empty_lists_fuse_to_nothing():
+    empty = RankedList.from_hits("vector", {})
+    fused = fuse_ranked_lists([empty])
+    assert len(fused) == 0
+    assert isinstance(fused.scores, np.ndarray)
@@ -0,0 +1,43 @@
+from app.core import http
+from app.core.http import _cache_identity
+
+
+def test_plain_urls_are_unchanged():
+    url = "https://example.com/docs/iso.pdf?version=2"
+    assert _cache_identity(url) == url
+
+
+def test_sigv4_parameters_are_dropped():
+    signed = (
+        "https://bucket.s3.amazonaws.com/certs/iso.pdf?versionId=7"
+        "&X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Credential=AKIA%2F20261018"
+        "&X-Amz-Date=20261018T000000Z&X-Amz-Expires=3600"
+        "&X-Amz-SignedHeaders=host&X-Amz-Signature=abc123"
+        "&X-Amz-Security-Token=tok"
+    )
+    assert (
+        _cache_identity(signed)
+        == "https://bucket.s3.amazonaws.com/certs/iso.pdf?versionId=7"
+    )
+
+
+def test_resigned_links_share_an_identity():
+    first = "https://b.s3.amazonaws.com/a.pdf?AWSAccessKeyId=K&Signature=s1&Expires=100"
+    second = "https://b.s3.amazonaws.com/a.pdf?AWSAccessKeyId=K&Signature=s2&Expires=200"
+    assert _cache_identity(first) == _cache_identity(second)
+    assert _cache_identity(first) == "https://b.s3.amazonaws.com/a.pdf"
+
+
+def test_fragment_is_dropped_and_blank_values_kept():
+    assert _cache_identity("https://x.test/a?b=&c=1#page=2") == "https://x.test/a?b=&c=1"
+
+
+def test_other_objects_keep_separate_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(http.settings, "HTTP_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(http.settings, "HTTP_CACHE_MAX_BYTES", 1024)
+    signed_a = "https://b.s3.amazonaws.com/a.pdf?X-Amz-Signature=1"
+    signed_b = "https://b.s3.amazonaws.com/b.pdf?X-Amz-Signature=1"
+    assert http._cache_paths(signed_a) == http._cache_paths(
+        "https://b.s3.amazonaws.com/a.pdf?X-Amz-Signature=2"
+    )
+    assert http._cache_paths(signed_a) != http._cache_paths(signed_b)
@@ -0,0 +1,77 @@
+import pytest
+
+from app.services import query_parser
+from app.services.query_parser import Gazetteer, parse_query, tokenize
+from app.services.vendor_vocabulary import CERTIFICATION, LOCATION, PRODUCT
+
+
+@pytest.fixture(autouse=True)
+def gazetteer(monkeypatch):
+    """A small ready gazetteer, so parse_query never reads the database."""
+    gazetteer = Gazetteer()
+    gazetteer.add_terms(
+        [
+            (PRODUCT, "Steel Pipes"),
+            (PRODUCT, "MS Steel Pipes"),
+            (PRODUCT, "Cement"),
+            (LOCATION, "Pune"),
+            (LOCATION, "Tamil Nadu"),
+            (CERTIFICATION, "ISO 9001"),
+        ]
+    )
+    gazetteer.ready = True
+    monkeypatch.setattr(query_parser, "_gazetteer", gazetteer)
+    return gazetteer
+
+
+def test_tokenize_folds_plurals():
+    assert tokenize("Steel Pipes, batteries & glass") == [
+        "steel",
+        "pipe",
+        "battery",
+        "glass",
+    ]
+
+
+def test_extracts_every_kind():
+    parsed = parse_query("ISO 9001 steel pipes manufacturer in Pune")
+    assert parsed.fields["products"] == ["Steel Pipes"]
+    assert parsed.fields["certifications"] == ["ISO 9001"]
+    assert parsed.fields["location"] == "Pune"
+    assert parsed.fields["vendor_type"] == "manufacturer"
+    assert parsed.confidence == 1.0
+
+
+def test_longest_match_wins():
+    parsed = parse_query("ms steel pipes tamil nadu")
+    assert parsed.fields["products"] == ["MS Steel Pipes"]
+    assert parsed.fields["location"] == "Tamil Nadu"
+
+
+def test_stopwords_do_not_lower_confidence():
+    assert parse_query("need the best cement supplier").confidence == 1.0
+
+
+def test_unknown_words_lower_confidence():
+    parsed = parse_query("cement bricks")
+    assert parsed.fields["products"] == ["Cement"]
+    assert parsed.confidence == 0.5
+
+
+def test_no_product_is_penalised():
+    parsed = parse_query("ISO 9001 Pune")
+    assert parsed.fields["products"] == []
+    assert parsed.confidence == 0.5
+
+
+def test_search_text_falls_back_to_the_query():
+    parsed = parse_query("completely unknown words")
+    assert parsed.confidence == 0.0
+    assert parsed.fields["search_text"] == "completely unknown words"
+    assert parsed.fields["keywords"] == ["completely", "unknown", "words"]
+
+
+def test_new_terms_are_matched_once_added(gazetteer):
+    assert parse_query("copper wire").fields["products"] == []
+    query_parser.add_vendor_terms([(PRODUCT, "Copper Wire")])
+    assert parse_query("copper wire").fields["products"] == ["Copper Wire"]
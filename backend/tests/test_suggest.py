@@ -0,0 +1,68 @@
+from app.services.suggest import SuggestIndex
+from app.services.vendor_vocabulary import CERTIFICATION, LOCATION, PRODUCT
+
+
+def _index():
+    index = SuggestIndex()
+    index.add(PRODUCT, "MS Steel Pipes", vendor_count=2)
+    index.add(PRODUCT, "Steel Sheets", vendor_count=5)
+    index.add(PRODUCT, "Stainless Steel Pipes")
+    index.add(LOCATION, "Pune")
+    index.add(CERTIFICATION, "ISO 9001")
+    return index
+
+
+def _texts(results):
+    return [r["text"] for r in results]
+
+
+def test_prefix_of_the_term_ranks_first():
+    # "steel" starts "Steel Sheets" but is mid-term in the pipes
+    assert _texts(_index().suggest("steel")) == [
+        "Steel Sheets",
+        "MS Steel Pipes",
+        "Stainless Steel Pipes",
+    ]
+
+
+def test_mid_term_matches_rank_by_vendor_count():
+    assert _texts(_index().suggest("pipes")) == ["MS Steel Pipes", "Stainless Steel Pipes"]
+
+
+def test_lookup_is_case_and_space_insensitive():
+    assert _texts(_index().suggest("  ISO  90")) == ["ISO 9001"]
+
+
+def test_kind_filter_and_limit():
+    index = _index()
+    assert _texts(index.suggest("s", kinds={LOCATION})) == []
+    assert _texts(index.suggest("p", kinds={LOCATION})) == ["Pune"]
+    assert len(index.suggest("s", limit=1)) == 1
+
+
+def test_repeated_terms_add_vendor_counts():
+    index = _index()
+    index.add(PRODUCT, "ms  steel pipes", vendor_count=3)
+    [result] = index.suggest("ms steel")
+    assert result == {"text": "MS Steel Pipes", "kind": PRODUCT, "vendor_count": 5}
+    assert len(index) == 5
+
+
+def test_bulk_load_counts_vendors_and_keeps_static_terms():
+    index = SuggestIndex()
+    index._bulk_load(
+        [(PRODUCT, "Cement"), (PRODUCT, "cement"), (LOCATION, "Pune")],
+        [(LOCATION, "Pune"), (LOCATION, "Nagpur")],
+    )
+    assert index.suggest("cem") == [
+        {"text": "Cement", "kind": PRODUCT, "vendor_count": 2}
+    ]
+    assert index.suggest("nag") == [
+        {"text": "Nagpur", "kind": LOCATION, "vendor_count": 0}
+    ]
+
+
+def test_empty_and_unknown_prefixes():
+    index = _index()
+    assert index.suggest("") == []
+    assert index.suggest("zz") == []
@@ -0,0 +1,63 @@
+import pytest
+
+from app.services import documents
+from app.services.documents import (
+    encode_vector,
+    knn_score_to_similarity,
+    similarity_to_knn_score,
+)
+from app.services.search import _display_score
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    def use(name: str):
+        monkeypatch.setattr(documents, "VECTOR_ENCODING", name)
+
+    return use
+
+
+def test_float_and_fp16_vectors_pass_through(encoding):
+    vector = [0.5, -0.25, 0.0]
+    for name in ("float", "fp16"):
+        encoding(name)
+        assert encode_vector(vector) == vector
+
+
+def test_byte_vectors_scale_the_peak_to_127(encoding):
+    encoding("byte")
+    assert encode_vector([0.5, -0.25, 0.0, -0.5]) == [127, -64, 0, -127]
+    assert encode_vector([0.0, 0.0]) == [0, 0]
+    assert encode_vector([]) == []
+
+
+def test_byte_vectors_keep_the_direction(encoding):
+    encoding("byte")
+    vector = [0.013, -0.402, 0.251, 0.088, -0.19]
+    encoded = encode_vector(vector)
+    dot = sum(a * b for a, b in zip(vector, encoded))
+    norm = sum(a * a for a in vector) ** 0.5 * sum(b * b for b in encoded) ** 0.5
+    assert dot / norm == pytest.approx(1.0, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "name, engine, knn_score",
+    [("float", "faiss", 1.6), ("fp16", "faiss", 1.6), ("byte", "lucene", 0.8)],
+)
+def test_knn_scores_map_to_one_plus_cosine(encoding, name, engine, knn_score):
+    encoding(name)
+    assert documents.vector_engine() == engine
+    assert knn_score_to_similarity(knn_score) == pytest.approx(1.6)
+    assert similarity_to_knn_score(1.6) == pytest.approx(knn_score)
+
+
+def test_vector_matches_show_cosine():
+    assert _display_score(1.82, 3.0, True) == pytest.approx(0.82)
+    assert _display_score(2.5, 0.0, True) == 1.0
+    assert _display_score(0.7, 0.0, True) == 0.0
+
+
+def test_keyword_only_matches_map_bm25_into_band():
+    assert _display_score(0.0, 2.0, False) == 0.70
+    assert _display_score(0.0, 15.0, False) == 0.825
+    assert _display_score(0.0, 40.0, False) == 0.95
@@ -0,0 +1,42 @@
+"""
+Standalone background-job worker.
+
+    python worker.py          # poll for jobs until stopped
+    python worker.py --once   # drain the queue, then exit
+
+Start at least one next to the API (the API process only enqueues jobs
+unless JOBS_WORKER_IN_APP is set), and as many more as needed, on any node
+that can reach the database; jobs are claimed with FOR UPDATE SKIP LOCKED, so
+each one runs on a single worker.
+"""
+
+import argparse
+import asyncio
+
+from app.core.aws import warm_aws_clients
+from app.core.http import close_http_clients, open_http_client
+from app.core.opensearch import close_opensearch_client, open_opensearch_client
+from app.services.jobs import run_worker
+
+
+async def main(once: bool):
+    warm_aws_clients()
+    await open_opensearch_client()
+    await open_http_client()
+    try:
+        await run_worker(once=once)
+    finally:
+        await close_opensearch_client()
+        await close_http_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--once", action="store_true", help="exit when no job is left to claim"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.once))
+    except KeyboardInterrupt:
+        pass
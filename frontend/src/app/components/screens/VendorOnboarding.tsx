@@ -32,6 +32,17 @@ interface UploadResult {
   errors: UploadError[];
 }
 
+// Bulk uploads run as background jobs (GET /api/jobs/{id})
+interface UploadJob {
+  id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  progress: { total: number; processed: number } | null;
+  result: UploadResult | null;
+  error: string | null;
+}
+
+const JOB_POLL_INTERVAL_MS = 2000;
+
 
 
 // ---------------------------------------------------------------------------
@@ -51,6 +62,24 @@ function getAuthHeaders(): Record<string, string> {
   return token ? { Authorization: `Bearer ${token}` } : {};
 }
 
+async function waitForJob(
+  jobId: string,
+  onProgress: (job: UploadJob) => void,
+): Promise<UploadJob> {
+  for (;;) {
+    const res = await fetch(`${API_BASE}/api/jobs/${jobId}`, {
+      headers: { ...getAuthHeaders() },
+    });
+    if (!res.ok) {
+      throw new Error(`Could not fetch upload status (HTTP ${res.status})`);
+    }
+    const job: UploadJob = await res.json();
+    if (job.status === 'completed' || job.status === 'failed') return job;
+    onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+}
+
 // ---------------------------------------------------------------------------
 // Component
 // ---------------------------------------------------------------------------
@@ -61,6 +90,7 @@ export function VendorOnboarding({ onNavigate: _onNavigate }: VendorOnboardingPr
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
   const [uploading, setUploading] = useState(false);
   const [uploadResult, setUploadResult] = useState<UploadResult | null>(null);
+  const [uploadProgress, setUploadProgress] = useState<UploadJob['progress']>(null);
   const [uploadError, setUploadError] = useState<string | null>(null);
   const [errorsExpanded, setErrorsExpanded] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
@@ -151,6 +181,7 @@ export function VendorOnboarding({ onNavigate: _onNavigate }: VendorOnboardingPr
     setUploading(true);
     setUploadError(null);
     setUploadResult(null);
+    setUploadProgress(null);
     setErrorsExpanded(false);
 
     try {
@@ -168,14 +199,19 @@ export function VendorOnboarding({ onNavigate: _onNavigate }: VendorOnboardingPr
         throw new Error(data.detail ?? `Upload failed with HTTP ${res.status}`);
       }
 
-      const result: UploadResult = await res.json();
-      setUploadResult(result);
+      const queued: UploadJob = await res.json();
+      const job = await waitForJob(queued.id, (j) => setUploadProgress(j.progress));
+      if (job.status === 'failed' || !job.result) {
+        throw new Error(job.error ?? 'Upload failed. Please try again.');
+      }
+      setUploadResult(job.result);
 
 
     } catch (err) {
       setUploadError(err instanceof Error ? err.message : 'Upload failed. Please try again.');
     } finally {
       setUploading(false);
+      setUploadProgress(null);
     }
   };
 
@@ -318,7 +354,11 @@ export function VendorOnboarding({ onNavigate: _onNavigate }: VendorOnboardingPr
                           d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4z"
                         />
                       </svg>
-                      Uploading…
+                      {uploadProgress?.total
+                        ? `Processing ${uploadProgress.processed ?? 0} / ${uploadProgress.total}…`
+                        : uploadProgress?.processed
+                          ? `Processing row ${uploadProgress.processed}…`
+                          : 'Uploading…'}
                     </>
                   ) : (
                     <>